@@ -0,0 +1,109 @@
+"""
+Benchmark de arranque basado en ``python -X importtime``
+Mide en un intérprete limpio el coste de importación de cada fase del
+arranque de la interfaz y lo compara con un presupuesto
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.arranque
+    python -m benchmarks.arranque --repeticiones 10 --json arranque.json
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Fases del arranque: (nombre, módulos importados, presupuesto en ms,
+# módulos que la fase no debe arrastrar)
+FASES = (
+    ("ventana", ["customtkinter"], 250, ["matplotlib", "numpy"]),
+    ("interfaz", ["customtkinter", "interfaz.gui_principal"], 500, ["matplotlib"]),
+    ("grafica", ["matplotlib.figure", "matplotlib.backends.backend_tkagg", "interfaz.grafica"], 1200, []),
+)
+
+
+def medir_importacion(modulos):
+    """
+    Importa los módulos en un intérprete nuevo con ``-X importtime``.
+
+    Args:
+        modulos (list): Nombres de módulos a importar
+
+    Returns:
+        dict: ``total_ms`` (suma de las importaciones de primer nivel) y
+        ``modulos`` con el tiempo acumulado en ms de cada módulo cargado
+    """
+    codigo = "; ".join(f"import {m}" for m in modulos)
+    proceso = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", codigo],
+        cwd=RAIZ, capture_output=True, text=True
+    )
+    if proceso.returncode != 0:
+        raise RuntimeError(f"No se pudo importar {modulos}:\n{proceso.stderr[-2000:]}")
+
+    acumulados = {}
+    total_us = 0
+    for linea in proceso.stderr.splitlines():
+        if not linea.startswith("import time:") or "cumulative" in linea:
+            continue
+        _, acumulado, nombre = linea[len("import time:"):].split("|")
+        if not nombre.startswith("  "):
+            total_us += int(acumulado)
+        acumulados[nombre.strip()] = int(acumulado) / 1000
+    return {"total_ms": total_us / 1000, "modulos": acumulados}
+
+
+def ejecutar(repeticiones=5, mostrar=10):
+    """
+    Mide todas las fases y comprueba presupuestos y módulos prohibidos.
+
+    Se toma la mejor de ``repeticiones`` mediciones por fase para reducir el
+    ruido del sistema de archivos y del planificador del sistema operativo.
+
+    Returns:
+        dict: Resultado por fase con ``total_ms``, ``presupuesto_ms``,
+        ``mas_lentos``, ``prohibidos`` y ``ok``
+    """
+    resultados = {}
+    for nombre, modulos, presupuesto, prohibidos in FASES:
+        mejor = min((medir_importacion(modulos) for _ in range(repeticiones)),
+                    key=lambda m: m["total_ms"])
+        cargados = mejor["modulos"]
+        arrastrados = sorted(m for m in prohibidos if m in cargados)
+        resultados[nombre] = {
+            "total_ms": round(mejor["total_ms"], 2),
+            "presupuesto_ms": presupuesto,
+            "mas_lentos": sorted(cargados.items(), key=lambda par: -par[1])[:mostrar],
+            "prohibidos": arrastrados,
+            "ok": mejor["total_ms"] <= presupuesto and not arrastrados
+        }
+    return resultados
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de arranque con -X importtime")
+    parser.add_argument("--repeticiones", type=int, default=5, help="Mediciones por fase (se toma la mejor)")
+    parser.add_argument("--json", help="Guardar los resultados en este archivo JSON")
+    args = parser.parse_args(argv)
+
+    resultados = ejecutar(args.repeticiones)
+    for nombre, fase in resultados.items():
+        estado = "OK" if fase["ok"] else "EXCEDIDO"
+        print(f"{nombre:<10} {fase['total_ms']:8.1f} ms / {fase['presupuesto_ms']} ms  {estado}")
+        for modulo, ms in fase["mas_lentos"][:5]:
+            print(f"    {ms:8.1f} ms  {modulo}")
+        if fase["prohibidos"]:
+            print(f"    importa módulos diferidos: {', '.join(fase['prohibidos'])}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as archivo:
+            json.dump(resultados, archivo, indent=2, ensure_ascii=False)
+
+    return 0 if all(fase["ok"] for fase in resultados.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
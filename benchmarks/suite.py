@@ -0,0 +1,545 @@
+"""
+Suite de benchmarks de las rutas críticas
+Cubre los cálculos escalares y por lotes, el muestreo del simulador, las
+estadísticas sobre historiales largos, el fotograma de la gráfica en vivo
+(sobre Agg, sin pantalla), la exportación de imágenes, las sesiones y el
+registro en disco, la caché de resultados, el ajuste a lecturas medidas y la
+carga y búsqueda en la biblioteca de núclidos
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.suite -o resultados.json
+    python -m benchmarks.suite --comparar linea_base.json --tolerancia 0.25
+    python -m benchmarks.suite --filtro grafica --rapido
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+# Versión del formato JSON de resultados
+VERSION_FORMATO = 1
+
+CASOS = {}
+
+# Limpieza del caso en curso (directorios temporales, registros abiertos);
+# se ejecuta en orden inverso al terminar de medirlo
+_LIMPIEZA = []
+
+
+def caso(nombre):
+    """Registra una función que prepara un caso y devuelve (función, operaciones por llamada)"""
+    def registrar(preparar):
+        CASOS[nombre] = preparar
+        return preparar
+    return registrar
+
+
+def _directorio_temporal(prefijo):
+    """Directorio temporal que se borra al terminar el caso en curso"""
+    directorio = tempfile.TemporaryDirectory(prefix=prefijo)
+    _LIMPIEZA.append(directorio.cleanup)
+    return directorio.name
+
+
+def _limpiar():
+    """Ejecuta y descarta la limpieza pendiente del último caso"""
+    while _LIMPIEZA:
+        _LIMPIEZA.pop()()
+
+
+def medir(funcion, operaciones, repeticiones, minimo_s=0.05):
+    """
+    Mide una función repitiéndola hasta acumular ``minimo_s`` por repetición.
+
+    Args:
+        funcion (callable): Código a medir, sin argumentos
+        operaciones (int): Operaciones que representa cada llamada
+        repeticiones (int): Repeticiones independientes
+        minimo_s (float): Duración mínima de cada repetición
+
+    Returns:
+        dict: Tiempos por operación en segundos (mediana, mínimo, máximo)
+    """
+    funcion()  # calentamiento (cachés, importaciones diferidas)
+
+    llamadas = 1
+    while True:
+        inicio = time.perf_counter()
+        for _ in range(llamadas):
+            funcion()
+        duracion = time.perf_counter() - inicio
+        if duracion >= minimo_s or llamadas >= 1 << 20:
+            break
+        llamadas *= 2
+
+    muestras = [duracion / (llamadas * operaciones)]
+    for _ in range(repeticiones - 1):
+        inicio = time.perf_counter()
+        for _ in range(llamadas):
+            funcion()
+        muestras.append((time.perf_counter() - inicio) / (llamadas * operaciones))
+
+    return {
+        "mediana_s": statistics.median(muestras),
+        "min_s": min(muestras),
+        "max_s": max(muestras),
+        "repeticiones": repeticiones,
+        "llamadas_por_repeticion": llamadas,
+        "operaciones_por_llamada": operaciones
+    }
+
+
+# --- Cálculos -------------------------------------------------------------
+
+@caso("calculos.escalar.actividad_restante")
+def _caso_actividad_escalar():
+    from utilidades.calculos import calcular_actividad_restante
+    return lambda: calcular_actividad_restante(100.0, 3.5, 6.01), 1
+
+
+@caso("calculos.escalar.tiempo_para_actividad")
+def _caso_tiempo_escalar():
+    from utilidades.calculos import calcular_tiempo_para_actividad
+    return lambda: calcular_tiempo_para_actividad(100.0, 25.0, 6.01), 1
+
+
+@caso("calculos.lote.actividad_restante_1e6")
+def _caso_actividad_lote():
+    from utilidades.calculos import calcular_actividad_restante
+    rng = np.random.default_rng(0)
+    a0 = rng.uniform(1, 1000, 1_000_000)
+    t = rng.uniform(0, 48, 1_000_000)
+    vida = rng.uniform(0.3, 200, 1_000_000)
+    return lambda: calcular_actividad_restante(a0, t, vida), len(a0)
+
+
+@caso("calculos.lote.tiempo_para_actividad_1e6")
+def _caso_tiempo_lote():
+    from utilidades.calculos import calcular_tiempo_para_actividad
+    rng = np.random.default_rng(0)
+    a0 = rng.uniform(100, 1000, 1_000_000)
+    af = rng.uniform(1, 100, 1_000_000)
+    vida = rng.uniform(0.3, 200, 1_000_000)
+    return lambda: calcular_tiempo_para_actividad(a0, af, vida), len(a0)
+
+
+# --- Simulador ------------------------------------------------------------
+
+@caso("simulador.actualizar_calculos")
+def _caso_actualizar_calculos():
+    from modelos.simulacion import SimuladorDecaimiento
+    simulador = SimuladorDecaimiento(capacidad_maxima=100_000)
+    simulador.iniciar_simulacion(100.0, 6.01, 50.0, 5, "#3498DB")
+    return simulador.actualizar_calculos, 1
+
+
+@caso("simulador.estocastico_1e8_x100")
+def _caso_estocastico():
+    """100 pasos binomiales de 100 corridas de 10⁸ núcleos (``SimuladorEstocastico.ejecutar``)"""
+    from modelos.estocastico import SimuladorEstocastico
+
+    def ejecutar():
+        SimuladorEstocastico(100_000_000, 6.01, n_corridas=100, semilla=0,
+                             actividad_inicial=100.0).ejecutar(0.5, 100)
+    return ejecutar, 1
+
+
+@caso("simulador.actualizar_calculos_estocastico")
+def _caso_muestreo_estocastico():
+    """Muestreo del motor con el modelo Monte Carlo activo (10⁶ núcleos)"""
+    from modelos.simulacion import SimuladorDecaimiento
+    simulador = SimuladorDecaimiento(capacidad_maxima=100_000, semilla=0)
+    simulador.configurar(100.0, 6.01, 50.0, 5, "#3498DB", nucleos=1_000_000)
+    simulador.arrancar()
+    return simulador.actualizar_calculos, 1
+
+
+@caso("simulador.avanzar_reloj_virtual")
+def _caso_reloj_virtual():
+    """Recorrido sin pantalla de 24 h en pasos de 0.1 h con ``RelojVirtual`` (por muestra)"""
+    from modelos.simulacion import SimuladorDecaimiento
+    from modelos.reloj import RelojVirtual
+
+    def recorrer():
+        simulador = SimuladorDecaimiento(reloj=RelojVirtual())
+        simulador.configurar(100.0, 6.01, 50.0, 60, "#3498DB", duracion=24.0)
+        simulador.arrancar()
+        for _ in range(240):
+            simulador.avanzar(0.1)
+    return recorrer, 240
+
+
+def _simulador_con_historial(n):
+    from modelos.simulacion import SimuladorDecaimiento
+    simulador = SimuladorDecaimiento()
+    simulador.iniciar_simulacion(100.0, 6.01, 50.0, 5, "#3498DB")
+    tiempos = np.linspace(0.0, 48.0, n)
+    actividades = 100.0 * np.exp(-simulador.constante_decaimiento * tiempos)
+    simulador.serie.limpiar()
+    simulador.serie.extender(tiempos, actividades, actividades / 100.0)
+    return simulador
+
+
+for _n in (10_000, 1_000_000):
+    caso(f"simulador.obtener_estadisticas_{_n}")(
+        lambda n=_n: (_simulador_con_historial(n).obtener_estadisticas, 1)
+    )
+
+
+def _caso_sesion(n, abrir):
+    """Guardar o abrir (proyectar y consultar) una sesión de n muestras"""
+    from modelos.simulacion import SimuladorDecaimiento
+    from modelos.sesion import guardar_sesion, cargar_sesion
+
+    simulador = _simulador_con_historial(n)
+    ruta = os.path.join(_directorio_temporal("bench_sesion_"), "sesion.rses")
+    guardar_sesion(ruta, simulador)
+    if not abrir:
+        return lambda: guardar_sesion(ruta, simulador), 1
+
+    def abrir_y_consultar():
+        destino = SimuladorDecaimiento()
+        cargar_sesion(ruta, destino)
+        destino.obtener_estadisticas()
+        destino.serie.indice_mas_cercano(24.0)
+
+    return abrir_y_consultar, 1
+
+
+for _n in (10_000, 1_000_000):
+    caso(f"sesion.guardar_{_n}")(lambda n=_n: _caso_sesion(n, abrir=False))
+    caso(f"sesion.abrir_{_n}")(lambda n=_n: _caso_sesion(n, abrir=True))
+
+
+@caso("registro.actualizar_calculos")
+def _caso_registro_muestreo():
+    """Muestreo con ventana en memoria y cada muestra añadida al registro en disco"""
+    from modelos.simulacion import SimuladorDecaimiento
+    simulador = SimuladorDecaimiento(capacidad_maxima=100_000)
+    simulador.configurar(100.0, 6.01, 50.0, 5, "#3498DB")
+    simulador.iniciar_registro(os.path.join(_directorio_temporal("bench_registro_"), "registro.rlog"))
+    _LIMPIEZA.append(simulador.detener_registro)
+    simulador.arrancar()
+    return simulador.actualizar_calculos, 1
+
+
+def _caso_registro(n, recuperar):
+    """Historial diezmado para un redibujado, o recuperación, de un registro de n muestras"""
+    from modelos.simulacion import SimuladorDecaimiento
+    from modelos.registro import RegistroMuestras, recuperar_registro
+    from config.constantes import SESIONES
+
+    ruta = os.path.join(_directorio_temporal("bench_registro_"), "registro.rlog")
+    registro = RegistroMuestras(ruta, _simulador_con_historial(n))
+    _LIMPIEZA.append(registro.cerrar)
+    if recuperar:
+        registro.cerrar()
+
+        def recuperar_y_consultar():
+            destino = SimuladorDecaimiento()
+            recuperar_registro(ruta, destino)
+            destino.obtener_estadisticas()
+        return recuperar_y_consultar, 1
+
+    def diezmar():
+        registro.invalidar_historial()
+        registro.historial(SESIONES["puntos_grafica"])
+    return diezmar, 1
+
+
+for _n in (10_000, 1_000_000):
+    caso(f"registro.historial_{_n}")(lambda n=_n: _caso_registro(n, recuperar=False))
+    caso(f"registro.recuperar_{_n}")(lambda n=_n: _caso_registro(n, recuperar=True))
+
+
+# --- Caché de resultados --------------------------------------------------
+
+@caso("cache.lote_acierto_100000")
+def _caso_cache_lote():
+    """Lote de 100 000 escenarios con 50 puntos por curva leído de la caché (clave incluida)"""
+    from modelos.cache_resultados import CacheResultados
+    from modelos.lote import ejecutar_lote
+
+    rng = np.random.default_rng(0)
+    n = 100_000
+    vida_media = rng.choice([1.83, 6.01, 192.5], n)
+    escenarios = {
+        "actividad_inicial": rng.uniform(50.0, 500.0, n),
+        "actividad_final": rng.uniform(1.0, 40.0, n),
+        "duracion": rng.uniform(1.0, 100.0, n),
+        "vida_media": vida_media,
+        "constante_decaimiento": np.log(2) / vida_media
+    }
+    cache = CacheResultados(_directorio_temporal("bench_cache_"))
+    ejecutar_lote(escenarios, puntos=50, cache=cache)
+    return lambda: ejecutar_lote(escenarios, puntos=50, cache=cache), 1
+
+
+# --- Ajuste a lecturas medidas --------------------------------------------
+
+def _lecturas_sinteticas(n):
+    """n lecturas de Tc-99m durante 48 h con un 2 % de ruido relativo"""
+    rng = np.random.default_rng(0)
+    tiempos = np.linspace(0.0, 48.0, n)
+    actividades = 370.0 * np.exp(-np.log(2) / 6.01 * tiempos) * (1 + 0.02 * rng.standard_normal(n))
+    return tiempos, actividades
+
+
+def _caso_ajuste(n, refinar):
+    """Ajuste por bloques de n lecturas en memoria (log-lineal o con Gauss-Newton)"""
+    from modelos.ajuste import ajustar_arreglos
+    tiempos, actividades = _lecturas_sinteticas(n)
+    return lambda: ajustar_arreglos(tiempos, actividades, refinar=refinar), 1
+
+
+@caso("ajuste.csv_200000")
+def _caso_ajuste_csv():
+    """Ajuste log-lineal leyendo un CSV de 200 000 lecturas por bloques"""
+    from modelos.ajuste import ajustar_csv
+    tiempos, actividades = _lecturas_sinteticas(200_000)
+    ruta = os.path.join(_directorio_temporal("bench_ajuste_"), "lecturas.csv")
+    np.savetxt(ruta, np.column_stack((tiempos, actividades)), delimiter=",",
+               header="tiempo,actividad", comments="", fmt="%.10g")
+    return lambda: ajustar_csv(ruta), 1
+
+
+caso("ajuste.log_lineal_1000000")(lambda: _caso_ajuste(1_000_000, refinar=False))
+caso("ajuste.gauss_newton_1000000")(lambda: _caso_ajuste(1_000_000, refinar=True))
+
+
+# --- Gráfica --------------------------------------------------------------
+
+def _grafica_sin_pantalla():
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from config.constantes import COLORES
+    from interfaz.grafica import GraficaDecaimiento
+
+    fig = Figure(facecolor=COLORES["fondo_grafica"], figsize=(10, 6))
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_subplot(111)
+    return GraficaDecaimiento(fig, ax, canvas)
+
+
+def _grafica_con_historial(n):
+    """Gráfica preparada cuyo fondo ya contiene n muestras, como a mitad de una simulación"""
+    from modelos.serie_temporal import SerieTemporal
+
+    grafica = _grafica_sin_pantalla()
+    vida_media = 6.01
+    constante = np.log(2) / vida_media
+    duracion = 48.0
+    grafica.preparar("Decaimiento de Tecnecio-99m", "#3498DB", duracion, 100.0,
+                     100.0 * np.exp(-constante * duracion))
+
+    serie = SerieTemporal()
+    tiempos = np.linspace(0.0, duracion / 2, n)
+    actividades = 100.0 * np.exp(-constante * tiempos)
+    serie.extender(tiempos, actividades, actividades / 100.0)
+    grafica.actualizar(serie.tiempos, serie.actividades, float(actividades[-1] / 100.0))
+    grafica.canvas.draw()
+    return grafica, serie, constante, duracion / 2, duracion / (2 * n)
+
+
+def _caso_fotograma(n):
+    """
+    Lo que hace ``SimuladorGUI.actualizar_grafica`` en cada refresco, sin las
+    etiquetas de Tk: muestrear, agregar a la serie y dibujar el tramo nuevo.
+    """
+    grafica, serie, constante, tiempo, paso = _grafica_con_historial(n)
+    estado = {"t": tiempo}
+
+    def fotograma():
+        estado["t"] += paso
+        actividad = 100.0 * np.exp(-constante * estado["t"])
+        serie.agregar(estado["t"], actividad, actividad / 100.0)
+        grafica.actualizar(serie.tiempos, serie.actividades, actividad / 100.0)
+
+    return fotograma, 1
+
+
+def _caso_redibujado(n):
+    """Redibujado completo (inicio, cambio de tamaño de la ventana)"""
+    grafica, _, _, _, _ = _grafica_con_historial(n)
+    return grafica.canvas.draw, 1
+
+
+for _n in (1_000, 10_000, 100_000):
+    caso(f"grafica.fotograma_{_n}")(lambda n=_n: _caso_fotograma(n))
+    caso(f"grafica.redibujado_{_n}")(lambda n=_n: _caso_redibujado(n))
+
+
+# --- Exportación ----------------------------------------------------------
+
+def _caso_exportacion(n, extension):
+    from config.constantes import EXPORTACION
+    from interfaz.exportacion import renderizar_instantanea
+
+    grafica, _, _, _, _ = _grafica_con_historial(n)
+    instantanea = grafica.instantanea()
+    ruta = os.path.join(_directorio_temporal("bench_export_"), f"grafica{extension}")
+    return lambda: renderizar_instantanea(instantanea, ruta, EXPORTACION["dpi"]), 1
+
+
+for _n in (1_000, 100_000):
+    caso(f"exportacion.png_{_n}")(lambda n=_n: _caso_exportacion(n, ".png"))
+    caso(f"exportacion.pdf_{_n}")(lambda n=_n: _caso_exportacion(n, ".pdf"))
+
+
+# --- Biblioteca de núclidos ----------------------------------------------
+
+def _biblioteca_sintetica(n):
+    """CSV temporal con n núclidos ficticios de nombres parecidos entre sí"""
+    import csv
+    rng = np.random.default_rng(0)
+    elementos = ("Cobalto", "Yodo", "Cesio", "Estroncio", "Bario", "Itrio", "Radio", "Tecnecio")
+    ruta = os.path.join(_directorio_temporal("bench_nuclidos_"), "nuclidos.csv")
+    with open(ruta, "w", newline="", encoding="utf-8") as archivo:
+        escritor = csv.writer(archivo)
+        escritor.writerow(("nombre", "simbolo", "vida_media", "unidad", "modo", "constante_gamma"))
+        for i in range(n):
+            elemento = elementos[i % len(elementos)]
+            masa = int(rng.integers(1, 260))
+            escritor.writerow((f"{elemento}-{masa}-{i}", f"{elemento[:2]}-{masa}-{i}",
+                               float(rng.uniform(0.01, 1e4)), "h", "β-", ""))
+    return ruta
+
+
+@caso("nuclidos.carga_csv_3000")
+def _caso_carga_csv():
+    from modelos.nuclidos import BibliotecaNuclidos
+    ruta = _biblioteca_sintetica(3000)
+    return lambda: BibliotecaNuclidos.cargar(ruta, usar_cache=False), 1
+
+
+@caso("nuclidos.carga_cache_3000")
+def _caso_carga_cache():
+    from modelos.nuclidos import BibliotecaNuclidos
+    ruta = _biblioteca_sintetica(3000)
+    BibliotecaNuclidos.cargar(ruta)  # escribe la caché
+    return lambda: BibliotecaNuclidos.cargar(ruta), 1
+
+
+@caso("nuclidos.buscar_prefijo_3000")
+def _caso_buscar_prefijo():
+    from modelos.nuclidos import BibliotecaNuclidos
+    biblioteca = BibliotecaNuclidos.cargar(_biblioteca_sintetica(3000), usar_cache=False)
+    return lambda: biblioteca.buscar("cob", 50), 1
+
+
+@caso("nuclidos.buscar_aproximada_3000")
+def _caso_buscar_aproximada():
+    from modelos.nuclidos import BibliotecaNuclidos
+    biblioteca = BibliotecaNuclidos.cargar(_biblioteca_sintetica(3000), usar_cache=False)
+    return lambda: biblioteca.buscar("cobaltp", 50), 1
+
+
+# --- Ejecución y comparación ----------------------------------------------
+
+def entorno():
+    """Versiones y plataforma con las que se tomaron los resultados"""
+    import matplotlib
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "matplotlib": matplotlib.__version__,
+        "plataforma": platform.platform(),
+        "procesador": platform.processor() or platform.machine()
+    }
+
+
+def ejecutar(filtro=None, repeticiones=5, minimo_s=0.05):
+    """
+    Ejecuta los casos cuyo nombre contiene ``filtro``.
+
+    Returns:
+        dict: Documento JSON con ``version``, ``entorno`` y ``resultados``
+    """
+    resultados = {}
+    for nombre, preparar in CASOS.items():
+        if filtro and filtro not in nombre:
+            continue
+        try:
+            funcion, operaciones = preparar()
+            resultados[nombre] = medir(funcion, operaciones, repeticiones, minimo_s)
+        finally:
+            _limpiar()
+        print(f"{nombre:<45} {formatear_tiempo(resultados[nombre]['mediana_s'])}", flush=True)
+    return {"version": VERSION_FORMATO, "entorno": entorno(), "resultados": resultados}
+
+
+def comparar(actual, base, tolerancia):
+    """
+    Compara dos documentos de resultados por la mediana de cada caso.
+
+    Args:
+        actual (dict): Resultados nuevos
+        base (dict): Línea base
+        tolerancia (float): Empeoramiento relativo admitido (0.25 = 25 %)
+
+    Returns:
+        list: Tuplas (caso, mediana base, mediana actual, cociente) de las regresiones
+    """
+    if base.get("version") != VERSION_FORMATO:
+        raise ValueError(f"Versión de línea base {base.get('version')} no compatible con {VERSION_FORMATO}")
+
+    regresiones = []
+    for nombre, resultado in actual["resultados"].items():
+        referencia = base["resultados"].get(nombre)
+        if referencia is None:
+            continue
+        cociente = resultado["mediana_s"] / referencia["mediana_s"]
+        if cociente > 1 + tolerancia:
+            regresiones.append((nombre, referencia["mediana_s"], resultado["mediana_s"], cociente))
+    return regresiones
+
+
+def formatear_tiempo(segundos):
+    """Tiempo por operación con la unidad más legible"""
+    for unidad, factor in (("s", 1), ("ms", 1e-3), ("µs", 1e-6)):
+        if segundos >= factor:
+            return f"{segundos / factor:9.3f} {unidad}/op"
+    return f"{segundos / 1e-9:9.3f} ns/op"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks de las rutas críticas del simulador")
+    parser.add_argument("-o", "--salida", help="Guardar los resultados en este archivo JSON")
+    parser.add_argument("--comparar", help="JSON de línea base con el que comparar")
+    parser.add_argument("--tolerancia", type=float, default=0.25,
+                        help="Empeoramiento relativo admitido frente a la línea base (por defecto 0.25)")
+    parser.add_argument("--filtro", help="Ejecutar solo los casos cuyo nombre contenga este texto")
+    parser.add_argument("--repeticiones", type=int, default=5, help="Repeticiones por caso")
+    parser.add_argument("--rapido", action="store_true", help="Menos repeticiones y más cortas")
+    args = parser.parse_args(argv)
+
+    repeticiones, minimo_s = (3, 0.01) if args.rapido else (args.repeticiones, 0.05)
+    actual = ejecutar(args.filtro, repeticiones, minimo_s)
+
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as archivo:
+            json.dump(actual, archivo, indent=2, ensure_ascii=False)
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as archivo:
+            base = json.load(archivo)
+        regresiones = comparar(actual, base, args.tolerancia)
+        for nombre, anterior, nuevo, cociente in regresiones:
+            print(f"REGRESIÓN {nombre}: {formatear_tiempo(anterior).strip()} -> "
+                  f"{formatear_tiempo(nuevo).strip()} (x{cociente:.2f})")
+        if regresiones:
+            return 1
+        print(f"Sin regresiones frente a {args.comparar} (tolerancia {args.tolerancia:.0%})")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
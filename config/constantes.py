@@ -1,5 +1,7 @@
 """Constantes y configuración global del simulador"""
 
+import os
+
 # Radiofármacos disponibles
 RADIOFARMACOS = {
     "Fluor-18": {
@@ -31,6 +33,37 @@ RADIOFARMACOS = {
         "color": "#F39C12",
         "aplicacion": "Medicina nuclear",
         "descripcion": "Estudios cardiovasculares"
+    },
+    "Galio-68": {
+        "vida_media": 1.13,
+        "color": "#E67E22",
+        "aplicacion": "PET (Tomografía por Emisión de Positrones)",
+        "descripcion": "Imagen de tumores neuroendocrinos y de próstata"
+    },
+    "Molibdeno-99": {
+        "vida_media": 65.94,
+        "color": "#1ABC9C",
+        "aplicacion": "Generador de Tecnecio-99m",
+        "descripcion": "Radionúclido padre del generador Mo-99/Tc-99m"
+    },
+    "Germanio-68": {
+        "vida_media": 6502.8,
+        "color": "#95A5A6",
+        "aplicacion": "Generador de Galio-68",
+        "descripcion": "Radionúclido padre del generador Ge-68/Ga-68"
+    }
+}
+
+# Cadenas de decaimiento padre → hija disponibles
+# Los miembros van de padre a hija; ramificaciones: (padre, hija, fracción)
+CADENAS_DECAIMIENTO = {
+    "Mo-99 → Tc-99m (generador)": {
+        "miembros": ["Molibdeno-99", "Tecnecio-99m"],
+        "ramificaciones": [(0, 1, 0.876)]
+    },
+    "Ge-68 → Ga-68 (generador)": {
+        "miembros": ["Germanio-68", "Galio-68"],
+        "ramificaciones": [(0, 1, 1.0)]
     }
 }
 
@@ -55,7 +88,8 @@ COLORES = {
     "boton_cerrar": "#E74C3C",
     "boton_cerrar_hover": "#C0392B",
     "boton_parcial": "#9B59B6",
-    "boton_parcial_hover": "#8E44AD"
+    "boton_parcial_hover": "#8E44AD",
+    "ajuste": "#F1C40F"
 }
 
 # Configuración de ventanas
@@ -70,3 +104,89 @@ VENTANA_PARCIAL = {
     "alto": 600,
     "titulo": "Simulador de Decaimiento Parcial"
 }
+
+# Umbrales de porcentaje restante que se marcan en la gráfica al alcanzarse
+UMBRALES_PORCENTAJE = (50, 25, 10)
+
+# Refresco adaptativo de la gráfica en vivo: el intervalo se elige para que la
+# curva avance unos pocos píxeles por fotograma, dentro de [fps_min, fps_max]
+REFRESCO = {
+    "fps_min": 1.0,
+    "fps_max": 30.0,
+    "pixeles_por_fotograma": 1.0
+}
+
+# Exportación de gráficas en segundo plano
+EXPORTACION = {
+    "dpi": 300,
+    "dpi_opciones": (100, 150, 300, 600),
+    "intervalo_revision_ms": 200
+}
+
+# Instrumentación del bucle de refresco (opcional, se activa desde la interfaz)
+INSTRUMENTACION = {
+    "activa": False,
+    "intervalo_overlay_ms": 500
+}
+
+# Factores de velocidad del reloj de simulación seleccionables en la interfaz
+VELOCIDADES_RELOJ = (0.25, 0.5, 1, 2, 5, 10)
+
+# Espera tras la última pulsación antes de recalcular el panel de la fórmula
+RETARDO_FORMULA_MS = 150
+
+# Biblioteca de núclidos en archivo (CSV o JSON). Junto al archivo se guarda
+# una caché binaria (.npz) que se regenera cuando el origen cambia.
+# datos/nuclidos.csv es solo una muestra de 48 núclidos (médicos y de
+# referencia), no una biblioteca completa: para trabajar con miles de núclidos
+# hay que apuntar "ruta" a un archivo propio con las mismas columnas (p. ej.
+# exportado de NUBASE o de ENSDF/NuDat; ver ``modelos.nuclidos.leer_nuclidos``)
+BIBLIOTECA_NUCLIDOS = {
+    "ruta": os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "datos", "nuclidos.csv"),
+    "resultados_busqueda": 50,
+    "retardo_busqueda_ms": 150,
+    # Colores asignados a los núclidos que no están en RADIOFARMACOS
+    "colores": ("#E67E22", "#16A085", "#C0392B", "#2980B9", "#D4AC0D", "#7D3C98", "#27AE60", "#CB4335")
+}
+
+# Sesiones guardadas: muestras que se dibujan al abrir una (el resto se lee
+# del archivo solo al consultarlo)
+SESIONES = {
+    "puntos_grafica": 4000
+}
+
+# Registro en disco de simulaciones largas (modelos/registro.py)
+REGISTRO = {
+    "directorio": os.path.join(os.path.expanduser("~"), ".simulador_decaimiento", "registros"),
+    "registros_por_lote": 256,      # Muestras acumuladas antes de escribir
+    "intervalo_volcado_s": 2.0,     # Escritura forzada si el lote tarda más en llenarse
+    "sincronizar": False,           # os.fsync en cada volcado (más seguro, más lento)
+    "ventana_muestras": 50_000      # Muestras recientes que se conservan en memoria
+}
+
+# Caché persistente de resultados de lotes, barridos y vistas previas
+# (modelos/cache_resultados.py); al superar el tamaño se borran las entradas
+# usadas hace más tiempo
+CACHE_RESULTADOS = {
+    "directorio": os.path.join(os.path.expanduser("~"), ".simulador_decaimiento", "cache"),
+    "tamano_maximo_mb": 256
+}
+
+# Ajuste de vida media y A₀ a lecturas medidas (modelos/ajuste.py)
+AJUSTE = {
+    "filas_por_bloque": 200_000,    # Lecturas que se leen y procesan a la vez
+    "iteraciones": 20,              # Máximo de iteraciones del refinado no lineal
+    "tolerancia": 1e-9,             # Cambio relativo de A₀ y λ que lo da por convergido
+    "umbral_atipicos": 3.0,         # |residuo estandarizado| de una lectura atípica
+    "max_atipicos": 100,            # Lecturas atípicas que se listan (se cuentan todas)
+    "puntos_muestra": 2000,         # Lecturas que se conservan para dibujarlas
+    "puntos_curva": 400,            # Puntos de la curva ajustada en la gráfica
+    "intervalo_revision_ms": 200    # Frecuencia con que la interfaz mira si terminó
+}
+
+# Modo Monte Carlo (modelos/estocastico.py): núcleos simulados del
+# radiofármaco principal y partículas representativas que se dibujan
+ESTOCASTICO = {
+    "nucleos": 1_000_000,
+    "particulas": 200
+}
@@ -0,0 +1,123 @@
+"""
+Exportación de gráficas en segundo plano
+Cada exportación recibe una instantánea de la serie y se renderiza en una
+figura Agg fuera de pantalla dentro de un proceso aparte, de modo que la
+animación en vivo no se detiene mientras se genera un PNG o PDF a alta resolución
+"""
+
+import os
+import time
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+from config.constantes import COLORES
+
+
+def renderizar_instantanea(instantanea, ruta, dpi):
+    """
+    Dibuja una instantánea de ``GraficaDecaimiento`` y la guarda en disco.
+
+    Se ejecuta en el proceso de exportación, así que solo usa la API
+    orientada a objetos de Matplotlib (sin pyplot ni backend de Tk).
+
+    Args:
+        instantanea (dict): Resultado de ``GraficaDecaimiento.instantanea()``
+        ruta (str): Archivo de destino; el formato se deduce de la extensión
+        dpi (int): Resolución de la imagen
+
+    Returns:
+        float: Segundos empleados en el renderizado
+    """
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from interfaz.grafica import GraficaDecaimiento
+
+    inicio = time.perf_counter()
+    fig = Figure(figsize=instantanea["tamano"], facecolor=COLORES["fondo_grafica"])
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_subplot(111)
+
+    grafica = GraficaDecaimiento(fig, ax, canvas, animada=False)
+    grafica.restaurar(instantanea)
+    fig.savefig(ruta, dpi=dpi, bbox_inches='tight', facecolor=COLORES["fondo_grafica"])
+    return time.perf_counter() - inicio
+
+
+@dataclass
+class TrabajoExportacion:
+    """Exportación encolada y su estado"""
+    ruta: str
+    dpi: int
+    futuro: Future = field(repr=False)
+    encolado: float = field(default_factory=time.monotonic)
+
+    @property
+    def nombre(self):
+        return os.path.basename(self.ruta)
+
+    @property
+    def estado(self):
+        """'en cola', 'renderizando', 'completado' o 'error'"""
+        if not self.futuro.done():
+            return "renderizando" if self.futuro.running() else "en cola"
+        return "error" if self.futuro.exception() is not None else "completado"
+
+
+class ExportadorGraficas:
+    """
+    Cola de exportaciones atendida por un único proceso de renderizado.
+
+    Las exportaciones se procesan en orden de llegada. El proceso se crea la
+    primera vez que se encola algo y se reutiliza después, por lo que solo la
+    primera exportación paga el arranque de Matplotlib en el proceso hijo.
+    """
+
+    def __init__(self):
+        self._ejecutor = None
+        self.trabajos = []
+
+    def encolar(self, instantanea, ruta, dpi):
+        """
+        Añade una exportación a la cola.
+
+        Args:
+            instantanea (dict): Estado de la gráfica a exportar
+            ruta (str): Archivo de destino (.png, .jpg, .pdf, ...)
+            dpi (int): Resolución de la imagen
+
+        Returns:
+            TrabajoExportacion: Trabajo encolado
+        """
+        if self._ejecutor is None:
+            # spawn: el proceso hijo no hereda la conexión con el servidor gráfico
+            self._ejecutor = ProcessPoolExecutor(
+                max_workers=1, mp_context=multiprocessing.get_context("spawn")
+            )
+        futuro = self._ejecutor.submit(renderizar_instantanea, instantanea, ruta, dpi)
+        trabajo = TrabajoExportacion(ruta, dpi, futuro)
+        self.trabajos.append(trabajo)
+        return trabajo
+
+    def pendientes(self):
+        """Trabajos que aún no han terminado, en orden de llegada"""
+        return [t for t in self.trabajos if not t.futuro.done()]
+
+    def recoger_terminados(self):
+        """
+        Retira de la lista los trabajos terminados.
+
+        Returns:
+            list: Trabajos completados o fallidos desde la última llamada
+        """
+        terminados, restantes = [], []
+        for trabajo in self.trabajos:
+            (terminados if trabajo.futuro.done() else restantes).append(trabajo)
+        self.trabajos = restantes
+        return terminados
+
+    def cerrar(self, esperar=False):
+        """Detiene el proceso de exportación, descartando lo que no haya empezado"""
+        if self._ejecutor is not None:
+            self._ejecutor.shutdown(wait=esperar, cancel_futures=not esperar)
+            self._ejecutor = None
@@ -0,0 +1,611 @@
+"""
+Renderizado incremental de la curva de decaimiento
+Los artistas se crean una sola vez y se actualizan mediante blitting sobre Agg
+"""
+
+from contextlib import nullcontext
+
+import numpy as np
+from matplotlib.lines import Line2D
+
+from config.constantes import COLORES
+
+
+def color_gamma(gamma):
+    """Interpola entre rojo (baja actividad) y verde (alta actividad)"""
+    r = int(255 * (1 - gamma))
+    g = int(255 * gamma)
+    b = 80
+    return f"#{r:02x}{g:02x}{b:02x}"
+
+
+class _LineaHistorial(Line2D):
+    """
+    Línea que toma el historial justo antes de dibujarse.
+
+    ``set_data`` copia la secuencia recibida; al diferirlo hasta un redibujado
+    completo, los fotogramas incrementales no pagan ese coste O(n). Si se
+    asigna ``paginar`` (una función sin argumentos que devuelve tiempos y
+    actividades), los redibujados completos toman de ella el historial, p. ej.
+    diezmado desde el registro en disco cuando la memoria solo guarda la
+    ventana reciente.
+    """
+
+    historial = None
+    paginar = None
+
+    def datos(self):
+        """(tiempos, actividades) de la curva completa o None"""
+        if self.paginar is not None:
+            return self.paginar()
+        return self.historial
+
+    def draw(self, renderer):
+        datos = self.datos()
+        if datos is not None:
+            self.set_data(*datos)
+        super().draw(renderer)
+
+
+class GraficaDecaimiento:
+    """
+    Mantiene los artistas persistentes de la gráfica de decaimiento.
+
+    La curva completa forma parte del fondo guardado con ``copy_from_bbox``.
+    En cada fotograma solo se dibuja el tramo nuevo sobre ese fondo y se
+    vuelven a pintar los artistas animados (caja de gamma, marcas), por lo
+    que el coste por fotograma no depende de la longitud de la simulación.
+    La leyenda no cambia durante la simulación y se pinta con el fondo.
+
+    Funciona con cualquier lienzo basado en Agg (``FigureCanvasTkAgg`` en la
+    interfaz, ``FigureCanvasAgg`` sin pantalla). Con ``animada=False`` todos
+    los artistas son estáticos y no se dibuja nada hasta que se guarda la
+    figura, que es lo que necesita la exportación.
+    """
+
+    MARGEN = 0.05
+
+    def __init__(self, fig, ax, canvas, animada=True):
+        self.fig = fig
+        self.ax = ax
+        self.canvas = canvas
+        self.animada = animada
+
+        self.fondo = None
+        self.linea = None
+        self.tramo = None
+        self.secundarias = []
+        self.linea_objetivo = None
+        self.texto_gamma = None
+        self.leyenda = None
+        self.punto_marcado = None
+        self.marcas = []
+        self.eventos = []
+        self.texto_diagnostico = None
+        self._pixeles_diagnostico = None
+        self._pixeles_leyenda = None
+        self._pagina = None
+        self.ajuste = []
+        self._ajuste = None
+        self._parametros = None
+        self._gamma = 1.0
+        self._n_en_fondo = 0
+        self._total = 0
+
+        # InstrumentacionRefresco opcional para medir dibujo y blit
+        self.instrumentacion = None
+
+        if self.animada:
+            self.canvas.mpl_connect("draw_event", self._on_draw)
+        self.configurar_ejes()
+
+    def configurar_ejes(self):
+        """Aplica el estilo base de los ejes"""
+        self.ax.set_facecolor(COLORES["fondo_grafica"])
+        self.ax.set_xlabel("Tiempo (horas)", color='white', fontsize=12, fontweight='bold')
+        self.ax.set_ylabel("Actividad (MBq)", color='white', fontsize=12, fontweight='bold')
+        self.ax.set_title("Decaimiento en Tiempo Real", color='white', fontsize=14, fontweight='bold')
+        self.ax.tick_params(colors='white', labelsize=10)
+        self.ax.grid(color='gray', linestyle='--', linewidth=0.5, alpha=0.3)
+
+    def limpiar(self):
+        """Elimina todos los artistas y redibuja los ejes vacíos"""
+        self.ax.clear()
+        self.configurar_ejes()
+        self.linea = None
+        self.tramo = None
+        self.secundarias = []
+        self.linea_objetivo = None
+        self.texto_gamma = None
+        self.leyenda = None
+        self.punto_marcado = None
+        self.marcas = []
+        self.eventos = []
+        self.texto_diagnostico = None
+        self._pixeles_diagnostico = None
+        self._pixeles_leyenda = None
+        self._pagina = None
+        self.ajuste = []
+        self._ajuste = None
+        self._parametros = None
+        self._n_en_fondo = 0
+        self._total = 0
+        if self.animada:
+            self.canvas.draw()
+
+    def preparar(self, etiqueta, color, tiempo_total, actividad_inicial,
+                 actividad_minima, actividad_objetivo=None, secundarias=(),
+                 actividad_maxima=None):
+        """
+        Crea los artistas de una nueva simulación y fija los límites.
+
+        Los límites se conocen de antemano (la curva decrece de A₀ a A(T)),
+        así que no hace falta reescalar ni redibujar los ejes durante la
+        simulación.
+
+        Args:
+            etiqueta (str): Texto de la leyenda para la curva
+            color (str): Color de la curva
+            tiempo_total (float): Tiempo simulado total en horas
+            actividad_inicial (float): Actividad inicial en MBq
+            actividad_minima (float): Actividad esperada al final en MBq
+            actividad_objetivo (float): Actividad objetivo (línea horizontal) o None
+            secundarias (list): (etiqueta, color) de curvas adicionales muestreadas
+                en los mismos instantes que la principal (p. ej. hijas de una cadena)
+            actividad_maxima (float): Máximo esperado de todas las curvas, si
+                supera la actividad inicial
+        """
+        self._parametros = dict(
+            etiqueta=etiqueta, color=color, tiempo_total=tiempo_total,
+            actividad_inicial=actividad_inicial, actividad_minima=actividad_minima,
+            actividad_objetivo=actividad_objetivo, secundarias=list(secundarias),
+            actividad_maxima=actividad_maxima
+        )
+        self.ax.clear()
+        self.configurar_ejes()
+        self.marcas = []
+        self.eventos = []
+        self.texto_diagnostico = None
+        self._pixeles_diagnostico = None
+        self._gamma = 1.0
+
+        estilo = dict(
+            marker='o',
+            color=color,
+            linewidth=3,
+            markersize=5,
+            markeredgecolor='white',
+            markeredgewidth=0.5,
+            alpha=0.9
+        )
+        self.linea = _LineaHistorial([], [], label=etiqueta, **estilo)
+        self.ax.add_line(self.linea)
+        self.tramo, = self.ax.plot([], [], animated=self.animada, **estilo)
+
+        self.secundarias = []
+        for etiqueta_sec, color_sec in secundarias:
+            estilo_sec = dict(estilo, color=color_sec, marker=None, linewidth=2.5)
+            linea_sec = _LineaHistorial([], [], label=etiqueta_sec, **estilo_sec)
+            self.ax.add_line(linea_sec)
+            tramo_sec, = self.ax.plot([], [], animated=self.animada, **estilo_sec)
+            self.secundarias.append((linea_sec, tramo_sec))
+
+        self.linea_objetivo = None
+        if actividad_objetivo:
+            self.linea_objetivo = self.ax.axhline(
+                y=actividad_objetivo,
+                color='#FF4444',
+                linestyle='--',
+                linewidth=2,
+                label=f'Objetivo: {actividad_objetivo} MBq',
+                alpha=0.7
+            )
+            actividad_minima = min(actividad_minima, actividad_objetivo)
+
+        # El ajuste a lecturas medidas se conserva entre simulaciones
+        self._dibujar_ajuste()
+        self._crear_leyenda()
+
+        self.texto_gamma = self.ax.text(
+            0.02, 0.98,
+            '',
+            transform=self.ax.transAxes,
+            fontsize=12,
+            verticalalignment='top',
+            bbox=dict(boxstyle='round', facecolor=color_gamma(1.0), alpha=0.8),
+            color='white',
+            fontweight='bold',
+            animated=self.animada
+        )
+
+        self.punto_marcado, = self.ax.plot(
+            [], [],
+            'o',
+            color='#FFD700',
+            markersize=12,
+            markeredgecolor='white',
+            markeredgewidth=2,
+            zorder=5,
+            animated=self.animada
+        )
+
+        actividad_inicial = max(actividad_inicial, actividad_maxima or 0)
+        if secundarias:
+            actividad_minima = min(actividad_minima, 0.0)
+
+        margen_x = tiempo_total * self.MARGEN
+        rango_y = actividad_inicial - actividad_minima
+        margen_y = rango_y * self.MARGEN if rango_y > 0 else actividad_inicial * self.MARGEN
+        self.ax.set_xlim(-margen_x, tiempo_total + margen_x)
+        self.ax.set_ylim(actividad_minima - margen_y, actividad_inicial + margen_y)
+        self._abarcar_ajuste()
+
+        self._n_en_fondo = 0
+        self._total = 0
+        if self.animada:
+            self.canvas.draw()
+
+    def _crear_leyenda(self):
+        """(Re)crea la leyenda con las curvas presentes"""
+        self.leyenda = self.ax.legend(
+            facecolor=COLORES["fondo_grafica"],
+            edgecolor='white',
+            labelcolor='white',
+            fontsize=10,
+            loc='upper right'
+        )
+
+    def _dibujar_ajuste(self):
+        """Crea los artistas de la curva ajustada y de las lecturas, si hay ajuste"""
+        self.ajuste = []
+        if self._ajuste is None:
+            return
+        color = COLORES["ajuste"]
+        lecturas = self._ajuste["lecturas"]
+        if lecturas is not None:
+            puntos, = self.ax.plot(
+                lecturas[0], lecturas[1], '.',
+                color=color, markersize=3, alpha=0.5, zorder=1, label='Lecturas medidas'
+            )
+            self.ajuste.append(puntos)
+        curva, = self.ax.plot(
+            self._ajuste["tiempos"], self._ajuste["actividades"], '--',
+            color=color, linewidth=2, zorder=3, label=self._ajuste["etiqueta"]
+        )
+        self.ajuste.append(curva)
+
+    def _abarcar_ajuste(self):
+        """Amplía los límites de los ejes, si hace falta, para que quepa el ajuste"""
+        if self._ajuste is None:
+            return
+        tiempos = [self._ajuste["tiempos"]]
+        actividades = [self._ajuste["actividades"]]
+        if self._ajuste["lecturas"] is not None:
+            tiempos.append(self._ajuste["lecturas"][0])
+            actividades.append(self._ajuste["lecturas"][1])
+        t_min = min(float(np.min(t)) for t in tiempos)
+        t_max = max(float(np.max(t)) for t in tiempos)
+        a_min = min(float(np.min(a)) for a in actividades)
+        a_max = max(float(np.max(a)) for a in actividades)
+
+        margen_x = (t_max - t_min) * self.MARGEN
+        margen_y = (a_max - a_min) * self.MARGEN
+        x0, x1 = self.ax.get_xlim()
+        y0, y1 = self.ax.get_ylim()
+        if self.linea is None:
+            x0, x1, y0, y1 = np.inf, -np.inf, np.inf, -np.inf
+        self.ax.set_xlim(min(x0, t_min - margen_x), max(x1, t_max + margen_x))
+        self.ax.set_ylim(min(y0, a_min - margen_y), max(y1, a_max + margen_y))
+
+    def superponer_ajuste(self, tiempos, actividades, etiqueta, lecturas=None):
+        """
+        Dibuja sobre la simulación una curva ajustada a lecturas medidas.
+
+        Son artistas estáticos: entran en el fondo del blitting, así que se
+        pintan en un único redibujado completo y no cuestan nada por
+        fotograma. Se conservan al preparar otra simulación hasta que se
+        llama a ``quitar_ajuste`` o ``limpiar``.
+
+        Args:
+            tiempos (ndarray): Tiempos de la curva ajustada en horas
+            actividades (ndarray): Actividades de la curva ajustada en MBq
+            etiqueta (str): Texto de la leyenda
+            lecturas (tuple): (tiempos, actividades) de las lecturas (diezmadas)
+                a dibujar como puntos, o None
+        """
+        for artista in self.ajuste:
+            artista.remove()
+        self._ajuste = dict(
+            tiempos=np.array(tiempos), actividades=np.array(actividades), etiqueta=etiqueta,
+            lecturas=None if lecturas is None else (np.array(lecturas[0]), np.array(lecturas[1]))
+        )
+        self._dibujar_ajuste()
+        self._abarcar_ajuste()
+        self._crear_leyenda()
+        if self.animada:
+            self.canvas.draw()
+
+    def quitar_ajuste(self):
+        """Borra la curva ajustada y las lecturas de la gráfica"""
+        if self._ajuste is None:
+            return
+        for artista in self.ajuste:
+            artista.remove()
+        self.ajuste = []
+        self._ajuste = None
+        if self.linea is not None:
+            self._crear_leyenda()
+        elif self.leyenda is not None:
+            self.leyenda.remove()
+            self.leyenda = None
+        if self.animada:
+            self.canvas.draw()
+
+    def paginar(self, proveedor):
+        """
+        Toma el historial de ``proveedor`` en los redibujados completos.
+
+        Args:
+            proveedor (callable): Sin argumentos; devuelve (tiempos,
+                actividades, secundarias) de toda la simulación. None vuelve
+                a usar las vistas recibidas en ``actualizar``
+        """
+        if self.linea is None:
+            return
+        if proveedor is None:
+            self.linea.paginar = None
+            for linea_sec, _ in self.secundarias:
+                linea_sec.paginar = None
+            return
+
+        # Una sola llamada al proveedor por redibujado: la curva principal
+        # (la primera en dibujarse) la hace y las secundarias reutilizan su
+        # resultado hasta que termina el redibujado
+        def principal():
+            self._pagina = proveedor()
+            return self._pagina[:2]
+
+        def secundaria(i):
+            if self._pagina is None:
+                self._pagina = proveedor()
+            return self._pagina[0], self._pagina[2][i]
+
+        self._pagina = None
+        self.linea.paginar = principal
+        for i, (linea_sec, _) in enumerate(self.secundarias):
+            linea_sec.paginar = lambda i=i: secundaria(i)
+
+    def escala_pixeles(self):
+        """
+        Píxeles de pantalla por unidad de cada eje.
+
+        Returns:
+            tuple: (píxeles por hora, píxeles por MBq)
+        """
+        x0, x1 = self.ax.get_xlim()
+        y0, y1 = self.ax.get_ylim()
+        caja = self.ax.bbox
+        return caja.width / (x1 - x0), caja.height / (y1 - y0)
+
+    def _on_draw(self, event):
+        """Guarda el fondo tras un redibujado completo (inicio, resize, etc.)"""
+        self.fondo = self.canvas.copy_from_bbox(self.ax.bbox)
+        self._pixeles_diagnostico = None
+        self._pixeles_leyenda = None
+        if self.leyenda is not None:
+            caja = self.leyenda.get_window_extent()
+            self._pixeles_leyenda = self.canvas.copy_from_bbox(caja.padded(1))
+        self._pagina = None
+        historial = self.linea.historial if self.linea is not None else None
+        self._n_en_fondo = self._total if historial is not None else 0
+        self._dibujar_animados()
+
+    def _medir(self, fase):
+        if self.instrumentacion is None:
+            return nullcontext()
+        return self.instrumentacion.medir(fase)
+
+    def _dibujar_animados(self):
+        """Dibuja los artistas que no forman parte del fondo"""
+        if self.texto_diagnostico is not None:
+            self._dibujar_diagnostico()
+        for marca in self.marcas:
+            self.ax.draw_artist(marca)
+        if self.texto_gamma is not None and self.texto_gamma.get_text():
+            self.ax.draw_artist(self.texto_gamma)
+        if self.punto_marcado is not None and len(self.punto_marcado.get_xdata()):
+            self.ax.draw_artist(self.punto_marcado)
+
+    def marcar_evento(self, tiempo, actividad, texto):
+        """
+        Añade una marca permanente (umbral u objetivo alcanzado).
+
+        Las marcas son artistas animados para que los tramos nuevos de la
+        curva no las tapen; se añaden sin redibujar la figura completa.
+        """
+        if self.linea is None:
+            return
+
+        marca, = self.ax.plot(
+            [tiempo], [actividad],
+            'D',
+            color='#FF4444',
+            markersize=8,
+            markeredgecolor='white',
+            markeredgewidth=1,
+            zorder=4,
+            animated=self.animada
+        )
+        etiqueta = self.ax.annotate(
+            texto,
+            (tiempo, actividad),
+            xytext=(6, 6),
+            textcoords='offset points',
+            color='white',
+            fontsize=9,
+            fontweight='bold',
+            zorder=4,
+            animated=self.animada
+        )
+        self.marcas.extend((marca, etiqueta))
+        self.eventos.append((tiempo, actividad, texto))
+        self.repintar()
+
+    def marcar_punto(self, tiempo, actividad):
+        """Resalta un punto de la curva redibujando solo los artistas animados"""
+        if self.punto_marcado is None:
+            return
+
+        self.punto_marcado.set_data([tiempo], [actividad])
+        self.repintar()
+
+    def repintar(self):
+        """Vuelve a pintar los artistas animados sobre el fondo guardado"""
+        if not self.animada:
+            return
+        if self.fondo is None:
+            self.canvas.draw()
+            return
+
+        self.canvas.restore_region(self.fondo)
+        self._dibujar_animados()
+        self.canvas.blit(self.ax.bbox)
+
+    def _dibujar_diagnostico(self):
+        """
+        Pinta el texto de diagnóstico reutilizando sus píxeles.
+
+        Rasterizar varias líneas de texto cuesta más que el resto del
+        fotograma; como el recuadro es opaco, basta con rasterizarlo cuando
+        cambia el texto y después copiar ese bloque de píxeles.
+        """
+        if self._pixeles_diagnostico is not None:
+            self.canvas.restore_region(self._pixeles_diagnostico)
+            return
+        self.ax.draw_artist(self.texto_diagnostico)
+        caja = self.texto_diagnostico.get_bbox_patch().get_window_extent()
+        self._pixeles_diagnostico = self.canvas.copy_from_bbox(caja.padded(1))
+
+    def mostrar_diagnostico(self, texto):
+        """
+        Muestra (o con None oculta) un texto de diagnóstico sobre la gráfica.
+
+        Es un artista animado: se pinta con el resto en el siguiente fotograma.
+        """
+        self._pixeles_diagnostico = None
+        if texto is None:
+            if self.texto_diagnostico is not None:
+                self.texto_diagnostico.remove()
+                self.texto_diagnostico = None
+            return
+        if self.texto_diagnostico is None:
+            self.texto_diagnostico = self.ax.text(
+                0.02, 0.02,
+                '',
+                transform=self.ax.transAxes,
+                fontsize=8,
+                family='monospace',
+                verticalalignment='bottom',
+                bbox=dict(boxstyle='square', facecolor='black', edgecolor='#00FF88'),
+                color='#00FF88',
+                zorder=6,
+                animated=self.animada
+            )
+        self.texto_diagnostico.set_text(texto)
+
+    def actualizar(self, tiempos, actividades, gamma, secundarias=(), total=None):
+        """
+        Incorpora las muestras nuevas y refresca el fotograma.
+
+        Args:
+            tiempos (ndarray): Vista del historial de tiempos
+            actividades (ndarray): Vista del historial de actividades
+            gamma (float): Factor gamma actual
+            secundarias (list): Vistas de actividades de cada curva adicional,
+                con la misma longitud que ``tiempos``
+            total (int): Muestras agregadas desde el inicio; si el historial
+                es un anillo las vistas solo cubren las últimas y es este
+                contador el que indica cuántas son nuevas
+        """
+        if self.linea is None:
+            return
+        if total is None:
+            total = len(tiempos)
+        self._total = total
+
+        self.linea.historial = (tiempos, actividades)
+        for (linea_sec, _), actividades_sec in zip(self.secundarias, secundarias):
+            linea_sec.historial = (tiempos, actividades_sec)
+        self.texto_gamma.set_text(f'γ = {gamma:.4f}')
+        self.texto_gamma.get_bbox_patch().set_facecolor(color_gamma(gamma))
+        self._gamma = gamma
+
+        if not self.animada:
+            return
+        if self.fondo is None:
+            self.canvas.draw()
+            return
+
+        with self._medir("dibujo"):
+            self.canvas.restore_region(self.fondo)
+
+            # Tramo nuevo desde el último punto ya presente en el fondo
+            inicio = max(len(tiempos) - (total - self._n_en_fondo) - 1, 0)
+            for (_, tramo_sec), actividades_sec in zip(self.secundarias, secundarias):
+                tramo_sec.set_data(tiempos[inicio:], actividades_sec[inicio:])
+                self.ax.draw_artist(tramo_sec)
+            self.tramo.set_data(tiempos[inicio:], actividades[inicio:])
+            self.ax.draw_artist(self.tramo)
+            # La leyenda es estática (forma parte del fondo); se recuperan sus
+            # píxeles para que los tramos nuevos no la tapen
+            if self._pixeles_leyenda is not None:
+                self.canvas.restore_region(self._pixeles_leyenda)
+            self.fondo = self.canvas.copy_from_bbox(self.ax.bbox)
+            self._n_en_fondo = total
+
+            self._dibujar_animados()
+        with self._medir("blit"):
+            self.canvas.blit(self.ax.bbox)
+
+    def instantanea(self):
+        """
+        Copia del estado de la gráfica, independiente de los búferes en vivo.
+
+        Returns:
+            dict: Parámetros de ``preparar``, copias del historial, gamma,
+            eventos marcados y punto seleccionado; None si no hay curva
+        """
+        if self.linea is None or self.linea.historial is None:
+            return None
+
+        tiempos, actividades = self.linea.datos()
+        punto = self.punto_marcado.get_xydata()
+        return {
+            "tamano": tuple(self.fig.get_size_inches()),
+            "parametros": dict(self._parametros),
+            "tiempos": np.array(tiempos),
+            "actividades": np.array(actividades),
+            "secundarias": [
+                np.array(linea_sec.datos()[1])
+                for linea_sec, _ in self.secundarias if linea_sec.historial is not None
+            ],
+            "gamma": self._gamma,
+            "eventos": list(self.eventos),
+            "punto": tuple(punto[0]) if len(punto) else None,
+            "ajuste": self._ajuste
+        }
+
+    def restaurar(self, instantanea):
+        """Reconstruye la gráfica a partir de ``instantanea()``"""
+        self._ajuste = instantanea.get("ajuste")
+        self.preparar(**instantanea["parametros"])
+        for tiempo, actividad, texto in instantanea["eventos"]:
+            self.marcar_evento(tiempo, actividad, texto)
+        if instantanea["punto"] is not None:
+            self.marcar_punto(*instantanea["punto"])
+        self.actualizar(
+            instantanea["tiempos"],
+            instantanea["actividades"],
+            instantanea["gamma"],
+            instantanea["secundarias"]
+        )
@@ -4,37 +4,59 @@ Versión mejorada con control de actividad final, gamma y visualización avanzad
 """
 
 import customtkinter as ctk
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from datetime import datetime
 import time
-import math
 import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from tkinter import filedialog
 
 # Importaciones de los módulos del proyecto
-from config.constantes import COLORES
-from utilidades.calculos import calcular_actividad_restante, calcular_tiempo_para_actividad
+from config.constantes import (
+    COLORES, UMBRALES_PORCENTAJE, REFRESCO, CADENAS_DECAIMIENTO, EXPORTACION, INSTRUMENTACION,
+    VELOCIDADES_RELOJ, RETARDO_FORMULA_MS, BIBLIOTECA_NUCLIDOS, SESIONES, REGISTRO, AJUSTE,
+    ESTOCASTICO
+)
+from modelos.radiofarmaco import CatalogoRadiofarmacos
+from modelos.planificador import PlanificadorEventos, RefrescoAdaptativo, Antirrebote, Evento
+from modelos.simulacion import SimuladorDecaimiento, Muestra
+from modelos.sesion import EXTENSION_SESION, guardar_sesion, cargar_sesion
+from modelos.registro import EXTENSION_REGISTRO, recuperar_registro
+from modelos.cache_resultados import obtener_cache
+from modelos.ajuste import ajustar_csv
+from modelos.nuclidos import obtener_biblioteca, normalizar
+from utilidades.calculos import obtener_formula_sustituida
+from utilidades.cadenas import CadenaDecaimiento
+from utilidades.instrumentacion import InstrumentacionRefresco
+from interfaz.exportacion import ExportadorGraficas
 
 class SimuladorGUI:
-    """Interfaz profesional para simulación con control avanzado"""
+    """
+    Interfaz profesional para simulación con control avanzado.
     
-    def __init__(self, root, radiofarmacos, escalas_tiempo, simulador):
+    Es una vista sobre ``SimuladorDecaimiento``: el motor muestrea y guarda
+    el historial, y la interfaz solo marca el ritmo (``root.after``) y dibuja
+    cada muestra que el motor le publica.
+    """
+    
+    def __init__(self, root, radiofarmacos, escalas_tiempo, simulador=None):
         self.root = root
         self.radiofarmacos = radiofarmacos
+        self.catalogo = CatalogoRadiofarmacos.desde_dict(radiofarmacos)
         self.escalas_tiempo = escalas_tiempo
-        self.simulador = simulador
+        self.simulador = simulador if simulador is not None else SimuladorDecaimiento()
+        self.simulador.suscribir(self._mostrar_muestra)
+        # Ventana en memoria sin registro en disco (la del motor recibido)
+        self._capacidad_sin_registro = self.simulador.capacidad_maxima
         
         # Variables de simulación
-        self.tiempos = []
-        self.actividades = []
-        self.gammas = []
-        self.start_time = 0
+        self.comparados = []
         self.tiempo_simulacion_real = 0
         self.tiempo_simulacion = 0
         self.actividad_inicial = 0
         self.actividad_final = 0
         self.vida_media = 0
+        self.radiofarmaco = None
         self.color = "#3498DB"
         self.simulacion_activa = False
         self.simulacion_pausada = False
@@ -42,7 +64,38 @@ class SimuladorGUI:
         
         # Variables para punto seleccionado
         self.punto_seleccionado = None
-        self.punto_marcado = None
+        
+        # Eventos programados (fin, objetivo y umbrales) y bucle de refresco
+        self.planificador = PlanificadorEventos(self.root.after, self.root.after_cancel)
+        self.refresco = RefrescoAdaptativo(**REFRESCO)
+        self._id_refresco = None
+        
+        # Tiempos por fase y deriva del refresco (opcional)
+        self.instrumentacion = InstrumentacionRefresco(activa=INSTRUMENTACION["activa"])
+        self.simulador.instrumentacion = self.instrumentacion
+        self._ultimo_overlay = 0.0
+        
+        # Panel de la fórmula: una evaluación por ráfaga de teclas y solo
+        # se reescriben las etiquetas cuyo texto cambia
+        self._formula_diferida = Antirrebote(
+            self.root.after, self.root.after_cancel, RETARDO_FORMULA_MS, self._actualizar_formula
+        )
+        self._textos_mostrados = {}
+        
+        # Filtro del selector de radiofármacos (biblioteca de núclidos)
+        self._busqueda_diferida = Antirrebote(
+            self.root.after, self.root.after_cancel,
+            BIBLIOTECA_NUCLIDOS["retardo_busqueda_ms"], self._filtrar_radiofarmacos
+        )
+        
+        # Exportaciones en segundo plano
+        self.exportador = ExportadorGraficas()
+        self._id_revision_exportacion = None
+        
+        # Ajuste a lecturas medidas (en un proceso aparte)
+        self._ejecutor_ajuste = None
+        self._ajuste_pendiente = None
+        self._id_revision_ajuste = None
         
         # Configurar ventana
         self._configurar_ventana()
@@ -51,6 +104,23 @@ class SimuladorGUI:
         self._crear_interfaz()
         self._configurar_graficas()
         
+    @property
+    def serie(self):
+        """Historial del radiofármaco principal (del motor)"""
+        return self.simulador.serie
+    
+    @property
+    def reloj(self):
+        return self.simulador.reloj
+    
+    @property
+    def paralelas(self):
+        return self.simulador.paralelas
+    
+    @property
+    def series_cadena(self):
+        return self.simulador.series_cadena
+        
     def _configurar_ventana(self):
         """Configura las propiedades de la ventana"""
         self.root.title("Simulador Profesional de Decaimiento Radiactivo")
@@ -105,6 +175,9 @@ class SimuladorGUI:
         # Panel Gamma
         self._crear_panel_gamma()
         
+        # Núcleos del modelo Monte Carlo
+        self._crear_panel_particulas()
+        
         # Panel de botones - ¡ESTE ES EL QUE FALTABA!
         self._crear_panel_botones()
         
@@ -203,20 +276,82 @@ class SimuladorGUI:
             font=("Arial Bold", 14)
         ).pack(pady=(10, 15))
         
-        # Radiofármaco
+        # Radiofármaco: el buscador filtra el catálogo y la biblioteca de núclidos
         ctk.CTkLabel(control_frame, text="Radiofármaco:", font=("Arial Bold", 11)).pack(anchor="w", padx=20)
+        self.entry_busqueda = ctk.CTkEntry(
+            control_frame,
+            placeholder_text="Buscar núclido (nombre o símbolo)...",
+            fg_color=COLORES["fondo_frame"],
+            text_color="white",
+            font=("Arial", 11)
+        )
+        self.entry_busqueda.pack(fill="x", pady=(0, 5), padx=20)
+        self.entry_busqueda.bind("<KeyRelease>", self._busqueda_diferida)
+        
         self.combo_radiofarmaco = ctk.CTkComboBox(
             control_frame,
-            values=list(self.radiofarmacos.keys()),
+            values=self.catalogo.nombres(),
             width=340,
             fg_color=COLORES["fondo_frame"],
             text_color="white",
             command=self._actualizar_formula,
             font=("Arial", 11)
         )
-        self.combo_radiofarmaco.pack(fill="x", pady=(0, 10), padx=20)
+        self.combo_radiofarmaco.pack(fill="x", pady=(0, 5), padx=20)
         self.combo_radiofarmaco.set("Fluor-18")
         
+        # Radiofármacos que se simulan a la vez para compararlos
+        comparacion_frame = ctk.CTkFrame(control_frame, fg_color="transparent")
+        comparacion_frame.pack(fill="x", padx=20, pady=(0, 5))
+        
+        ctk.CTkButton(
+            comparacion_frame,
+            text="+ COMPARAR",
+            command=self._agregar_comparacion,
+            fg_color="#3498DB",
+            hover_color="#2980B9",
+            width=160,
+            height=28,
+            font=("Arial Bold", 11),
+            corner_radius=8
+        ).pack(side="left")
+        
+        ctk.CTkButton(
+            comparacion_frame,
+            text="QUITAR",
+            command=self._quitar_comparaciones,
+            fg_color="#95A5A6",
+            hover_color="#7F8C8D",
+            width=90,
+            height=28,
+            font=("Arial Bold", 11),
+            corner_radius=8
+        ).pack(side="right")
+        
+        self.comparacion_label = ctk.CTkLabel(
+            control_frame,
+            text="Sin comparaciones",
+            font=("Arial", 10),
+            text_color="#AAAAAA",
+            wraplength=320,
+            justify="left"
+        )
+        self.comparacion_label.pack(anchor="w", padx=20, pady=(0, 10))
+        
+        # Cadena de decaimiento (opcional)
+        ctk.CTkLabel(control_frame, text="Cadena de decaimiento:", font=("Arial Bold", 11)).pack(anchor="w", padx=20)
+        self.combo_cadena = ctk.CTkComboBox(
+            control_frame,
+            values=["Ninguna"] + list(CADENAS_DECAIMIENTO.keys()),
+            width=340,
+            fg_color=COLORES["fondo_frame"],
+            text_color="white",
+            command=self._cambiar_cadena,
+            font=("Arial", 11)
+        )
+        self.combo_cadena.pack(fill="x", pady=(0, 10), padx=20)
+        self.combo_cadena.set("Ninguna")
+        
         # Actividad Inicial
         ctk.CTkLabel(control_frame, text="Actividad Inicial (MBq):", font=("Arial Bold", 11)).pack(anchor="w", padx=20)
         self.entry_actividad = ctk.CTkEntry(
@@ -228,7 +363,7 @@ class SimuladorGUI:
         )
         self.entry_actividad.pack(fill="x", pady=(0, 10), padx=20)
         self.entry_actividad.insert(0, "100")
-        self.entry_actividad.bind("<KeyRelease>", lambda e: self._actualizar_formula())
+        self.entry_actividad.bind("<KeyRelease>", self._formula_diferida)
         
         # Actividad Final
         ctk.CTkLabel(
@@ -247,7 +382,7 @@ class SimuladorGUI:
         )
         self.entry_actividad_final.pack(fill="x", pady=(0, 10), padx=20)
         self.entry_actividad_final.insert(0, "50")
-        self.entry_actividad_final.bind("<KeyRelease>", lambda e: self._actualizar_formula())
+        self.entry_actividad_final.bind("<KeyRelease>", self._formula_diferida)
         
         # Tiempo total a simular
         ctk.CTkLabel(
@@ -265,7 +400,7 @@ class SimuladorGUI:
         )
         self.entry_tiempo_simulacion.pack(fill="x", pady=(0, 10), padx=20)
         self.entry_tiempo_simulacion.insert(0, "5")
-        self.entry_tiempo_simulacion.bind("<KeyRelease>", lambda e: self._actualizar_formula())
+        self.entry_tiempo_simulacion.bind("<KeyRelease>", self._formula_diferida)
         
         # Tiempo real de simulación
         ctk.CTkLabel(control_frame, text="Duración real (minutos):", font=("Arial Bold", 11)).pack(anchor="w", padx=20)
@@ -276,9 +411,104 @@ class SimuladorGUI:
             text_color="white",
             font=("Arial", 11)
         )
-        self.entry_tiempo_real.pack(fill="x", pady=(0, 15), padx=20)
+        self.entry_tiempo_real.pack(fill="x", pady=(0, 10), padx=20)
         self.entry_tiempo_real.insert(0, "1")
         
+        # Velocidad del reloj (se puede cambiar durante la simulación)
+        ctk.CTkLabel(control_frame, text="Velocidad:", font=("Arial Bold", 11)).pack(anchor="w", padx=20)
+        self.combo_velocidad = ctk.CTkComboBox(
+            control_frame,
+            values=[f"{v:g}x" for v in VELOCIDADES_RELOJ],
+            width=340,
+            fg_color=COLORES["fondo_frame"],
+            text_color="white",
+            command=self._cambiar_velocidad,
+            font=("Arial", 11)
+        )
+        self.combo_velocidad.pack(fill="x", pady=(0, 15), padx=20)
+        self.combo_velocidad.set("1x")
+        
+    def _factor_velocidad(self):
+        """Factor de velocidad elegido (1 si el texto no es válido)"""
+        try:
+            factor = float(self.combo_velocidad.get().rstrip("x"))
+        except ValueError:
+            return 1.0
+        return factor if factor > 0 else 1.0
+        
+    def _cambiar_velocidad(self, valor=None):
+        """Aplica la nueva velocidad sin saltos y reprograma los eventos"""
+        # Una sesión abierta deja el reloj iniciado pero no hay simulación que acelerar
+        if not self.reloj.iniciado or not self.simulacion_activa:
+            return
+        self.reloj.velocidad = self._horas_por_segundo() * self._factor_velocidad()
+        if self.simulacion_activa and not self.simulacion_pausada:
+            self.planificador.iniciar(self.reloj.tiempo(), self.reloj.velocidad)
+        
+    def _agregar_comparacion(self):
+        """Añade el radiofármaco seleccionado a las curvas de comparación"""
+        if self.simulacion_activa:
+            return
+        nombre = self.combo_radiofarmaco.get()
+        if self._obtener_radiofarmaco(nombre) is not None and nombre not in self.comparados:
+            self.comparados.append(nombre)
+        self._actualizar_lista_comparacion()
+        
+    def _quitar_comparaciones(self):
+        """Vacía la lista de comparación"""
+        if self.simulacion_activa:
+            return
+        self.comparados = []
+        self._actualizar_lista_comparacion()
+        
+    def _actualizar_lista_comparacion(self):
+        texto = "Comparar con: " + ", ".join(self.comparados) if self.comparados else "Sin comparaciones"
+        self.comparacion_label.configure(text=texto)
+        
+    def _biblioteca(self):
+        """Biblioteca de núclidos (se carga en el primer uso); None si no está disponible"""
+        try:
+            return obtener_biblioteca()
+        except (OSError, ValueError):
+            return None
+        
+    def _obtener_radiofarmaco(self, nombre):
+        """Radiofármaco del catálogo o, si no está, de la biblioteca de núclidos"""
+        if nombre in self.catalogo:
+            return self.catalogo[nombre]
+        biblioteca = self._biblioteca()
+        if biblioteca is not None and nombre in biblioteca:
+            return biblioteca.radiofarmaco(nombre)
+        return None
+        
+    def _filtrar_radiofarmacos(self, event=None):
+        """Limita el selector a los radiofármacos y núclidos que coinciden con la búsqueda"""
+        self._busqueda_diferida.cancelar()
+        texto = self.entry_busqueda.get().strip()
+        if not texto:
+            self.combo_radiofarmaco.configure(values=self.catalogo.nombres())
+            return
+        
+        clave = normalizar(texto)
+        nombres = [n for n in self.catalogo.nombres() if clave in normalizar(n)]
+        biblioteca = self._biblioteca()
+        if biblioteca is not None:
+            nombres.extend(n for n in biblioteca.buscar(texto, BIBLIOTECA_NUCLIDOS["resultados_busqueda"])
+                           if n not in self.catalogo)
+        
+        self.combo_radiofarmaco.configure(values=nombres or ["Sin resultados"])
+        if nombres and self.combo_radiofarmaco.get() not in nombres:
+            self.combo_radiofarmaco.set(nombres[0])
+            self._actualizar_formula()
+        
+    def _cambiar_cadena(self, nombre_cadena):
+        """Al elegir una cadena, el radiofármaco principal pasa a ser su padre"""
+        if self.simulacion_activa:
+            return
+        if nombre_cadena in CADENAS_DECAIMIENTO:
+            self.combo_radiofarmaco.set(CADENAS_DECAIMIENTO[nombre_cadena]["miembros"][0])
+        self._actualizar_formula()
+        
     def _crear_panel_formula(self):
         """Crea el panel con la fórmula sustituida"""
         formula_frame = ctk.CTkFrame(self.scrollable_frame, fg_color="#1A1A2E", corner_radius=10)
@@ -370,52 +600,46 @@ class SimuladorGUI:
         
     def _actualizar_formula(self, event=None):
         """Actualiza la visualización de la fórmula con valores sustituidos"""
+        self._formula_diferida.cancelar()
         try:
-            radiofarmaco = self.combo_radiofarmaco.get()
-            vida_media = self.radiofarmacos[radiofarmaco]["vida_media"]
+            radiofarmaco = self._obtener_radiofarmaco(self.combo_radiofarmaco.get())
+            if radiofarmaco is None:
+                return
             A0 = float(self.entry_actividad.get() or 0)
             
-            # Calcular lambda
-            lambda_val = math.log(2) / vida_media
-            self.label_lambda.configure(
-                text=f"λ = ln(2) / {vida_media} = {lambda_val:.6f} h⁻¹"
-            )
-            
             if self.modo_simulacion == "tiempo":
                 t = float(self.entry_tiempo_simulacion.get() or 0)
-                At = calcular_actividad_restante(A0, t, vida_media)
-                
-                self.label_formula_general.configure(text="A(t) = A₀ · e^(-λt)")
-                self.label_sustitucion.configure(
-                    text=f"A({t}) = {A0} · e^(-{lambda_val:.4f} × {t})"
-                )
-                self.label_resultado.configure(
-                    text=f"A({t}) = {At:.4f} MBq"
-                )
+                formula = obtener_formula_sustituida("tiempo", A0, 0.0, t, radiofarmaco.vida_media)
                 
             else:  # modo actividad
                 Af = float(self.entry_actividad_final.get() or 0)
                 if Af >= A0 or Af <= 0:
-                    self.label_sustitucion.configure(text="Actividad final debe ser menor que inicial")
+                    self._mostrar_texto(self.label_sustitucion, "Actividad final debe ser menor que inicial")
                     return
                     
-                t = calcular_tiempo_para_actividad(A0, Af, vida_media)
+                formula = obtener_formula_sustituida("actividad", A0, Af, 0.0, radiofarmaco.vida_media)
                 
                 # Actualizar automáticamente el campo de tiempo
-                self.entry_tiempo_simulacion.delete(0, "end")
-                self.entry_tiempo_simulacion.insert(0, f"{t:.4f}")
-                
-                self.label_formula_general.configure(text="t = -ln(Af / A₀) / λ")
-                self.label_sustitucion.configure(
-                    text=f"t = -ln({Af} / {A0}) / {lambda_val:.4f}"
-                )
-                self.label_resultado.configure(
-                    text=f"t = {t:.4f} horas"
-                )
+                texto_tiempo = f"{formula['valor']:.4f}"
+                if self.entry_tiempo_simulacion.get() != texto_tiempo:
+                    self.entry_tiempo_simulacion.delete(0, "end")
+                    self.entry_tiempo_simulacion.insert(0, texto_tiempo)
+            
+            self._mostrar_texto(self.label_lambda, formula["texto_lambda"])
+            self._mostrar_texto(self.label_formula_general, formula["formula"])
+            self._mostrar_texto(self.label_sustitucion, formula["sustitucion"])
+            self._mostrar_texto(self.label_resultado, formula["resultado"])
                 
-        except (ValueError, ZeroDivisionError):
+        except (ValueError, ZeroDivisionError, KeyError):
             pass
         
+    def _mostrar_texto(self, etiqueta, texto):
+        """Reconfigura la etiqueta solo si su texto cambia"""
+        if self._textos_mostrados.get(id(etiqueta)) == texto:
+            return
+        self._textos_mostrados[id(etiqueta)] = texto
+        etiqueta.configure(text=texto)
+        
     def _crear_etiquetas_info(self):
         """Crea las etiquetas de información en tiempo real"""
         info_frame = ctk.CTkFrame(self.scrollable_frame, fg_color="#1A1A2E", corner_radius=10)
@@ -514,6 +738,76 @@ class SimuladorGUI:
         )
         self.gamma_desc_label.pack(pady=(5, 10))
         
+    def _crear_panel_particulas(self):
+        """
+        Crea el panel de partículas del modo Monte Carlo.
+        
+        Cada símbolo representa una fracción de los núcleos simulados por el
+        motor; desaparece cuando el muestreo binomial hace decaer esa
+        fracción, así que la animación sigue los decaimientos reales.
+        """
+        particulas_frame = ctk.CTkFrame(self.scrollable_frame, fg_color="#1A1A2E", corner_radius=10)
+        particulas_frame.pack(fill="x", padx=10, pady=10)
+        
+        ctk.CTkLabel(
+            particulas_frame,
+            text="Núcleos (Monte Carlo)",
+            font=("Arial Bold", 14),
+            text_color="#00D9FF"
+        ).pack(pady=(10, 5))
+        
+        self.check_estocastico = ctk.CTkCheckBox(
+            particulas_frame,
+            text="Simular decaimientos aleatorios",
+            font=("Arial", 11),
+            text_color="#AAAAAA"
+        )
+        self.check_estocastico.pack(pady=(0, 5))
+        
+        self.canvas_particulas = ctk.CTkCanvas(
+            particulas_frame,
+            width=300,
+            height=150,
+            bg="#0F0F1E",
+            highlightthickness=0
+        )
+        self.canvas_particulas.pack(pady=5)
+        self._ids_particulas = []
+        
+        self.estocastico_label = ctk.CTkLabel(
+            particulas_frame,
+            text="",
+            font=("Arial", 10),
+            text_color="#AAAAAA"
+        )
+        self.estocastico_label.pack(pady=(0, 10))
+        
+    def _dibujar_particulas(self):
+        """Dibuja las partículas vivas del modelo Monte Carlo (o vacía el panel)"""
+        self.canvas_particulas.delete("all")
+        self._ids_particulas = []
+        self.estocastico_label.configure(text="")
+        estocastico = self.simulador.estocastico
+        if estocastico is None:
+            return
+        
+        posiciones, simbolos = estocastico.particulas_visibles()
+        self._ids_particulas = [
+            self.canvas_particulas.create_text(x, y, text=simbolo, fill=self.color, font=("Arial", 12))
+            for (x, y), simbolo in zip(posiciones.tolist(), simbolos.tolist())
+        ]
+        
+    def _mostrar_particulas(self, muestra):
+        """Borra las partículas que decayeron en el último paso y resume el conteo"""
+        estocastico = self.simulador.estocastico
+        for i in estocastico.eliminadas.tolist():
+            self.canvas_particulas.delete(self._ids_particulas[i])
+        estadisticas = estocastico.estadisticas()
+        self.estocastico_label.configure(
+            text=f"N = {int(estocastico.restantes[0])} (esperado {estadisticas['restantes_esperados']:.0f})"
+                 f"  |  A = {muestra.actividad_estocastica:.4f} MBq"
+        )
+        
     def _crear_panel_botones(self):
         """Crea el panel completo de botones de control"""
         botones_frame = ctk.CTkFrame(self.scrollable_frame, fg_color="#1A1A2E", corner_radius=10)
@@ -631,6 +925,161 @@ class SimuladorGUI:
             corner_radius=8
         ).pack(fill="x", pady=2)
         
+        # Resolución y estado de las exportaciones
+        exportacion_frame = ctk.CTkFrame(botones_frame, fg_color="transparent")
+        exportacion_frame.pack(fill="x", padx=10, pady=(5, 0))
+        
+        ctk.CTkLabel(
+            exportacion_frame,
+            text="Resolución (DPI):",
+            font=("Arial Bold", 11),
+            text_color="#AAAAAA"
+        ).pack(side="left", padx=(0, 5))
+        
+        self.combo_dpi = ctk.CTkComboBox(
+            exportacion_frame,
+            values=[str(dpi) for dpi in EXPORTACION["dpi_opciones"]],
+            width=90,
+            height=30,
+            font=("Arial", 11),
+            fg_color=COLORES["fondo_input"],
+            button_color="#3498DB",
+            button_hover_color="#2980B9"
+        )
+        self.combo_dpi.set(str(EXPORTACION["dpi"]))
+        self.combo_dpi.pack(side="left")
+        
+        self.exportacion_label = ctk.CTkLabel(
+            botones_frame,
+            text="",
+            font=("Arial", 10),
+            text_color="#AAAAAA",
+            wraplength=300
+        )
+        self.exportacion_label.pack(fill="x", padx=10)
+        
+        # Sesiones completas en disco (parámetros e historiales)
+        sesion_frame = ctk.CTkFrame(botones_frame, fg_color="transparent")
+        sesion_frame.pack(fill="x", padx=10, pady=(5, 0))
+        
+        ctk.CTkButton(
+            sesion_frame,
+            text="GUARDAR SESIÓN",
+            command=self.guardar_sesion,
+            fg_color="#16A085",
+            hover_color="#138D75",
+            height=35,
+            font=("Arial Bold", 12),
+            corner_radius=8
+        ).pack(side="left", fill="x", expand=True, padx=(0, 2))
+        
+        ctk.CTkButton(
+            sesion_frame,
+            text="ABRIR SESIÓN",
+            command=self.abrir_sesion,
+            fg_color="#16A085",
+            hover_color="#138D75",
+            height=35,
+            font=("Arial Bold", 12),
+            corner_radius=8
+        ).pack(side="right", fill="x", expand=True, padx=(2, 0))
+        
+        # Registro en disco para simulaciones largas (recuperable tras un cierre)
+        registro_frame = ctk.CTkFrame(botones_frame, fg_color="transparent")
+        registro_frame.pack(fill="x", padx=10, pady=(5, 0))
+        
+        self.check_registro = ctk.CTkCheckBox(
+            registro_frame,
+            text="Registrar en disco",
+            font=("Arial", 11),
+            text_color="#AAAAAA"
+        )
+        self.check_registro.pack(side="left")
+        
+        ctk.CTkButton(
+            registro_frame,
+            text="RECUPERAR",
+            command=self.recuperar_registro,
+            fg_color="#95A5A6",
+            hover_color="#7F8C8D",
+            width=80,
+            height=28,
+            font=("Arial Bold", 11),
+            corner_radius=8
+        ).pack(side="right")
+        
+        # Ajuste de t½ y A₀ a lecturas del activímetro, superpuesto en la gráfica
+        ajuste_frame = ctk.CTkFrame(botones_frame, fg_color="transparent")
+        ajuste_frame.pack(fill="x", padx=10, pady=(5, 0))
+        
+        self.check_refinar = ctk.CTkCheckBox(
+            ajuste_frame,
+            text="Refinado no lineal",
+            font=("Arial", 11),
+            text_color="#AAAAAA"
+        )
+        self.check_refinar.pack(side="left")
+        
+        ctk.CTkButton(
+            ajuste_frame,
+            text="QUITAR",
+            command=self.quitar_ajuste,
+            fg_color="#95A5A6",
+            hover_color="#7F8C8D",
+            width=60,
+            height=28,
+            font=("Arial Bold", 11),
+            corner_radius=8
+        ).pack(side="right", padx=(2, 0))
+        
+        ctk.CTkButton(
+            ajuste_frame,
+            text="AJUSTAR CSV",
+            command=self.ajustar_lecturas,
+            fg_color="#95A5A6",
+            hover_color="#7F8C8D",
+            width=90,
+            height=28,
+            font=("Arial Bold", 11),
+            corner_radius=8
+        ).pack(side="right")
+        
+        self.ajuste_label = ctk.CTkLabel(
+            botones_frame,
+            text="",
+            font=("Arial", 10),
+            text_color="#AAAAAA",
+            wraplength=300
+        )
+        self.ajuste_label.pack(fill="x", padx=10)
+        
+        # Diagnóstico del bucle de refresco
+        diagnostico_frame = ctk.CTkFrame(botones_frame, fg_color="transparent")
+        diagnostico_frame.pack(fill="x", padx=10, pady=(5, 0))
+        
+        self.check_diagnostico = ctk.CTkCheckBox(
+            diagnostico_frame,
+            text="Diagnóstico de refresco",
+            command=self._cambiar_instrumentacion,
+            font=("Arial", 11),
+            text_color="#AAAAAA"
+        )
+        if self.instrumentacion.activa:
+            self.check_diagnostico.select()
+        self.check_diagnostico.pack(side="left")
+        
+        ctk.CTkButton(
+            diagnostico_frame,
+            text="VOLCAR",
+            command=self.volcar_diagnostico,
+            fg_color="#95A5A6",
+            hover_color="#7F8C8D",
+            width=80,
+            height=28,
+            font=("Arial Bold", 11),
+            corner_radius=8
+        ).pack(side="right")
+        
         # Botón Cerrar
         ctk.CTkButton(
             botones_frame,
@@ -665,23 +1114,20 @@ class SimuladorGUI:
             text_color="#00D9FF"
         ).pack(pady=15)
         
-        # Configuración de la gráfica
-        self.fig, self.ax = plt.subplots(
-            facecolor=COLORES["fondo_grafica"],
-            figsize=(10, 6)
-        )
-        self.ax.set_facecolor(COLORES["fondo_grafica"])
-        self.ax.set_xlabel("Tiempo (horas)", color='white', fontsize=12, fontweight='bold')
-        self.ax.set_ylabel("Actividad (MBq)", color='white', fontsize=12, fontweight='bold')
-        self.ax.set_title("Decaimiento en Tiempo Real", color='white', fontsize=14, fontweight='bold')
-        self.ax.tick_params(colors='white', labelsize=10)
-        self.ax.grid(color='gray', linestyle='--', linewidth=0.5, alpha=0.3)
-        
-        self.canvas = FigureCanvasTkAgg(self.fig, master=self.right_frame)
-        self.canvas.get_tk_widget().pack(fill="both", expand=True, padx=10, pady=10)
+        # Contenedor de la gráfica: matplotlib se importa cuando la ventana
+        # ya está en pantalla (ver _crear_grafica)
+        self.fig = self.ax = self.canvas = self.grafica = None
+        self.grafica_frame = ctk.CTkFrame(self.right_frame, fg_color=COLORES["fondo_grafica"])
+        self.grafica_frame.pack(fill="both", expand=True, padx=10, pady=10)
         
-        # Conectar evento de clic
-        self.canvas.mpl_connect('button_press_event', self._on_click_grafica)
+        self.cargando_grafica_label = ctk.CTkLabel(
+            self.grafica_frame,
+            text="Cargando gráfica...",
+            font=("Arial", 13),
+            text_color="#AAAAAA"
+        )
+        self.cargando_grafica_label.pack(expand=True)
+        self.root.after_idle(self._crear_grafica)
         
         # Panel de información del punto seleccionado
         self.punto_info_frame = ctk.CTkFrame(
@@ -761,20 +1207,59 @@ class SimuladorGUI:
         )
         self.aplicacion_label.pack(anchor="w")
     
+    def _crear_grafica(self):
+        """
+        Crea la figura y el lienzo la primera vez que se necesitan.
+        
+        Importar matplotlib y el backend de Tk es lo más lento del arranque,
+        así que se hace después de mostrar la ventana. Se usa la API de
+        ``Figure`` directamente, sin pyplot ni su gestor de figuras.
+        """
+        if self.grafica is not None:
+            return
+        
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from interfaz.grafica import GraficaDecaimiento
+        
+        self.fig = Figure(facecolor=COLORES["fondo_grafica"], figsize=(10, 6))
+        self.ax = self.fig.add_subplot(111)
+        
+        self.cargando_grafica_label.destroy()
+        self.canvas = FigureCanvasTkAgg(self.fig, master=self.grafica_frame)
+        self.canvas.get_tk_widget().pack(fill="both", expand=True)
+        
+        # Artistas persistentes con blitting
+        self.grafica = GraficaDecaimiento(self.fig, self.ax, self.canvas)
+        self.grafica.instrumentacion = self.instrumentacion
+        
+        # Conectar evento de clic
+        self.canvas.mpl_connect('button_press_event', self._on_click_grafica)
+        
     def _on_click_grafica(self, event):
         """Maneja el clic en la gráfica para mostrar información del punto"""
-        if event.inaxes != self.ax or len(self.tiempos) == 0:
+        if event.inaxes != self.ax or len(self.serie) == 0:
             return
         
-        # Encontrar el punto más cercano al clic
-        click_x = event.xdata
-        distancias = [abs(t - click_x) for t in self.tiempos]
-        idx_cercano = distancias.index(min(distancias))
-        
-        # Obtener datos del punto
-        tiempo_punto = self.tiempos[idx_cercano]
-        actividad_punto = self.actividades[idx_cercano]
-        gamma_punto = self.gammas[idx_cercano] if idx_cercano < len(self.gammas) else 1.0
+        # Encontrar el punto más cercano al clic (búsqueda binaria); lo que ya
+        # salió de la ventana en memoria se lee del registro en disco
+        registro = self.simulador.registro
+        comparadas = []
+        if registro is not None and event.xdata < self.serie.tiempos[0]:
+            fila = registro.registro_mas_cercano(event.xdata)
+            self.punto_seleccionado = None
+            tiempo_punto, actividad_punto, gamma_punto = fila[registro.columnas("serie")]
+            if "paralelas" in registro.bloques:
+                comparadas = fila[registro.columnas("paralelas")][1:]
+        else:
+            idx_cercano = self.serie.indice_mas_cercano(event.xdata)
+            self.punto_seleccionado = idx_cercano
+            tiempo_punto = self.serie.tiempos[idx_cercano]
+            actividad_punto = self.serie.actividades[idx_cercano]
+            gamma_punto = self.serie.gammas[idx_cercano]
+            if self.paralelas is not None and idx_cercano < len(self.paralelas):
+                comparadas = [self.paralelas.actividades(i)[idx_cercano]
+                              for i in range(1, len(self.paralelas.radiofarmacos))]
         porcentaje_punto = (actividad_punto / self.actividad_inicial) * 100
         decaimiento_punto = 100 - porcentaje_punto
         
@@ -787,43 +1272,22 @@ class SimuladorGUI:
             f"Gamma (γ): {gamma_punto:.4f}"
         )
         
+        # Curvas comparadas en el mismo instante
+        for rf, actividad in zip(self.paralelas.radiofarmacos[1:], comparadas):
+            info_texto += f"\n{rf.nombre}: {actividad:.4f} MBq"
+        
         self.punto_info_label.configure(
             text=info_texto,
             text_color="white"
         )
         
-        # Marcar el punto en la gráfica
-        if self.punto_marcado is not None:
-            self.punto_marcado.remove()
-        
-        self.punto_marcado = self.ax.plot(
-            tiempo_punto, 
-            actividad_punto, 
-            'o', 
-            color='#FFD700', 
-            markersize=12, 
-            markeredgecolor='white',
-            markeredgewidth=2,
-            zorder=5
-        )[0]
-        
-        self.canvas.draw()
-        
-    def _calcular_gamma(self, actividad_actual):
-        """Calcula el valor de gamma (0 a 1)"""
-        if self.actividad_inicial == 0:
-            return 0
-        gamma = actividad_actual / self.actividad_inicial
-        return max(0.0, min(1.0, gamma))
+        # Marcar el punto en la gráfica (blitting solo del marcador)
+        self.grafica.marcar_punto(tiempo_punto, actividad_punto)
         
     def _actualizar_color_gamma(self, gamma):
         """Actualiza el color del valor de gamma según su intensidad"""
-        # Interpolar entre rojo (baja actividad) y verde (alta actividad)
-        r = int(255 * (1 - gamma))
-        g = int(255 * gamma)
-        b = 80
-        color = f"#{r:02x}{g:02x}{b:02x}"
-        return color
+        from interfaz.grafica import color_gamma
+        return color_gamma(gamma)
         
     def _actualizar_estado_botones(self):
         """Actualiza el estado de los botones según la simulación"""
@@ -844,9 +1308,14 @@ class SimuladorGUI:
         """Pausa o reanuda la simulación"""
         if self.simulacion_activa and not self.simulacion_pausada:
             self.simulacion_pausada = True
+            self.simulador.pausar()
+            self._cancelar_programados()
         else:
             self.simulacion_pausada = False
             if self.simulacion_activa:
+                # El tiempo en pausa no cuenta: la curva sigue donde se quedó
+                self.simulador.reanudar()
+                self.planificador.iniciar(self.reloj.tiempo(), self.reloj.velocidad)
                 self.actualizar_grafica()
         
         self._actualizar_estado_botones()
@@ -855,28 +1324,32 @@ class SimuladorGUI:
         """Detiene completamente la simulación"""
         self.simulacion_activa = False
         self.simulacion_pausada = False
+        self.simulador.pausar()
+        self._cancelar_programados()
         self._actualizar_estado_botones()
 
+    def _cancelar_programados(self):
+        """Cancela el refresco pendiente y los eventos programados"""
+        if self._id_refresco is not None:
+            self.root.after_cancel(self._id_refresco)
+            self._id_refresco = None
+        self.instrumentacion.cancelar_tick()
+        self.planificador.detener()
+
     def limpiar_grafica(self):
         """Limpia la gráfica manteniendo los parámetros"""
         self.simulacion_activa = False
         self.simulacion_pausada = False
+        self._cancelar_programados()
         
         # Limpiar datos de la gráfica
-        self.tiempos = []
-        self.actividades = []
-        self.gammas = []
-        self.punto_marcado = None
+        self.simulador.reiniciar()
+        self.punto_seleccionado = None
         
         # Limpiar gráfica
-        self.ax.clear()
-        self.ax.set_facecolor(COLORES["fondo_grafica"])
-        self.ax.set_xlabel("Tiempo (horas)", color='white', fontsize=12, fontweight='bold')
-        self.ax.set_ylabel("Actividad (MBq)", color='white', fontsize=12, fontweight='bold')
-        self.ax.set_title("Decaimiento en Tiempo Real", color='white', fontsize=14, fontweight='bold')
-        self.ax.tick_params(colors='white', labelsize=10)
-        self.ax.grid(color='gray', linestyle='--', linewidth=0.5, alpha=0.3)
-        self.canvas.draw()
+        if self.grafica is not None:
+            self.grafica.limpiar()
+        self._dibujar_particulas()
         
         # Reiniciar etiquetas de información
         self.tiempo_label.configure(text="0.0000 h")
@@ -894,164 +1367,532 @@ class SimuladorGUI:
         self._actualizar_estado_botones()
 
     def guardar_imagen(self):
-        """Guarda la gráfica como imagen PNG"""
-        if not self.tiempos:
+        """Exporta la gráfica como imagen PNG en segundo plano"""
+        if len(self.serie) == 0:
             self._mostrar_error("No hay datos para guardar. Ejecute una simulación primero.")
             return
             
-        try:
-            file_path = filedialog.asksaveasfilename(
-                defaultextension=".png",
-                filetypes=[("PNG files", "*.png"), ("JPEG files", "*.jpg"), ("All files", "*.*")],
-                title="Guardar gráfica como imagen"
-            )
-            
-            if file_path:
-                # Guardar la figura actual
-                self.fig.savefig(file_path, dpi=300, bbox_inches='tight', facecolor=COLORES["fondo_grafica"])
-                
-                self._mostrar_mensaje("Éxito", f"Gráfica guardada correctamente en:\n{file_path}")
-                
-        except Exception as e:
-            self._mostrar_error(f"Error al guardar imagen: {str(e)}")
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".png",
+            filetypes=[("PNG files", "*.png"), ("JPEG files", "*.jpg"), ("All files", "*.*")],
+            title="Guardar gráfica como imagen"
+        )
+        
+        if file_path:
+            self._encolar_exportacion(file_path)
 
     def guardar_pdf(self):
-        """Guarda la gráfica como PDF"""
-        if not self.tiempos:
+        """Exporta la gráfica como PDF en segundo plano"""
+        if len(self.serie) == 0:
             self._mostrar_error("No hay datos para guardar. Ejecute una simulación primero.")
             return
             
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".pdf",
+            filetypes=[("PDF files", "*.pdf"), ("All files", "*.*")],
+            title="Guardar gráfica como PDF"
+        )
+        
+        if file_path:
+            self._encolar_exportacion(file_path)
+
+    def guardar_sesion(self):
+        """Guarda la simulación (parámetros e historiales) en un archivo de sesión"""
+        if len(self.serie) == 0:
+            self._mostrar_error("No hay datos para guardar. Ejecute una simulación primero.")
+            return
+        
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=EXTENSION_SESION,
+            filetypes=[("Sesiones de simulación", f"*{EXTENSION_SESION}"), ("All files", "*.*")],
+            title="Guardar sesión"
+        )
+        if not file_path:
+            return
+        
         try:
-            file_path = filedialog.asksaveasfilename(
-                defaultextension=".pdf",
-                filetypes=[("PDF files", "*.pdf"), ("All files", "*.*")],
-                title="Guardar gráfica como PDF"
+            tamano = guardar_sesion(
+                file_path, self.simulador,
+                modo=self.modo_simulacion,
+                tiempo_simulacion_real_min=self.tiempo_simulacion_real
             )
-            
-            if file_path:
-                # Guardar la figura actual como PDF
-                self.fig.savefig(file_path, bbox_inches='tight', facecolor=COLORES["fondo_grafica"])
-                
-                self._mostrar_mensaje("Éxito", f"Gráfica guardada correctamente en:\n{file_path}")
-                
+            self._mostrar_mensaje(
+                "Éxito",
+                f"Sesión guardada correctamente en:\n{file_path}\n\n"
+                f"{len(self.serie)} muestras  |  "
+                + (f"{tamano / 1e6:.2f} MB" if tamano >= 1e6 else f"{tamano / 1e3:.1f} kB")
+            )
+        except (OSError, ValueError) as e:
+            self._mostrar_error(f"Error al guardar la sesión: {str(e)}")
+
+    def abrir_sesion(self):
+        """
+        Abre una sesión guardada y la dibuja.
+        
+        Los historiales quedan proyectados desde el archivo: solo se leen las
+        muestras que se dibujan (diezmadas) o que se consultan con un clic.
+        """
+        file_path = filedialog.askopenfilename(
+            filetypes=[("Sesiones de simulación", f"*{EXTENSION_SESION}"), ("All files", "*.*")],
+            title="Abrir sesión"
+        )
+        if not file_path:
+            return
+        
+        self.simulacion_activa = False
+        self.simulacion_pausada = False
+        self._cancelar_programados()
+        try:
+            cabecera = cargar_sesion(file_path, self.simulador)
+        except (OSError, ValueError, KeyError) as e:
+            self._mostrar_error(f"Error al abrir la sesión: {str(e)}")
+            return
+        
+        self._mostrar_sesion(cabecera)
+        self._actualizar_estado_botones()
+
+    def recuperar_registro(self):
+        """
+        Reconstruye una simulación desde su registro en disco.
+        
+        Sirve para registros de simulaciones terminadas y para los que
+        quedaron a medias por un cierre inesperado.
+        """
+        file_path = filedialog.askopenfilename(
+            initialdir=REGISTRO["directorio"],
+            filetypes=[("Registros de simulación", f"*{EXTENSION_REGISTRO}"), ("All files", "*.*")],
+            title="Recuperar registro"
+        )
+        if not file_path:
+            return
+        
+        self.simulacion_activa = False
+        self.simulacion_pausada = False
+        self._cancelar_programados()
+        try:
+            cabecera = recuperar_registro(file_path, self.simulador)
+        except (OSError, ValueError, KeyError) as e:
+            self._mostrar_error(f"Error al recuperar el registro: {str(e)}")
+            return
+        
+        self._mostrar_sesion(cabecera)
+        self._actualizar_estado_botones()
+        self._mostrar_mensaje(
+            "Registro recuperado",
+            f"{cabecera['muestras']} muestras hasta t = {cabecera['reloj']['tiempo']:.4f} h"
+        )
+
+    def _mostrar_sesion(self, cabecera):
+        """Dibuja y resume la sesión que el motor acaba de cargar"""
+        simulador = self.simulador
+        radiofarmacos = simulador.paralelas.radiofarmacos
+        self.radiofarmaco = radiofarmacos[0]
+        self.vida_media = self.radiofarmaco.vida_media
+        self.color = simulador.color
+        self.actividad_inicial = simulador.actividad_inicial
+        self.actividad_final = simulador.actividad_deseada
+        tiempo_final, actividad_final, gamma_final = self.serie.ultimo()
+        self.tiempo_simulacion = simulador.duracion or tiempo_final
+        # Minutos reales de la simulación original; la escala guardada
+        # (horas simuladas por minuto real) sirve para sesiones sin ese dato
+        self.tiempo_simulacion_real = (
+            cabecera["metadatos"].get("tiempo_simulacion_real_min")
+            or self.tiempo_simulacion / simulador.escala_tiempo
+        )
+        self.punto_seleccionado = None
+        
+        self.vida_media_label.configure(text=f"{self.vida_media:g} horas")
+        self.aplicacion_label.configure(text=self.radiofarmaco.aplicacion)
+        self.fecha_label.configure(text=cabecera["fecha"].replace("T", " "))
+        self.punto_info_label.configure(
+            text="Haga clic en la gráfica para ver detalles de un punto específico",
+            text_color="#AAAAAA"
+        )
+        
+        secundarias = [(f"Decaimiento de {rf.nombre}", rf.color) for rf in radiofarmacos[1:]]
+        if simulador.cadena is not None:
+            secundarias.extend(
+                (f"Actividad de {nombre}", (self._obtener_radiofarmaco(nombre) or self.radiofarmaco).color)
+                for nombre in simulador.cadena.nombres[1:]
+            )
+        actividad_minima, actividad_maxima = simulador.limites_actividad()
+        
+        self._dibujar_particulas()
+        self._crear_grafica()
+        self.grafica.preparar(
+            etiqueta=f"Decaimiento de {self.radiofarmaco.nombre}",
+            color=self.color,
+            tiempo_total=self.tiempo_simulacion,
+            actividad_inicial=self.actividad_inicial,
+            actividad_minima=actividad_minima,
+            actividad_objetivo=self.actividad_final if cabecera["metadatos"].get("modo") == "actividad" else None,
+            secundarias=secundarias,
+            actividad_maxima=actividad_maxima
+        )
+        
+        # Umbrales alcanzados durante la sesión
+        for porcentaje in UMBRALES_PORCENTAJE:
+            tiempo = self.radiofarmaco.tiempo_para_actividad(
+                self.actividad_inicial, self.actividad_inicial * porcentaje / 100
+            )
+            if tiempo <= tiempo_final:
+                self._on_umbral(Evento(f"{porcentaje}%", tiempo, None))
+        
+        # Solo se leen del archivo las muestras que se dibujan
+        indices = self.serie.indices_diezmados(SESIONES["puntos_grafica"])
+        self.grafica.actualizar(
+            self.serie.tiempos[indices],
+            self.serie.actividades[indices],
+            gamma_final,
+            [vista[indices] for vista in self._vistas_secundarias()]
+        )
+        self._mostrar_etiquetas(Muestra(
+            tiempo_final, actividad_final, gamma_final, gamma_final * 100,
+            simulador.paralelas.evaluar(tiempo_final)
+        ))
+
+    def _encolar_exportacion(self, file_path):
+        """
+        Encola la exportación de una instantánea de la gráfica actual.
+        
+        El renderizado ocurre en otro proceso; la simulación sigue animándose
+        y el estado se consulta periódicamente con ``root.after``.
+        """
+        instantanea = self.grafica.instantanea() if self.grafica is not None else None
+        if instantanea is None:
+            self._mostrar_error("No hay datos para guardar. Ejecute una simulación primero.")
+            return
+        
+        try:
+            dpi = int(self.combo_dpi.get())
+            if dpi <= 0:
+                raise ValueError
+        except ValueError:
+            self._mostrar_error("La resolución debe ser un número entero de DPI mayor que cero")
+            return
+        
+        try:
+            self.exportador.encolar(instantanea, file_path, dpi)
         except Exception as e:
-            self._mostrar_error(f"Error al guardar PDF: {str(e)}")
+            self._mostrar_error(f"Error al exportar la gráfica: {str(e)}")
+            return
+        
+        self._revisar_exportaciones()
+
+    def _revisar_exportaciones(self):
+        """Actualiza el estado de las exportaciones y notifica las terminadas"""
+        if self._id_revision_exportacion is not None:
+            self.root.after_cancel(self._id_revision_exportacion)
+            self._id_revision_exportacion = None
+        
+        for trabajo in self.exportador.recoger_terminados():
+            error = trabajo.futuro.exception()
+            if error is not None:
+                self._mostrar_error(f"Error al guardar {trabajo.nombre}: {str(error)}")
+            else:
+                self._mostrar_mensaje(
+                    "Éxito",
+                    f"Gráfica guardada correctamente en:\n{trabajo.ruta}\n\n"
+                    f"Resolución: {trabajo.dpi} DPI  |  Renderizado: {trabajo.futuro.result():.2f} s"
+                )
+        
+        pendientes = self.exportador.pendientes()
+        if not pendientes:
+            self.exportacion_label.configure(text="")
+            return
+        
+        actual = pendientes[0]
+        texto = f"Exportando {actual.nombre} ({actual.estado})"
+        if len(pendientes) > 1:
+            texto += f"  |  {len(pendientes) - 1} en cola"
+        self.exportacion_label.configure(text=texto)
+        
+        self._id_revision_exportacion = self.root.after(
+            EXPORTACION["intervalo_revision_ms"], self._revisar_exportaciones
+        )
+
+    def ajustar_lecturas(self):
+        """
+        Ajusta t½ y A₀ a un CSV de lecturas y superpone la curva en la gráfica.
+        
+        El CSV necesita las columnas ``tiempo`` (horas) y ``actividad`` (MBq).
+        Se recorre por bloques en un proceso aparte, así que la simulación en
+        curso sigue animándose aunque el archivo tenga millones de lecturas.
+        """
+        if self._ajuste_pendiente is not None:
+            self._mostrar_error("Ya hay un ajuste en curso")
+            return
+        file_path = filedialog.askopenfilename(
+            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")],
+            title="Lecturas del activímetro"
+        )
+        if not file_path:
+            return
+        
+        if self._ejecutor_ajuste is None:
+            # spawn: el proceso hijo no hereda la conexión con el servidor gráfico
+            self._ejecutor_ajuste = ProcessPoolExecutor(
+                max_workers=1, mp_context=multiprocessing.get_context("spawn")
+            )
+        futuro = self._ejecutor_ajuste.submit(
+            ajustar_csv, file_path, refinar=bool(self.check_refinar.get())
+        )
+        self._ajuste_pendiente = (file_path, futuro)
+        self.ajuste_label.configure(text=f"Ajustando {os.path.basename(file_path)}...")
+        self._id_revision_ajuste = self.root.after(AJUSTE["intervalo_revision_ms"], self._revisar_ajuste)
+
+    def _revisar_ajuste(self):
+        """Dibuja y resume el ajuste en curso cuando termina"""
+        self._id_revision_ajuste = None
+        file_path, futuro = self._ajuste_pendiente
+        if not futuro.done():
+            self._id_revision_ajuste = self.root.after(AJUSTE["intervalo_revision_ms"], self._revisar_ajuste)
+            return
+        
+        self._ajuste_pendiente = None
+        self.ajuste_label.configure(text="")
+        nombre = os.path.basename(file_path)
+        error = futuro.exception()
+        if error is not None:
+            self._mostrar_error(f"Error al ajustar {nombre}: {str(error)}")
+            return
+        
+        resultado = futuro.result()
+        self._crear_grafica()
+        self.grafica.superponer_ajuste(
+            *resultado.curva(),
+            etiqueta=f"Ajuste: t½ = {resultado.vida_media:.4g} h",
+            lecturas=(resultado.muestra_tiempos, resultado.muestra_actividades)
+        )
+        referencia = self.radiofarmaco.vida_media if self.radiofarmaco is not None else None
+        self._mostrar_mensaje(f"Ajuste de {nombre}", resultado.resumen(referencia), alto=400)
+
+    def quitar_ajuste(self):
+        """Quita de la gráfica la curva ajustada y las lecturas"""
+        if self.grafica is not None:
+            self.grafica.quitar_ajuste()
+
+    def _horas_por_segundo(self):
+        """Horas simuladas por cada segundo real a velocidad 1x"""
+        return self.tiempo_simulacion / (self.tiempo_simulacion_real * 60)
+
+    def _mostrar_muestra(self, muestra):
+        """Suscriptor del motor: dibuja la muestra nueva y actualiza las etiquetas"""
+        if self.grafica is None or self.grafica.linea is None:
+            return
+        
+        # Actualizar gráfica (solo el tramo nuevo y los artistas animados)
+        self.grafica.actualizar(
+            self.serie.tiempos,
+            self.serie.actividades,
+            muestra.gamma,
+            self._vistas_secundarias(),
+            total=self.serie.total_agregado
+        )
+        
+        # Actualizar etiquetas de información en tiempo real
+        self._mostrar_etiquetas(muestra)
+        if muestra.actividad_estocastica is not None:
+            self._mostrar_particulas(muestra)
+        
+    def _mostrar_etiquetas(self, muestra):
+        """Tiempo, actividad, porcentaje y gamma de una muestra"""
+        with self.instrumentacion.medir("etiquetas"):
+            self.tiempo_label.configure(text=f"{muestra.tiempo:.4f} h")
+            self.actividad_label.configure(text=f"{muestra.actividad:.4f} MBq")
+            self.porcentaje_label.configure(text=f"{muestra.porcentaje_restante:.2f}%")
+            
+            # Actualizar gamma
+            color_gamma = self._actualizar_color_gamma(muestra.gamma)
+            self.gamma_valor_label.configure(text=f"{muestra.gamma:.4f}", text_color=color_gamma)
+            self.gamma_progress.set(muestra.gamma)
+
+    def _vistas_secundarias(self):
+        """Historial de las curvas adicionales, en el orden de ``preparar``"""
+        vistas = [self.paralelas.actividades(i) for i in range(1, len(self.paralelas.radiofarmacos))]
+        vistas.extend(serie.actividades for serie in self.series_cadena)
+        return vistas
+
+    def _historial_registro(self):
+        """
+        Simulación completa diezmada desde el registro en disco.
+        
+        Es el proveedor de los redibujados completos de la gráfica cuando la
+        memoria solo conserva la ventana reciente.
+        
+        Returns:
+            tuple: (tiempos, actividades, secundarias) como en ``actualizar``
+        """
+        registro = self.simulador.registro
+        if registro is None:
+            return self.serie.tiempos, self.serie.actividades, self._vistas_secundarias()
+        
+        vista = registro.historial(SESIONES["puntos_grafica"])
+        secundarias = []
+        if "paralelas" in registro.bloques:
+            columnas = registro.columnas("paralelas")
+            secundarias.extend(vista[:, i] for i in range(columnas.start + 1, columnas.stop))
+        for i in range(len(self.series_cadena)):
+            secundarias.append(vista[:, registro.columnas(f"cadena_{i}").start + 1])
+        return vista[:, 0], vista[:, 1], secundarias
 
     def actualizar_grafica(self):
-        """Actualiza la gráfica con los nuevos datos"""
+        """
+        Refresco visual periódico.
+        
+        La finalización y los umbrales los dispara el planificador en su
+        instante exacto; este bucle solo muestrea la curva para dibujarla.
+        """
+        self._id_refresco = None
+        self.instrumentacion.registrar_tick()
         if not self.simulacion_activa or self.simulacion_pausada:
             return
-            
-        # Calcular tiempo transcurrido
-        tiempo_real_segundos = time.time() - self.start_time
-        tiempo_real_minutos = tiempo_real_segundos / 60
-        tiempo_escalado = (tiempo_real_minutos / self.tiempo_simulacion_real) * self.tiempo_simulacion
-        
-        # Calcular actividad actual
-        actividad_actual = calcular_actividad_restante(
-            self.actividad_inicial,
-            tiempo_escalado,
-            self.vida_media
-        )
-        
-        # Calcular gamma
-        gamma_actual = self._calcular_gamma(actividad_actual)
-        
-        # Agregar datos
-        self.tiempos.append(tiempo_escalado)
-        self.actividades.append(actividad_actual)
-        self.gammas.append(gamma_actual)
-        
-        # Actualizar gráfica
-        self.ax.clear()
-        self.ax.set_facecolor(COLORES["fondo_grafica"])
-        self.ax.plot(
-            self.tiempos,
-            self.actividades,
-            marker='o',
-            color=self.color,
-            linewidth=3,
-            markersize=5,
-            markeredgecolor='white',
-            markeredgewidth=0.5,
-            label=f"Decaimiento de {self.combo_radiofarmaco.get()}",
-            alpha=0.9
+        
+        if self.instrumentacion.activa:
+            self._actualizar_overlay()
+        
+        # El motor limita el tiempo a la duración; el último tramo lo cierra
+        # el evento de finalización en t = T exacto
+        muestra = self.simulador.muestrear()
+        
+        intervalo = self._intervalo_refresco(muestra.actividad)
+        self._id_refresco = self.root.after(intervalo, self.actualizar_grafica)
+        self.instrumentacion.programado(intervalo)
+
+    def _actualizar_overlay(self):
+        """Refresca el texto de diagnóstico como mucho cada intervalo_overlay_ms"""
+        ahora = time.perf_counter()
+        if (ahora - self._ultimo_overlay) * 1000 < INSTRUMENTACION["intervalo_overlay_ms"]:
+            return
+        self._ultimo_overlay = ahora
+        self.grafica.mostrar_diagnostico(self.instrumentacion.texto_overlay())
+
+    def _cambiar_instrumentacion(self):
+        """Activa o desactiva la medición y el texto de diagnóstico"""
+        self.instrumentacion.activa = bool(self.check_diagnostico.get())
+        self.instrumentacion.cancelar_tick()
+        if self.grafica is None or self.grafica.linea is None:
+            return
+        if self.instrumentacion.activa:
+            self._ultimo_overlay = 0.0
+            self._actualizar_overlay()
+        else:
+            self.grafica.mostrar_diagnostico(None)
+        self.grafica.repintar()
+
+    def volcar_diagnostico(self):
+        """Guarda en JSON los histogramas de tiempos por fase y deriva"""
+        if self.instrumentacion.ticks == 0 and not self.instrumentacion.fases:
+            self._mostrar_error("No hay mediciones. Active el diagnóstico y ejecute una simulación.")
+            return
+        
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".json",
+            filetypes=[("JSON files", "*.json"), ("All files", "*.*")],
+            title="Guardar diagnóstico de refresco"
         )
+        if not file_path:
+            return
+        
+        try:
+            self.instrumentacion.volcar(
+                file_path,
+                radiofarmaco=self.radiofarmaco.nombre if self.radiofarmaco else None,
+                actividad_inicial=self.actividad_inicial,
+                tiempo_simulacion=self.tiempo_simulacion,
+                tiempo_simulacion_real_min=self.tiempo_simulacion_real,
+                muestras=len(self.serie),
+                fecha=datetime.now().isoformat(timespec="seconds")
+            )
+            self._mostrar_mensaje("Éxito", f"Diagnóstico guardado correctamente en:\n{file_path}")
+        except OSError as e:
+            self._mostrar_error(f"Error al guardar el diagnóstico: {str(e)}")
+
+    def _intervalo_refresco(self, actividad_actual):
+        """
+        Intervalo hasta el siguiente fotograma según la velocidad de la curva en pantalla.
+        
+        En x la curva avanza a ritmo constante; en y la pendiente es λ·A(t),
+        que se aplana al final de la simulación.
+        """
+        pixeles_por_hora, pixeles_por_mbq = self.grafica.escala_pixeles()
+        horas_por_segundo = self.reloj.velocidad
+        velocidad_x = pixeles_por_hora * horas_por_segundo
+        # Con curvas comparadas manda la que más deprisa baja en pantalla
+        pendiente = max(self.radiofarmaco.constante_decaimiento * actividad_actual,
+                        self.paralelas.pendiente_maxima() if self.paralelas is not None else 0.0)
+        velocidad_y = pixeles_por_mbq * pendiente * horas_por_segundo
+        return self.refresco.intervalo_ms(max(velocidad_x, velocidad_y))
+
+    def _programar_eventos(self):
+        """Registra los eventos de la simulación con sus tiempos en forma cerrada"""
+        self.planificador.limpiar()
+        
+        self.planificador.agregar("fin", self.tiempo_simulacion, self._on_fin_simulacion)
         
-        # Agregar línea de actividad final si es modo actividad
         if self.modo_simulacion == "actividad" and self.actividad_final > 0:
-            self.ax.axhline(
-                y=self.actividad_final,
-                color='#FF4444',
-                linestyle='--',
-                linewidth=2,
-                label=f'Objetivo: {self.actividad_final} MBq',
-                alpha=0.7
+            self.planificador.agregar(
+                "objetivo",
+                self.radiofarmaco.tiempo_para_actividad(self.actividad_inicial, self.actividad_final),
+                self._on_umbral
             )
         
-        self.ax.set_xlabel("Tiempo (horas)", color='white', fontsize=12, fontweight='bold')
-        self.ax.set_ylabel("Actividad (MBq)", color='white', fontsize=12, fontweight='bold')
-        self.ax.set_title("Decaimiento en Tiempo Real", color='white', fontsize=14, fontweight='bold')
-        self.ax.tick_params(colors='white', labelsize=10)
-        self.ax.grid(color='gray', linestyle='--', linewidth=0.5, alpha=0.3)
-        self.ax.legend(
-            facecolor=COLORES["fondo_grafica"], 
-            edgecolor='white', 
-            labelcolor='white',
-            fontsize=10,
-            loc='upper right'
-        )
-        
-        # Añadir anotación de gamma en la gráfica
-        if len(self.tiempos) > 1:
-            self.ax.text(
-                0.02, 0.98, 
-                f'γ = {gamma_actual:.4f}',
-                transform=self.ax.transAxes,
-                fontsize=12,
-                verticalalignment='top',
-                bbox=dict(boxstyle='round', facecolor=self._actualizar_color_gamma(gamma_actual), alpha=0.8),
-                color='white',
-                fontweight='bold'
+        for porcentaje in UMBRALES_PORCENTAJE:
+            tiempo = self.radiofarmaco.tiempo_para_actividad(
+                self.actividad_inicial, self.actividad_inicial * porcentaje / 100
             )
+            if tiempo < self.tiempo_simulacion:
+                self.planificador.agregar(f"{porcentaje}%", tiempo, self._on_umbral)
         
-        self.canvas.draw()
+        self.planificador.iniciar(0.0, self.reloj.velocidad)
+
+    def _on_umbral(self, evento):
+        """Marca en la gráfica el instante exacto en que se cruza un umbral"""
+        actividad = self.radiofarmaco.actividad(self.actividad_inicial, evento.tiempo_simulado)
+        texto = f"{actividad:.2f} MBq" if evento.nombre == "objetivo" else evento.nombre
+        self.grafica.marcar_evento(evento.tiempo_simulado, actividad, texto)
+
+    def _on_fin_simulacion(self, evento):
+        """Cierra la simulación con una última muestra en t = T"""
+        self._cancelar_programados()
+        self.simulador.pausar()
+        muestra = self.simulador.muestrear(evento.tiempo_simulado)
         
-        # Actualizar etiquetas de información en tiempo real
-        porcentaje_restante = (actividad_actual / self.actividad_inicial) * 100
-        
-        self.tiempo_label.configure(text=f"{tiempo_escalado:.4f} h")
-        self.actividad_label.configure(text=f"{actividad_actual:.4f} MBq")
-        self.porcentaje_label.configure(text=f"{porcentaje_restante:.2f}%")
-        
-        # Actualizar gamma
-        color_gamma = self._actualizar_color_gamma(gamma_actual)
-        self.gamma_valor_label.configure(text=f"{gamma_actual:.4f}", text_color=color_gamma)
-        self.gamma_progress.set(gamma_actual)
-        
-        # Continuar si no se alcanzó el tiempo límite
-        if tiempo_escalado < self.tiempo_simulacion and self.simulacion_activa and not self.simulacion_pausada:
-            self.root.after(100, self.actualizar_grafica)
-        elif tiempo_escalado >= self.tiempo_simulacion:
-            self.simulacion_activa = False
-            self.simulacion_pausada = False
-            self._actualizar_estado_botones()
-            self._mostrar_mensaje(
-                "Simulación Completada", 
-                f"La simulación de {self.tiempo_simulacion:.2f} horas ha finalizado.\n\n"
-                f"Actividad final: {actividad_actual:.4f} MBq\n"
-                f"Gamma final: {gamma_actual:.4f}\n"
-                f"Decaimiento total: {100 - porcentaje_restante:.2f}%"
-            )
+        self.simulacion_activa = False
+        self.simulacion_pausada = False
+        self._actualizar_estado_botones()
+        self._mostrar_mensaje(
+            "Simulación Completada", 
+            f"La simulación de {self.tiempo_simulacion:.2f} horas ha finalizado.\n\n"
+            f"Actividad final: {muestra.actividad:.4f} MBq\n"
+            f"Gamma final: {muestra.gamma:.4f}\n"
+            f"Decaimiento total: {100 - muestra.porcentaje_restante:.2f}%\n"
+            f"Actividad acumulada: {self.simulador.obtener_estadisticas()['actividad_acumulada']:.2f} MBq·h"
+        )
             
     def iniciar_simulacion(self):
         """Inicia la simulación con los parámetros ingresados"""
         try:
             # Obtener parámetros
+            # Con una cadena seleccionada, el principal es el padre
+            nombre_cadena = self.combo_cadena.get()
+            cadena = None
+            if nombre_cadena in CADENAS_DECAIMIENTO:
+                cadena = CadenaDecaimiento.desde_dict(CADENAS_DECAIMIENTO[nombre_cadena], self.catalogo)
+                self.combo_radiofarmaco.set(cadena.nombres[0])
+            
+            # La fórmula se recalcula con retardo tras cada tecla y en modo
+            # actividad es la que rellena la duración: aplicar ya lo pendiente
+            self._actualizar_formula()
+            
             radiofarmaco = self.combo_radiofarmaco.get()
-            self.vida_media = self.radiofarmacos[radiofarmaco]["vida_media"]
-            self.color = self.radiofarmacos[radiofarmaco]["color"]
-            aplicacion = self.radiofarmacos[radiofarmaco]["aplicacion"]
+            self.radiofarmaco = self._obtener_radiofarmaco(radiofarmaco)
+            if self.radiofarmaco is None:
+                self._mostrar_error(f"Radiofármaco desconocido: {radiofarmaco}")
+                return
+            self.vida_media = self.radiofarmaco.vida_media
+            self.color = self.radiofarmaco.color
+            aplicacion = self.radiofarmaco.aplicacion
             
             self.actividad_inicial = float(self.entry_actividad.get())
             self.tiempo_simulacion = float(self.entry_tiempo_simulacion.get())
@@ -1075,16 +1916,64 @@ class SimuladorGUI:
                 return
             
             # Actualizar información
-            self.vida_media_label.configure(text=f"{self.vida_media} horas")
+            self.vida_media_label.configure(text=f"{self.vida_media:g} horas")
             self.aplicacion_label.configure(text=aplicacion)
             fecha_inicio = datetime.now().strftime("%d/%m/%Y %H:%M:%S")
             self.fecha_label.configure(text=fecha_inicio)
             
-            # Inicializar datos
-            self.start_time = time.time()
-            self.tiempos = [0]
-            self.actividades = [self.actividad_inicial]
-            self.gammas = [1.0]
+            # Inicializar datos en el motor (sin arrancar aún el reloj)
+            self._cancelar_programados()
+            comparados = [self._obtener_radiofarmaco(n) for n in self.comparados if n != radiofarmaco]
+            # Con registro en disco la memoria solo guarda la ventana reciente
+            registrar = bool(self.check_registro.get())
+            self.simulador.capacidad_maxima = (
+                REGISTRO["ventana_muestras"] if registrar else self._capacidad_sin_registro
+            )
+            self.simulador.configurar(
+                self.actividad_inicial, self.radiofarmaco, self.actividad_final,
+                self.tiempo_simulacion / self.tiempo_simulacion_real, self.color,
+                duracion=self.tiempo_simulacion, comparados=comparados, cadena=cadena,
+                nucleos=ESTOCASTICO["nucleos"] if self.check_estocastico.get() else None,
+                particulas=ESTOCASTICO["particulas"]
+            )
+            self._dibujar_particulas()
+            if registrar:
+                self.simulador.iniciar_registro(
+                    os.path.join(
+                        REGISTRO["directorio"],
+                        f"{datetime.now():%Y%m%d_%H%M%S}_{normalizar(radiofarmaco)}{EXTENSION_REGISTRO}"
+                    ),
+                    metadatos={"modo": self.modo_simulacion,
+                               "tiempo_simulacion_real_min": self.tiempo_simulacion_real}
+                )
+            self.punto_seleccionado = None
+            
+            secundarias = [(f"Decaimiento de {rf.nombre}", rf.color) for rf in comparados]
+            if cadena is not None:
+                secundarias.extend(
+                    (f"Actividad de {nombre}", (self._obtener_radiofarmaco(nombre) or self.radiofarmaco).color)
+                    for nombre in cadena.nombres[1:]
+                )
+            # Límites de todas las curvas para fijar los ejes de antemano; la
+            # vista previa de un escenario ya simulado sale de la caché en disco
+            actividad_minima, actividad_maxima = self.simulador.limites_actividad(cache=obtener_cache())
+            
+            # Crear los artistas de la gráfica una sola vez
+            self._crear_grafica()
+            self.instrumentacion.limpiar()
+            self._ultimo_overlay = 0.0
+            self.grafica.preparar(
+                etiqueta=f"Decaimiento de {radiofarmaco}",
+                color=self.color,
+                tiempo_total=self.tiempo_simulacion,
+                actividad_inicial=self.actividad_inicial,
+                actividad_minima=actividad_minima,
+                actividad_objetivo=self.actividad_final if self.modo_simulacion == "actividad" else None,
+                secundarias=secundarias,
+                actividad_maxima=actividad_maxima
+            )
+            if registrar:
+                self.grafica.paginar(self._historial_registro)
             self.simulacion_activa = True
             self.simulacion_pausada = False
             
@@ -1104,7 +1993,10 @@ class SimuladorGUI:
             self.gamma_valor_label.configure(text="1.0000", text_color="#00FF88")
             self.gamma_progress.set(1.0)
             
-            # Iniciar actualización
+            # Programar eventos e iniciar actualización; el reloj arranca
+            # cuando la gráfica ya está dibujada para no empezar con un salto
+            self.simulador.arrancar(self._horas_por_segundo() * self._factor_velocidad())
+            self._programar_eventos()
             self.actualizar_grafica()
             
         except ValueError:
@@ -1116,6 +2008,8 @@ class SimuladorGUI:
         """Reinicia la simulación y limpia la interfaz"""
         self.simulacion_activa = False
         self.simulacion_pausada = False
+        self._cancelar_programados()
+        self.simulador.reiniciar()
         
         # Limpiar entradas
         self.entry_actividad.delete(0, "end")
@@ -1130,6 +2024,8 @@ class SimuladorGUI:
         self.entry_tiempo_real.delete(0, "end")
         self.entry_tiempo_real.insert(0, "1")
         
+        self.combo_velocidad.set("1x")
+        
         # Reiniciar etiquetas
         self.tiempo_label.configure(text="0.0000 h")
         self.actividad_label.configure(text="0.0000 MBq")
@@ -1148,20 +2044,17 @@ class SimuladorGUI:
         )
         
         # Limpiar gráfica
-        self.ax.clear()
-        self.ax.set_facecolor(COLORES["fondo_grafica"])
-        self.ax.set_xlabel("Tiempo (horas)", color='white', fontsize=12, fontweight='bold')
-        self.ax.set_ylabel("Actividad (MBq)", color='white', fontsize=12, fontweight='bold')
-        self.ax.set_title("Decaimiento en Tiempo Real", color='white', fontsize=14, fontweight='bold')
-        self.ax.tick_params(colors='white', labelsize=10)
-        self.ax.grid(color='gray', linestyle='--', linewidth=0.5, alpha=0.3)
-        self.canvas.draw()
+        if self.grafica is not None:
+            self.grafica.limpiar()
+        self._dibujar_particulas()
         
         # Reiniciar variables
-        self.tiempos = []
-        self.actividades = []
-        self.gammas = []
-        self.punto_marcado = None
+        self.comparados = []
+        self._actualizar_lista_comparacion()
+        self.combo_cadena.set("Ninguna")
+        self.entry_busqueda.delete(0, "end")
+        self._filtrar_radiofarmacos()
+        self.punto_seleccionado = None
         
         # Actualizar estado de botones
         self._actualizar_estado_botones()
@@ -1171,6 +2064,14 @@ class SimuladorGUI:
         
     def cerrar_app(self):
         """Cierra la aplicación"""
+        if self._id_revision_exportacion is not None:
+            self.root.after_cancel(self._id_revision_exportacion)
+        self.exportador.cerrar(esperar=bool(self.exportador.pendientes()))
+        if self._id_revision_ajuste is not None:
+            self.root.after_cancel(self._id_revision_ajuste)
+        if self._ejecutor_ajuste is not None:
+            self._ejecutor_ajuste.shutdown(wait=False, cancel_futures=True)
+        self.simulador.detener_registro()
         self.root.quit()
         self.root.destroy()
         
@@ -1213,11 +2114,11 @@ class SimuladorGUI:
             font=("Arial Bold", 12)
         ).pack(pady=(10, 20))
         
-    def _mostrar_mensaje(self, titulo, mensaje):
+    def _mostrar_mensaje(self, titulo, mensaje, alto=250):
         """Muestra un mensaje informativo profesional"""
         ventana = ctk.CTkToplevel(self.root)
         ventana.title(titulo)
-        ventana.geometry("450x250")
+        ventana.geometry(f"450x{alto}")
         ventana.configure(fg_color=COLORES["fondo_frame"])
         
         # Centrar ventana
@@ -3,22 +3,245 @@ Simulador de Decaimiento Radiactivo
 ====================================
 Aplicación para visualizar el decaimiento de radiofármacos en tiempo real.
 
+Uso:
+    python main.py                                  Abre la interfaz gráfica
+    python main.py batch escenarios.csv [-o salida] Simulación por lotes sin interfaz
+    python main.py ajustar lecturas.csv [--refinar]  Ajuste de t½ y A₀ a lecturas medidas
+    python main.py simular Tecnecio-99m --a0 100 --duracion 24 [-o sesion.rses]
+                                                    Simulación sin interfaz con reloj virtual
+
     @Autor: [Felipe Morales]
         Web: [https://github.com/felipemoraless312/simulador-de-decadimiento-radioactivo-para-radiofarmacos]
         Fecha: [28-10-2025]
 """
 
-import customtkinter as ctk
-from config.constantes import RADIOFARMACOS, ESCALAS_TIEMPO
-from modelos.simulacion import SimuladorDecaimiento
-from interfaz.gui_principal import SimuladorGUI
+import argparse
+import math
+import os
+import sys
+import time
+
+
+def iniciar_gui():
+    """
+    Abre la interfaz gráfica.
+
+    La ventana se muestra en cuanto customtkinter está cargado; el resto de
+    la interfaz se importa después y matplotlib solo cuando se crea la
+    gráfica (ver ``SimuladorGUI._crear_grafica``).
+    """
+    import customtkinter as ctk
+    from config.constantes import COLORES, VENTANA_PRINCIPAL
 
-if __name__ == "__main__":
-    
     ctk.set_appearance_mode("dark")
     ctk.set_default_color_theme("blue")
-    
+
     root = ctk.CTk()
+    root.title(VENTANA_PRINCIPAL["titulo"])
+    root.configure(fg_color=COLORES["fondo_principal"])
+    aviso = ctk.CTkLabel(root, text="Cargando simulador...", font=("Arial", 14), text_color="#AAAAAA")
+    aviso.pack(expand=True, padx=40, pady=40)
+    root.update()
+
+    from config.constantes import RADIOFARMACOS, ESCALAS_TIEMPO
+    from modelos.simulacion import SimuladorDecaimiento
+    from interfaz.gui_principal import SimuladorGUI
+
+    aviso.destroy()
     simulador = SimuladorDecaimiento()
     app = SimuladorGUI(root, RADIOFARMACOS, ESCALAS_TIEMPO, simulador)
     root.mainloop()
+
+
+def ejecutar_batch(args):
+    """Evalúa un CSV de escenarios y guarda los resultados en CSV o NPZ"""
+    from modelos.lote import leer_escenarios, ejecutar_lote, guardar_resultados
+    from modelos.cache_resultados import obtener_cache
+
+    salida = args.salida or os.path.splitext(args.entrada)[0] + "_resultados.csv"
+    cache = None if args.sin_cache else obtener_cache()
+
+    inicio = time.perf_counter()
+    escenarios = leer_escenarios(args.entrada)
+    resultados = ejecutar_lote(escenarios, puntos=args.puntos, cache=cache)
+    guardar_resultados(salida, escenarios, resultados)
+    duracion = time.perf_counter() - inicio
+
+    origen = " (desde caché)" if cache is not None and cache.aciertos else ""
+    print(f"{len(escenarios['duracion'])} escenarios evaluados en {duracion:.3f} s{origen} -> {salida}")
+
+
+def ejecutar_barrido(args):
+    """Barre la malla A₀ × duración × objetivo para todo el catálogo"""
+    import numpy as np
+    from modelos.barrido import ejecutar_barrido as barrer, parsear_rango, CAMPOS_BARRIDO
+    from modelos.cache_resultados import obtener_cache
+
+    barrido = barrer(
+        parsear_rango(args.a0),
+        parsear_rango(args.duracion),
+        parsear_rango(args.objetivo),
+        procesos=args.procesos,
+        cache=None if args.sin_cache else obtener_cache()
+    )
+    resultados = barrido.pop("resultados")
+    rendimiento = barrido.pop("rendimiento")
+
+    if args.salida:
+        np.savez(
+            args.salida,
+            **{campo: resultados[i] for i, campo in enumerate(CAMPOS_BARRIDO)},
+            radiofarmacos=np.array(barrido["radiofarmacos"]),
+            actividades=barrido["actividades"],
+            duraciones=barrido["duraciones"],
+            objetivos=barrido["objetivos"]
+        )
+
+    total = resultados[0].size
+    if barrido["desde_cache"]:
+        print(f"{total} puntos leídos de la caché en {barrido['segundos']:.3f} s")
+        return
+    print(f"{total} puntos evaluados en {barrido['segundos']:.3f} s "
+          f"({total / barrido['segundos']:.0f} puntos/s)")
+    for pid, puntos_por_segundo in sorted(rendimiento.items()):
+        print(f"  proceso {pid}: {puntos_por_segundo:.0f} puntos/s")
+
+
+def ejecutar_ajuste(args):
+    """Ajusta t½ y A₀ a un CSV de lecturas y lo compara con el catálogo si se pide"""
+    from modelos.ajuste import ajustar_csv
+    from modelos.radiofarmaco import obtener_catalogo
+
+    referencia = None
+    if args.radiofarmaco:
+        catalogo = obtener_catalogo()
+        if args.radiofarmaco not in catalogo:
+            raise ValueError(f"Radiofármaco desconocido '{args.radiofarmaco}'")
+        referencia = catalogo[args.radiofarmaco].vida_media
+
+    inicio = time.perf_counter()
+    resultado = ajustar_csv(
+        args.entrada,
+        columna_tiempo=args.columna_tiempo,
+        columna_actividad=args.columna_actividad,
+        unidad=args.unidad,
+        delimitador=args.delimitador,
+        refinar=args.refinar,
+        ponderacion=args.ponderacion
+    )
+    duracion = time.perf_counter() - inicio
+
+    print(resultado.resumen(referencia))
+    for fila, tiempo, actividad, residuo in resultado.lecturas_atipicas[:args.atipicas]:
+        print(f"  lectura {fila}: t = {tiempo:g} h, A = {actividad:g} MBq, residuo {residuo:+.2f}σ")
+    print(f"Ajustado en {duracion:.3f} s")
+
+
+def ejecutar_simulacion(args):
+    """Recorre una simulación sin pantalla con un reloj virtual y la guarda como sesión"""
+    from modelos.radiofarmaco import obtener_catalogo
+    from modelos.reloj import RelojVirtual
+    from modelos.simulacion import SimuladorDecaimiento
+    from modelos.sesion import guardar_sesion
+
+    catalogo = obtener_catalogo()
+    if args.radiofarmaco not in catalogo:
+        raise ValueError(f"Radiofármaco desconocido '{args.radiofarmaco}'")
+    if args.duracion <= 0 or args.paso <= 0:
+        raise ValueError("La duración y el paso deben ser mayores que cero")
+    radiofarmaco = catalogo[args.radiofarmaco]
+
+    # Una hora simulada por segundo virtual: cada ``avanzar(paso)`` suma ``paso`` horas
+    simulador = SimuladorDecaimiento(semilla=args.semilla, reloj=RelojVirtual())
+    simulador.configurar(args.a0, radiofarmaco, args.objetivo, 60, radiofarmaco.color,
+                         duracion=args.duracion, nucleos=args.nucleos)
+    simulador.arrancar()
+
+    inicio = time.perf_counter()
+    for _ in range(math.ceil(args.duracion / args.paso)):
+        simulador.avanzar(args.paso)
+    duracion = time.perf_counter() - inicio
+
+    estadisticas = simulador.obtener_estadisticas()
+    print(f"{estadisticas['muestras']} muestras hasta t = {estadisticas['tiempo_transcurrido']:g} h "
+          f"en {duracion:.3f} s")
+    print(f"  A = {estadisticas['actividad_actual']:.4g} MBq "
+          f"({estadisticas['porcentaje_restante']:.2f} % de A₀), "
+          f"actividad acumulada {estadisticas['actividad_acumulada']:.4g} MBq·h")
+    if simulador.estocastico is not None:
+        print(f"  Monte Carlo: {simulador.estocastico.restantes[0]} de "
+              f"{args.nucleos} núcleos sin decaer")
+    if args.salida:
+        guardar_sesion(args.salida, simulador)
+        print(f"Sesión guardada en {args.salida}")
+
+
+def crear_parser():
+    """Define los subcomandos de la línea de comandos"""
+    parser = argparse.ArgumentParser(description="Simulador de Decaimiento Radiactivo")
+    subparsers = parser.add_subparsers(dest="comando")
+
+    batch = subparsers.add_parser("batch", help="Simulación por lotes sin interfaz gráfica")
+    batch.add_argument("entrada", help="CSV con columnas radiofarmaco, actividad_inicial, actividad_final, duracion")
+    batch.add_argument("-o", "--salida", help="Archivo de salida (.csv o .npz)")
+    batch.add_argument("--puntos", type=int, default=0,
+                       help="Muestrear cada curva A(t) en N puntos (solo útil con .npz)")
+    batch.add_argument("--sin-cache", action="store_true",
+                       help="Calcular siempre, sin consultar ni guardar en la caché de resultados")
+    batch.set_defaults(funcion=ejecutar_batch)
+
+    barrido = subparsers.add_parser("barrido", help="Barrido paralelo de parámetros sobre el catálogo")
+    barrido.add_argument("--a0", required=True, help="Actividades iniciales: inicio:fin:n o a,b,c (MBq)")
+    barrido.add_argument("--duracion", required=True, help="Duraciones: inicio:fin:n o a,b,c (horas)")
+    barrido.add_argument("--objetivo", required=True, help="Actividades objetivo: inicio:fin:n o a,b,c (MBq)")
+    barrido.add_argument("--procesos", type=int, default=None, help="Número de procesos (por defecto, todos los núcleos)")
+    barrido.add_argument("-o", "--salida", help="Archivo .npz con la malla de resultados")
+    barrido.add_argument("--sin-cache", action="store_true",
+                         help="Calcular siempre, sin consultar ni guardar en la caché de resultados")
+    barrido.set_defaults(funcion=ejecutar_barrido)
+
+    ajuste = subparsers.add_parser("ajustar", help="Ajuste de t½ y A₀ a lecturas del activímetro")
+    ajuste.add_argument("entrada", help="CSV con columnas tiempo y actividad (MBq)")
+    ajuste.add_argument("--columna-tiempo", default="tiempo", help="Columna con el tiempo de cada lectura")
+    ajuste.add_argument("--columna-actividad", default="actividad", help="Columna con la actividad medida")
+    ajuste.add_argument("--unidad", default="h", help="Unidad del tiempo: s, min, h, d o a")
+    ajuste.add_argument("--delimitador", default=",", help="Separador de columnas")
+    ajuste.add_argument("--refinar", action="store_true",
+                        help="Refinar con mínimos cuadrados no lineales ponderados")
+    ajuste.add_argument("--ponderacion", default="relativa",
+                        help="Error supuesto de las lecturas: relativa (σ ∝ A), poisson (σ ∝ √A) o uniforme")
+    ajuste.add_argument("--radiofarmaco", help="Comparar con la vida media de este radiofármaco del catálogo")
+    ajuste.add_argument("--atipicas", type=int, default=10, help="Lecturas atípicas que se listan")
+    ajuste.set_defaults(funcion=ejecutar_ajuste)
+
+    simular = subparsers.add_parser("simular", help="Simulación sin interfaz gráfica con reloj virtual")
+    simular.add_argument("radiofarmaco", help="Nombre del radiofármaco en el catálogo")
+    simular.add_argument("--a0", type=float, required=True, help="Actividad inicial (MBq)")
+    simular.add_argument("--duracion", type=float, required=True, help="Horas simuladas")
+    simular.add_argument("--objetivo", type=float, default=0.0, help="Actividad objetivo (MBq)")
+    simular.add_argument("--paso", type=float, default=0.1, help="Horas simuladas entre muestras")
+    simular.add_argument("--nucleos", type=int, default=None,
+                         help="Simular además los decaimientos aleatorios de N núcleos")
+    simular.add_argument("--semilla", type=int, default=None, help="Semilla del modelo Monte Carlo")
+    simular.add_argument("-o", "--salida", help="Archivo de sesión (.rses) que puede abrir la interfaz")
+    simular.set_defaults(funcion=ejecutar_simulacion)
+
+    return parser
+
+
+def main(argv=None):
+    args = crear_parser().parse_args(argv)
+    if args.comando is None:
+        iniciar_gui()
+        return 0
+
+    try:
+        args.funcion(args)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,558 @@
+"""
+Ajuste de vida media y actividad inicial a lecturas medidas
+Estima A₀ y la vida media efectiva de una serie (t, A) de un activímetro por
+mínimos cuadrados log-lineales y, si se pide, los refina con un ajuste no
+lineal ponderado (Gauss-Newton) de A(t) = A₀·e^(-λt). Los datos se recorren
+por bloques y cada pasada solo acumula sumas, así que un CSV con millones de
+lecturas se ajusta con memoria constante
+"""
+
+import csv
+import math
+import tempfile
+from dataclasses import dataclass, field
+from itertools import islice
+
+import numpy as np
+
+from config.constantes import AJUSTE
+from modelos.nuclidos import UNIDADES_TIEMPO
+from utilidades.calculos import LN2, calcular_actividad_restante
+
+# Error supuesto de cada lectura: "relativa" σ ∝ A (el caso típico de un
+# activímetro), "poisson" σ ∝ √A (conteo) y "uniforme" σ constante
+PONDERACIONES = ("relativa", "poisson", "uniforme")
+
+_TIPO = np.dtype("<f8")
+
+
+def _pesos(actividades, ponderacion):
+    """Pesos 1/σ² de cada lectura en la escala lineal (salvo un factor común)"""
+    if ponderacion == "relativa":
+        return 1.0 / (actividades * actividades)
+    if ponderacion == "poisson":
+        return 1.0 / actividades
+    return np.ones_like(actividades)
+
+
+class _MomentosPonderados:
+    """
+    Medias y co-momentos ponderados de (x, y) acumulados por bloques.
+
+    Cada bloque se centra en su propia media y se combina con lo acumulado
+    (Chan et al.), así que no se pierde precisión aunque haya millones de
+    lecturas o tiempos grandes.
+    """
+
+    __slots__ = ("n", "peso", "media_x", "media_y", "sxx", "sxy", "syy")
+
+    def __init__(self):
+        self.n = 0
+        self.peso = 0.0
+        self.media_x = 0.0
+        self.media_y = 0.0
+        self.sxx = 0.0
+        self.sxy = 0.0
+        self.syy = 0.0
+
+    def agregar(self, x, y, w):
+        peso_b = float(w.sum())
+        if peso_b <= 0:
+            return
+        media_x = float(np.dot(w, x)) / peso_b
+        media_y = float(np.dot(w, y)) / peso_b
+        dx = x - media_x
+        dy = y - media_y
+        wdx = w * dx
+
+        total = self.peso + peso_b
+        delta_x = media_x - self.media_x
+        delta_y = media_y - self.media_y
+        factor = self.peso * peso_b / total
+        self.sxx += float(np.dot(wdx, dx)) + delta_x * delta_x * factor
+        self.sxy += float(np.dot(wdx, dy)) + delta_x * delta_y * factor
+        self.syy += float(np.dot(w * dy, dy)) + delta_y * delta_y * factor
+        self.media_x += delta_x * peso_b / total
+        self.media_y += delta_y * peso_b / total
+        self.peso = total
+        self.n += len(x)
+
+
+@dataclass
+class ResultadoAjuste:
+    """
+    Parámetros ajustados y estadísticas de los residuos.
+
+    El modelo mide el tiempo desde ``tiempo_referencia`` (el de la primera
+    lectura válida), de modo que ``actividad_inicial`` es la actividad en ese
+    instante. Los errores son desviaciones típicas (1σ) escaladas con la
+    dispersión observada de los residuos.
+    """
+    actividad_inicial: float
+    constante_decaimiento: float
+    error_actividad_inicial: float
+    error_constante: float
+    metodo: str
+    ponderacion: str
+    lecturas: int
+    descartadas: int
+    tiempo_referencia: float
+    tiempo_inicial: float
+    tiempo_final: float
+    iteraciones: int = 0
+    convergio: bool = True
+    error_estandar: float = 0.0
+    r2_logaritmico: float = 0.0
+    residuo_medio: float = 0.0
+    residuo_rms: float = 0.0
+    residuo_relativo_rms: float = 0.0
+    residuo_maximo: float = 0.0
+    tiempo_residuo_maximo: float = 0.0
+    atipicos: int = 0
+    lecturas_atipicas: list = field(default_factory=list)
+    muestra_tiempos: np.ndarray = field(default=None, repr=False)
+    muestra_actividades: np.ndarray = field(default=None, repr=False)
+
+    @property
+    def vida_media(self):
+        """Vida media efectiva ajustada en horas"""
+        return LN2 / self.constante_decaimiento
+
+    @property
+    def error_vida_media(self):
+        """Error de la vida media propagado desde el de λ"""
+        return LN2 * self.error_constante / self.constante_decaimiento ** 2
+
+    def evaluar(self, tiempos):
+        """
+        Actividad del modelo ajustado en los tiempos indicados.
+
+        Args:
+            tiempos (float o array): Tiempos en horas, en la escala de las lecturas
+
+        Returns:
+            float o ndarray: Actividad en MBq
+        """
+        return calcular_actividad_restante(
+            self.actividad_inicial, np.asarray(tiempos, dtype=float) - self.tiempo_referencia,
+            self.vida_media, constante_decaimiento=self.constante_decaimiento
+        )
+
+    def curva(self, puntos=None):
+        """
+        Curva ajustada sobre el intervalo de las lecturas.
+
+        Returns:
+            tuple: (tiempos, actividades) con ``puntos`` valores equiespaciados
+        """
+        tiempos = np.linspace(self.tiempo_inicial, self.tiempo_final, puntos or AJUSTE["puntos_curva"])
+        return tiempos, self.evaluar(tiempos)
+
+    def desviacion_vida_media(self, vida_media):
+        """Diferencia relativa entre la vida media ajustada y una de referencia"""
+        return (self.vida_media - vida_media) / vida_media
+
+    def resumen(self, vida_media_referencia=None):
+        """
+        Texto de varias líneas con los parámetros y los residuos.
+
+        Args:
+            vida_media_referencia (float): Vida media teórica con la que comparar
+        """
+        lineas = [
+            f"Método: {self.metodo} (ponderación {self.ponderacion})"
+            + (f", {self.iteraciones} iteraciones" if self.iteraciones else "")
+            + ("" if self.convergio else " SIN CONVERGER"),
+            f"Lecturas: {self.lecturas}" + (f" ({self.descartadas} descartadas)" if self.descartadas else ""),
+            f"t½ efectiva: {self.vida_media:.6g} ± {self.error_vida_media:.2g} h",
+            f"A₀ (t = {self.tiempo_referencia:g} h): {self.actividad_inicial:.6g} ± "
+            f"{self.error_actividad_inicial:.2g} MBq",
+            f"R² (log): {self.r2_logaritmico:.6f}",
+            f"Residuos: RMS {self.residuo_rms:.4g} MBq ({self.residuo_relativo_rms:.2%}), "
+            f"máx {self.residuo_maximo:.4g} MBq en t = {self.tiempo_residuo_maximo:g} h",
+            f"Atípicas: {self.atipicos}"
+        ]
+        if vida_media_referencia:
+            lineas.append(
+                f"Desviación frente a t½ = {vida_media_referencia:g} h: "
+                f"{self.desviacion_vida_media(vida_media_referencia):+.2%}"
+            )
+        return "\n".join(lineas)
+
+
+def bloques_arreglos(tiempos, actividades, filas_por_bloque=None):
+    """Recorre dos arreglos (o memmaps) en bloques de ``filas_por_bloque`` lecturas"""
+    filas = filas_por_bloque or AJUSTE["filas_por_bloque"]
+    for inicio in range(0, len(tiempos), filas):
+        yield tiempos[inicio:inicio + filas], actividades[inicio:inicio + filas]
+
+
+def bloques_csv(ruta, columna_tiempo="tiempo", columna_actividad="actividad",
+                unidad="h", filas_por_bloque=None, delimitador=","):
+    """
+    Lee un CSV de lecturas por bloques sin cargarlo entero.
+
+    Cada bloque de líneas se convierte con ``np.loadtxt``, de modo que el
+    análisis numérico se hace en C y la memoria no depende del tamaño del
+    archivo.
+
+    Args:
+        ruta (str): Archivo CSV con cabecera
+        columna_tiempo (str): Columna con el tiempo de cada lectura
+        columna_actividad (str): Columna con la actividad medida en MBq
+        unidad (str): Unidad del tiempo ("s", "min", "h", "d", "a")
+        filas_por_bloque (int): Lecturas por bloque
+        delimitador (str): Separador de columnas
+
+    Yields:
+        tuple: (tiempos en horas, actividades) de cada bloque
+    """
+    if unidad not in UNIDADES_TIEMPO:
+        raise ValueError(f"Unidad de tiempo desconocida '{unidad}'")
+    factor = UNIDADES_TIEMPO[unidad]
+    filas = filas_por_bloque or AJUSTE["filas_por_bloque"]
+
+    with open(ruta, newline="", encoding="utf-8") as archivo:
+        cabecera = [c.strip() for c in next(csv.reader([archivo.readline()], delimiter=delimitador), [])]
+        faltantes = [c for c in (columna_tiempo, columna_actividad) if c not in cabecera]
+        if faltantes:
+            raise ValueError(f"Faltan columnas en {ruta}: {', '.join(faltantes)}")
+        columnas = (cabecera.index(columna_tiempo), cabecera.index(columna_actividad))
+
+        linea = 2
+        while True:
+            lineas = list(islice(archivo, filas))
+            if not lineas:
+                break
+            try:
+                datos = np.loadtxt(lineas, delimiter=delimitador, usecols=columnas, ndmin=2)
+            except ValueError:
+                raise ValueError(f"Líneas {linea}-{linea + len(lineas) - 1}: valores numéricos inválidos")
+            linea += len(lineas)
+            yield datos[:, 0] * factor, datos[:, 1]
+
+
+class _CopiaBinaria:
+    """
+    Fuente que guarda las lecturas en un archivo temporal binario.
+
+    La primera pasada lee del origen (p. ej. el CSV) y copia cada bloque; las
+    siguientes proyectan la copia con ``np.memmap`` en lugar de volver a
+    interpretar el texto.
+    """
+
+    def __init__(self, origen, filas_por_bloque=None):
+        self._origen = origen
+        self._filas = filas_por_bloque or AJUSTE["filas_por_bloque"]
+        self._archivo = None
+        self._n = 0
+        self._completa = False
+
+    def __call__(self):
+        return self._proyectar() if self._completa else self._copiar()
+
+    def _copiar(self):
+        self.cerrar()
+        self._archivo = tempfile.TemporaryFile(prefix="ajuste_")
+        self._n = 0
+        for tiempos, actividades in self._origen():
+            self._archivo.write(np.column_stack((tiempos, actividades)).astype(_TIPO).tobytes())
+            self._n += len(tiempos)
+            yield tiempos, actividades
+        self._archivo.flush()
+        self._completa = True
+
+    def _proyectar(self):
+        if self._n == 0:
+            return
+        datos = np.memmap(self._archivo, dtype=_TIPO, mode="r", shape=(self._n, 2))
+        for inicio in range(0, self._n, self._filas):
+            bloque = np.array(datos[inicio:inicio + self._filas])
+            yield bloque[:, 0], bloque[:, 1]
+
+    def cerrar(self):
+        if self._archivo is not None:
+            self._archivo.close()
+            self._archivo = None
+        self._completa = False
+
+
+def _recorrer(fuente):
+    """
+    Una pasada sobre la fuente descartando lecturas no finitas o con A <= 0.
+
+    Yields:
+        tuple: (índice de la primera lectura del bloque, lecturas del bloque,
+        posiciones válidas dentro del bloque o None si lo son todas, tiempos,
+        actividades válidos)
+    """
+    desplazamiento = 0
+    for tiempos, actividades in fuente():
+        tiempos = np.asarray(tiempos, dtype=float)
+        actividades = np.asarray(actividades, dtype=float)
+        validas = np.isfinite(tiempos) & np.isfinite(actividades) & (actividades > 0)
+        posiciones = None
+        if not validas.all():
+            posiciones = np.flatnonzero(validas)
+            tiempos = tiempos[posiciones]
+            actividades = actividades[posiciones]
+        yield desplazamiento, len(validas), posiciones, tiempos, actividades
+        desplazamiento += len(validas)
+
+
+def _gauss_newton(fuente, referencia, actividad_inicial, constante, ponderacion,
+                  iteraciones, tolerancia):
+    """
+    Mínimos cuadrados no lineales ponderados de A = A₀·e^(-λt), una pasada por iteración.
+
+    En cada pasada se acumulan JᵀWJ (2×2), JᵀWr y Σwr², así que el coste en
+    memoria es el de un bloque. Los pesos se evalúan con el modelo y no con
+    la lectura: con σ ∝ A, pesar por la lectura favorece a las que quedaron
+    por debajo y sesga A₀ hacia abajo. El paso se acorta a la mitad mientras deje
+    A₀ o λ fuera de los valores físicos.
+
+    Returns:
+        tuple: (A₀, λ, JᵀWJ, Σwr², iteraciones, convergió)
+    """
+    convergio = False
+    iteracion = 0
+    for iteracion in range(1, iteraciones + 1):
+        jtj = np.zeros((2, 2))
+        jtr = np.zeros(2)
+        ssr = 0.0
+        for _, _, _, tiempos, actividades in _recorrer(fuente):
+            t = tiempos - referencia
+            e = np.exp(-constante * t)
+            modelo = actividad_inicial * e
+            r = actividades - modelo
+            w = _pesos(modelo, ponderacion)
+            d_constante = -t * modelo
+            w_e = w * e
+            w_d = w * d_constante
+            jtj[0, 0] += np.dot(w_e, e)
+            jtj[0, 1] += np.dot(w_e, d_constante)
+            jtj[1, 1] += np.dot(w_d, d_constante)
+            jtr[0] += np.dot(w_e, r)
+            jtr[1] += np.dot(w_d, r)
+            ssr += float(np.dot(w * r, r))
+        jtj[1, 0] = jtj[0, 1]
+
+        try:
+            paso = np.linalg.solve(jtj, jtr)
+        except np.linalg.LinAlgError:
+            break
+        for _ in range(60):
+            if actividad_inicial + paso[0] > 0 and constante + paso[1] > 0:
+                break
+            paso /= 2
+        actividad_inicial += paso[0]
+        constante += paso[1]
+        if abs(paso[0]) <= tolerancia * actividad_inicial and abs(paso[1]) <= tolerancia * constante:
+            convergio = True
+            break
+
+    return actividad_inicial, constante, jtj, ssr, iteracion, convergio
+
+
+def ajustar_decaimiento(fuente, refinar=False, ponderacion="relativa", iteraciones=None,
+                        tolerancia=None, umbral_atipicos=None, max_atipicos=None, puntos_muestra=None):
+    """
+    Ajusta A(t) = A₀·e^(-λt) a una serie de lecturas recorrida por bloques.
+
+    Primera pasada: recta ponderada de ln A frente a t (con pesos A²/σ², que
+    trasladan el error supuesto a la escala logarítmica). Con ``refinar``,
+    una pasada más por iteración de Gauss-Newton sobre la escala lineal.
+    Última pasada: residuos, lecturas atípicas y una muestra diezmada de las
+    lecturas para dibujarlas. Las lecturas no finitas o con A <= 0 se cuentan
+    como descartadas.
+
+    Args:
+        fuente (callable): Sin argumentos; devuelve un iterable de bloques
+            (tiempos, actividades). Se llama una vez por pasada
+        refinar (bool): Refinar con mínimos cuadrados no lineales
+        ponderacion (str): Error supuesto de las lecturas (ver ``PONDERACIONES``)
+        iteraciones (int): Máximo de iteraciones de Gauss-Newton
+        tolerancia (float): Cambio relativo de A₀ y λ que detiene el refinado
+        umbral_atipicos (float): |residuo estandarizado| a partir del cual
+            una lectura es atípica
+        max_atipicos (int): Lecturas atípicas que se guardan (se cuentan todas)
+        puntos_muestra (int): Lecturas que se conservan para dibujar
+
+    Returns:
+        ResultadoAjuste: Parámetros, errores y estadísticas de los residuos
+    """
+    if ponderacion not in PONDERACIONES:
+        raise ValueError(f"Ponderación desconocida '{ponderacion}', use una de: {', '.join(PONDERACIONES)}")
+    iteraciones = AJUSTE["iteraciones"] if iteraciones is None else iteraciones
+    tolerancia = AJUSTE["tolerancia"] if tolerancia is None else tolerancia
+    umbral_atipicos = AJUSTE["umbral_atipicos"] if umbral_atipicos is None else umbral_atipicos
+    max_atipicos = AJUSTE["max_atipicos"] if max_atipicos is None else max_atipicos
+    puntos_muestra = puntos_muestra or AJUSTE["puntos_muestra"]
+
+    # Pasada 1: recta ponderada de ln A frente a t
+    momentos = _MomentosPonderados()
+    referencia = None
+    tiempo_inicial, tiempo_final = math.inf, -math.inf
+    leidas = 0
+    for _, longitud, _, tiempos, actividades in _recorrer(fuente):
+        leidas += longitud
+        if len(tiempos) == 0:
+            continue
+        if referencia is None:
+            referencia = float(tiempos[0])
+        tiempo_inicial = min(tiempo_inicial, float(tiempos.min()))
+        tiempo_final = max(tiempo_final, float(tiempos.max()))
+        momentos.agregar(tiempos - referencia, np.log(actividades),
+                         actividades * actividades * _pesos(actividades, ponderacion))
+
+    if momentos.n < 3 or momentos.sxx <= 0:
+        raise ValueError("Se necesitan al menos tres lecturas válidas en dos tiempos distintos")
+
+    pendiente = momentos.sxy / momentos.sxx
+    constante = -pendiente
+    if constante <= 0:
+        raise ValueError("Las lecturas no decaen: la pendiente de ln A frente a t no es negativa")
+    log_a0 = momentos.media_y - pendiente * momentos.media_x
+    actividad_inicial = math.exp(log_a0)
+    gl = momentos.n - 2
+    ssr_log = max(momentos.syy - momentos.sxy * pendiente, 0.0)
+    r2 = 1.0 - ssr_log / momentos.syy if momentos.syy > 0 else 1.0
+    varianza = ssr_log / gl
+
+    resultado = ResultadoAjuste(
+        actividad_inicial=actividad_inicial,
+        constante_decaimiento=constante,
+        error_actividad_inicial=actividad_inicial * math.sqrt(
+            varianza * (1.0 / momentos.peso + momentos.media_x ** 2 / momentos.sxx)),
+        error_constante=math.sqrt(varianza / momentos.sxx),
+        metodo="log-lineal",
+        ponderacion=ponderacion,
+        lecturas=momentos.n,
+        descartadas=leidas - momentos.n,
+        tiempo_referencia=referencia,
+        tiempo_inicial=tiempo_inicial,
+        tiempo_final=tiempo_final,
+        error_estandar=math.sqrt(varianza),
+        r2_logaritmico=r2
+    )
+
+    if refinar:
+        actividad_inicial, constante, jtj, ssr, iteracion, convergio = _gauss_newton(
+            fuente, referencia, actividad_inicial, constante, ponderacion, iteraciones, tolerancia
+        )
+        varianza = ssr / gl
+        try:
+            covarianza = varianza * np.linalg.inv(jtj)
+        except np.linalg.LinAlgError:
+            covarianza = np.full((2, 2), np.nan)
+        resultado.actividad_inicial = actividad_inicial
+        resultado.constante_decaimiento = constante
+        resultado.error_actividad_inicial = math.sqrt(max(covarianza[0, 0], 0.0))
+        resultado.error_constante = math.sqrt(max(covarianza[1, 1], 0.0))
+        resultado.metodo = "Gauss-Newton"
+        resultado.iteraciones = iteracion
+        resultado.convergio = convergio
+        resultado.error_estandar = math.sqrt(varianza)
+
+    # Última pasada: residuos y lecturas atípicas en la escala del ajuste
+    # (logarítmica o lineal), estandarizados con la dispersión observada
+    escala = resultado.error_estandar if resultado.error_estandar > 0 else 1.0
+    paso_muestra = max(1, -(-momentos.n // puntos_muestra))
+    muestra_t, muestra_a = [], []
+    suma = suma_cuadrados = suma_relativos = 0.0
+    residuo_maximo = tiempo_maximo = 0.0
+    vistas = 0
+    for desplazamiento, _, posiciones, tiempos, actividades in _recorrer(fuente):
+        if len(tiempos) == 0:
+            continue
+        modelo = actividad_inicial * np.exp(-constante * (tiempos - referencia))
+        r = actividades - modelo
+        relativos = r / modelo
+        suma += float(r.sum())
+        suma_cuadrados += float(np.dot(r, r))
+        suma_relativos += float(np.dot(relativos, relativos))
+        i_max = int(np.argmax(np.abs(r)))
+        if abs(r[i_max]) > abs(residuo_maximo):
+            residuo_maximo = float(r[i_max])
+            tiempo_maximo = float(tiempos[i_max])
+
+        if refinar:
+            estandarizados = r * np.sqrt(_pesos(modelo, ponderacion)) / escala
+        else:
+            estandarizados = (np.log(actividades / modelo) * actividades
+                              * np.sqrt(_pesos(actividades, ponderacion)) / escala)
+        atipicas = np.flatnonzero(np.abs(estandarizados) > umbral_atipicos)
+        resultado.atipicos += len(atipicas)
+        for i in atipicas[:max(0, max_atipicos - len(resultado.lecturas_atipicas))]:
+            fila = desplazamiento + (int(posiciones[i]) if posiciones is not None else int(i))
+            resultado.lecturas_atipicas.append(
+                (fila, float(tiempos[i]), float(actividades[i]), float(estandarizados[i]))
+            )
+
+        # Copias: una vista con paso retendría el bloque entero hasta el final
+        primera = (-vistas) % paso_muestra
+        muestra_t.append(tiempos[primera::paso_muestra].copy())
+        muestra_a.append(actividades[primera::paso_muestra].copy())
+        vistas += len(tiempos)
+
+    n = momentos.n
+    resultado.residuo_medio = suma / n
+    resultado.residuo_rms = math.sqrt(suma_cuadrados / n)
+    resultado.residuo_relativo_rms = math.sqrt(suma_relativos / n)
+    resultado.residuo_maximo = residuo_maximo
+    resultado.tiempo_residuo_maximo = tiempo_maximo
+    resultado.muestra_tiempos = np.concatenate(muestra_t)
+    resultado.muestra_actividades = np.concatenate(muestra_a)
+    return resultado
+
+
+def ajustar_arreglos(tiempos, actividades, filas_por_bloque=None, **opciones):
+    """
+    Ajusta lecturas que ya están en memoria (o proyectadas con ``np.memmap``).
+
+    Args:
+        tiempos (array): Tiempos en horas
+        actividades (array): Actividades medidas en MBq
+        filas_por_bloque (int): Lecturas por bloque
+        **opciones: Argumentos de ``ajustar_decaimiento``
+
+    Returns:
+        ResultadoAjuste: Resultado del ajuste
+    """
+    if len(tiempos) != len(actividades):
+        raise ValueError("Los tiempos y las actividades deben tener la misma longitud")
+    return ajustar_decaimiento(
+        lambda: bloques_arreglos(tiempos, actividades, filas_por_bloque), **opciones
+    )
+
+
+def ajustar_csv(ruta, columna_tiempo="tiempo", columna_actividad="actividad", unidad="h",
+                filas_por_bloque=None, delimitador=",", **opciones):
+    """
+    Ajusta las lecturas de un CSV sin cargarlo entero en memoria.
+
+    El texto se interpreta una sola vez: la primera pasada guarda las
+    lecturas en un archivo temporal binario que las demás proyectan.
+
+    Args:
+        ruta (str): Archivo CSV con cabecera
+        columna_tiempo (str): Columna con el tiempo de cada lectura
+        columna_actividad (str): Columna con la actividad medida en MBq
+        unidad (str): Unidad del tiempo ("s", "min", "h", "d", "a")
+        filas_por_bloque (int): Lecturas por bloque
+        delimitador (str): Separador de columnas
+        **opciones: Argumentos de ``ajustar_decaimiento``
+
+    Returns:
+        ResultadoAjuste: Resultado del ajuste (tiempos en horas)
+    """
+    if unidad not in UNIDADES_TIEMPO:
+        raise ValueError(f"Unidad de tiempo desconocida '{unidad}'")
+    fuente = _CopiaBinaria(
+        lambda: bloques_csv(ruta, columna_tiempo, columna_actividad, unidad, filas_por_bloque, delimitador),
+        filas_por_bloque
+    )
+    try:
+        return ajustar_decaimiento(fuente, **opciones)
+    finally:
+        fuente.cerrar()
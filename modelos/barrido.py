@@ -0,0 +1,197 @@
+"""
+Barridos de parámetros en paralelo sobre el catálogo de radiofármacos
+Cada proceso evalúa un bloque de la malla A₀ × duración × actividad objetivo
+y escribe directamente en memoria compartida (o en un archivo mapeado)
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from modelos.cache_resultados import clave_escenario
+from modelos.radiofarmaco import obtener_catalogo
+from utilidades.calculos import calcular_actividad_restante, calcular_tiempo_para_actividad
+
+# Magnitudes calculadas para cada punto de la malla
+CAMPOS_BARRIDO = ("actividad_al_final", "tiempo_para_objetivo", "alcanza_objetivo")
+
+
+def _abrir_destino(destino, forma):
+    """Devuelve (arreglo, recurso) para escribir los resultados en el destino"""
+    tipo, nombre = destino
+    if tipo == "memmap":
+        return np.load(nombre, mmap_mode="r+"), None
+    shm = shared_memory.SharedMemory(name=nombre)
+    return np.ndarray(forma, dtype=np.float64, buffer=shm.buf), shm
+
+
+def _evaluar_bloque(destino, forma, inicio, fin, vidas_medias, constantes,
+                    actividades, duraciones, objetivos):
+    """
+    Evalúa los puntos [inicio, fin) de la malla aplanada (se ejecuta en un proceso hijo).
+
+    Returns:
+        tuple: (pid, puntos evaluados, segundos)
+    """
+    t0 = time.perf_counter()
+    resultados, shm = _abrir_destino(destino, forma)
+    try:
+        malla = (len(vidas_medias), len(actividades), len(duraciones), len(objetivos))
+        i_rf, i_a0, i_dur, i_obj = np.unravel_index(np.arange(inicio, fin), malla)
+
+        vida_media = vidas_medias[i_rf]
+        constante = constantes[i_rf]
+        a0 = actividades[i_a0]
+        duracion = duraciones[i_dur]
+
+        tiempo_objetivo = calcular_tiempo_para_actividad(
+            a0, objetivos[i_obj], vida_media, constante_decaimiento=constante
+        )
+        resultados[0, inicio:fin] = calcular_actividad_restante(
+            a0, duracion, vida_media, constante_decaimiento=constante
+        )
+        resultados[1, inicio:fin] = tiempo_objetivo
+        resultados[2, inicio:fin] = tiempo_objetivo <= duracion
+
+        if shm is None:
+            resultados.flush()
+    finally:
+        del resultados
+        if shm is not None:
+            shm.close()
+
+    return os.getpid(), fin - inicio, time.perf_counter() - t0
+
+
+def ejecutar_barrido(actividades, duraciones, objetivos, catalogo=None,
+                     procesos=None, tamano_bloque=None, ruta_memmap=None, cache=None):
+    """
+    Evalúa la malla completa radiofármaco × A₀ × duración × objetivo.
+
+    Args:
+        actividades (array): Actividades iniciales en MBq
+        duraciones (array): Duraciones en horas
+        objetivos (array): Actividades objetivo en MBq
+        catalogo (CatalogoRadiofarmacos): Catálogo a barrer (por defecto RADIOFARMACOS)
+        procesos (int): Número de procesos (por defecto, núcleos disponibles)
+        tamano_bloque (int): Puntos por tarea (por defecto, 4 bloques por proceso)
+        ruta_memmap (str): Si se indica, los resultados se escriben en ese
+            archivo .npy mapeado en memoria en lugar de memoria compartida
+        cache (CacheResultados): Si se indica, la malla se busca ahí antes de
+            lanzar los procesos y se guarda al terminar
+
+    Returns:
+        dict: ``resultados`` con forma (len(CAMPOS_BARRIDO), n_rf, n_a0, n_dur, n_obj),
+        ``radiofarmacos``, los ejes de la malla, ``segundos``, ``rendimiento``
+        (puntos por segundo de cada proceso; vacío si vino de la caché) y
+        ``desde_cache``
+    """
+    catalogo = catalogo or obtener_catalogo()
+    nombres = catalogo.nombres()
+    vidas_medias = catalogo.vidas_medias
+    constantes = catalogo.constantes_decaimiento
+    actividades = np.asarray(actividades, dtype=float)
+    duraciones = np.asarray(duraciones, dtype=float)
+    objetivos = np.asarray(objetivos, dtype=float)
+
+    malla = (len(nombres), len(actividades), len(duraciones), len(objetivos))
+
+    if cache is not None:
+        inicio = time.perf_counter()
+        parametros = dict(vidas_medias=vidas_medias, constantes=constantes, actividades=actividades,
+                          duraciones=duraciones, objetivos=objetivos)
+        clave = clave_escenario("barrido", **parametros)
+        guardado = cache.obtener(clave)
+        if guardado is None:
+            barrido = ejecutar_barrido(actividades, duraciones, objetivos, catalogo,
+                                       procesos, tamano_bloque, ruta_memmap)
+            cache.guardar(clave, {"resultados": barrido["resultados"]})
+            return barrido
+        resultados = guardado["resultados"]
+        if ruta_memmap:
+            np.save(ruta_memmap, resultados)
+            resultados = np.load(ruta_memmap, mmap_mode="r")
+        return {
+            "resultados": resultados,
+            "radiofarmacos": nombres,
+            "actividades": actividades,
+            "duraciones": duraciones,
+            "objetivos": objetivos,
+            "segundos": time.perf_counter() - inicio,
+            "rendimiento": {},
+            "desde_cache": True
+        }
+
+    total = int(np.prod(malla))
+    forma = (len(CAMPOS_BARRIDO), total)
+
+    procesos = procesos or os.cpu_count() or 1
+    tamano_bloque = tamano_bloque or max(1, -(-total // (procesos * 4)))
+    bloques = [(i, min(i + tamano_bloque, total)) for i in range(0, total, tamano_bloque)]
+
+    shm = None
+    if ruta_memmap:
+        np.lib.format.open_memmap(ruta_memmap, mode="w+", dtype=np.float64, shape=forma).flush()
+        destino = ("memmap", ruta_memmap)
+    else:
+        shm = shared_memory.SharedMemory(create=True, size=max(1, total * len(CAMPOS_BARRIDO) * 8))
+        destino = ("shm", shm.name)
+
+    rendimiento = {}
+    inicio = time.perf_counter()
+    try:
+        with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+            tareas = [
+                ejecutor.submit(_evaluar_bloque, destino, forma, ini, fin,
+                                vidas_medias, constantes, actividades, duraciones, objetivos)
+                for ini, fin in bloques
+            ]
+            for tarea in tareas:
+                pid, puntos, segundos = tarea.result()
+                acumulado = rendimiento.setdefault(pid, [0, 0.0])
+                acumulado[0] += puntos
+                acumulado[1] += segundos
+
+        if shm is not None:
+            resultados = np.ndarray(forma, dtype=np.float64, buffer=shm.buf).copy()
+        else:
+            resultados = np.load(ruta_memmap, mmap_mode="r")
+    finally:
+        if shm is not None:
+            shm.close()
+            shm.unlink()
+
+    return {
+        "resultados": resultados.reshape((len(CAMPOS_BARRIDO),) + malla),
+        "radiofarmacos": nombres,
+        "actividades": actividades,
+        "duraciones": duraciones,
+        "objetivos": objetivos,
+        "segundos": time.perf_counter() - inicio,
+        "rendimiento": {
+            pid: puntos / segundos if segundos > 0 else float("inf")
+            for pid, (puntos, segundos) in rendimiento.items()
+        },
+        "desde_cache": False
+    }
+
+
+def parsear_rango(texto):
+    """
+    Convierte 'inicio:fin:n' en un linspace o 'a,b,c' en una lista de valores.
+
+    Args:
+        texto (str): Especificación del rango
+
+    Returns:
+        ndarray: Valores del eje
+    """
+    if ":" in texto:
+        partes = texto.split(":")
+        if len(partes) != 3:
+            raise ValueError(f"Rango inválido '{texto}', use inicio:fin:n")
+        return np.linspace(float(partes[0]), float(partes[1]), int(partes[2]))
+    return np.array([float(v) for v in texto.split(",")])
@@ -0,0 +1,223 @@
+"""
+Caché persistente de resultados
+Cada resultado se guarda en disco bajo una clave que es el hash de los
+parámetros del escenario y de la versión del motor de cálculo, así que un
+escenario repetido (entre trabajos nocturnos o sesiones de la interfaz) se lee
+en lugar de recalcularse. Los arreglos se guardan como .npy y se abren con
+``mmap_mode="r"``; el tamaño total está acotado y al superarlo se borran las
+entradas usadas hace más tiempo (LRU)
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from functools import lru_cache
+
+import numpy as np
+
+from config.constantes import CACHE_RESULTADOS
+
+# Se incrementa cuando cambia cualquier cálculo cuyo resultado se guarda:
+# invalida todas las entradas anteriores sin tener que borrarlas a mano
+VERSION_MOTOR = 2
+
+
+def _actualizar_hash(h, valor):
+    """Añade ``valor`` al hash con una codificación que no depende de la plataforma"""
+    if isinstance(valor, np.ndarray) and valor.dtype.kind in "biuf":
+        datos = np.ascontiguousarray(valor, dtype=valor.dtype.newbyteorder("<"))
+        h.update(f"{datos.dtype.str}{datos.shape}".encode("ascii"))
+        h.update(datos.tobytes())
+    elif isinstance(valor, np.ndarray):
+        _actualizar_hash(h, valor.tolist())
+    elif isinstance(valor, (list, tuple)):
+        h.update(b"[")
+        for elemento in valor:
+            _actualizar_hash(h, elemento)
+            h.update(b",")
+        h.update(b"]")
+    else:
+        if isinstance(valor, np.generic):
+            valor = valor.item()
+        h.update(json.dumps(valor, ensure_ascii=False).encode("utf-8"))
+
+
+def clave_escenario(tipo, **parametros):
+    """
+    Hash estable de un escenario.
+
+    Los arreglos entran por sus bytes (little endian), los escalares por su
+    representación JSON y los parámetros en orden alfabético, de modo que la
+    clave es la misma en cualquier proceso y máquina.
+
+    Args:
+        tipo (str): Tipo de resultado ("lote", "barrido", ...)
+        **parametros: Todo lo que determina el resultado
+
+    Returns:
+        str: 32 caracteres hexadecimales
+    """
+    h = hashlib.blake2b(digest_size=16)
+    _actualizar_hash(h, [tipo, VERSION_MOTOR])
+    for nombre in sorted(parametros):
+        h.update(nombre.encode("utf-8"))
+        _actualizar_hash(h, parametros[nombre])
+    return h.hexdigest()
+
+
+class CacheResultados:
+    """
+    Directorio de resultados direccionados por contenido.
+
+    Cada entrada es un subdirectorio ``<clave>/`` con un .npy por arreglo.
+    La fecha de modificación del subdirectorio marca el último uso: se
+    actualiza en cada acierto y decide el orden de desalojo. Las entradas se
+    escriben en un directorio temporal que se renombra al terminar, así que
+    varios procesos pueden compartir la caché sin ver entradas a medias.
+    """
+
+    def __init__(self, directorio=None, tamano_maximo=None):
+        """
+        Args:
+            directorio (str): Carpeta de la caché (se crea si no existe)
+            tamano_maximo (int): Bytes máximos antes de desalojar entradas
+        """
+        self.directorio = directorio or CACHE_RESULTADOS["directorio"]
+        if tamano_maximo is None:
+            tamano_maximo = int(CACHE_RESULTADOS["tamano_maximo_mb"] * 1e6)
+        self.tamano_maximo = tamano_maximo
+        self.aciertos = 0
+        self.fallos = 0
+
+    def _ruta(self, clave):
+        return os.path.join(self.directorio, clave)
+
+    def _leer(self, clave):
+        """Proyecta los arreglos de una entrada y la marca como usada"""
+        ruta = self._ruta(clave)
+        try:
+            nombres = sorted(n for n in os.listdir(ruta) if n.endswith(".npy"))
+            arreglos = {n[:-4]: np.load(os.path.join(ruta, n), mmap_mode="r") for n in nombres}
+            os.utime(ruta)
+        except (OSError, ValueError):
+            return None
+        return arreglos
+
+    def obtener(self, clave):
+        """
+        Resultado guardado bajo ``clave``.
+
+        Returns:
+            dict: nombre → arreglo proyectado de solo lectura, o None si no está
+        """
+        arreglos = self._leer(clave)
+        if arreglos is None:
+            self.fallos += 1
+        else:
+            self.aciertos += 1
+        return arreglos
+
+    def guardar(self, clave, arreglos):
+        """
+        Guarda un resultado y desaloja entradas antiguas si hace falta.
+
+        Args:
+            clave (str): Salida de ``clave_escenario``
+            arreglos (dict): nombre → arreglo numérico
+
+        Returns:
+            dict: Los mismos arreglos, ya proyectados desde la caché (o los
+            originales si no se pudieron escribir)
+        """
+        ruta = self._ruta(clave)
+        temporal = f"{ruta}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(temporal, exist_ok=True)
+            for nombre, arreglo in arreglos.items():
+                np.save(os.path.join(temporal, nombre + ".npy"), np.asarray(arreglo))
+            try:
+                os.replace(temporal, ruta)
+            except OSError:
+                # Otro proceso guardó la misma clave mientras tanto
+                shutil.rmtree(temporal, ignore_errors=True)
+        except OSError:
+            shutil.rmtree(temporal, ignore_errors=True)
+            return arreglos
+
+        self.desalojar()
+        guardados = self._leer(clave)
+        return guardados if guardados is not None else arreglos
+
+    def obtener_o_calcular(self, tipo, parametros, calcular):
+        """
+        Busca el escenario en la caché y, si no está, lo calcula y lo guarda.
+
+        Args:
+            tipo (str): Tipo de resultado
+            parametros (dict): Argumentos de ``clave_escenario``
+            calcular (callable): Sin argumentos; devuelve el dict de arreglos
+
+        Returns:
+            tuple: (dict de arreglos, True si vino de la caché)
+        """
+        clave = clave_escenario(tipo, **parametros)
+        arreglos = self.obtener(clave)
+        if arreglos is not None:
+            return arreglos, True
+        return self.guardar(clave, calcular()), False
+
+    def entradas(self):
+        """
+        Entradas guardadas, de la usada hace más tiempo a la más reciente.
+
+        Returns:
+            list: (último uso, bytes, clave)
+        """
+        try:
+            claves = [n for n in os.listdir(self.directorio) if not n.endswith(".tmp")]
+        except OSError:
+            return []
+        entradas = []
+        for clave in claves:
+            ruta = self._ruta(clave)
+            try:
+                tamano = sum(e.stat().st_size for e in os.scandir(ruta) if e.is_file())
+                entradas.append((os.stat(ruta).st_mtime, tamano, clave))
+            except OSError:
+                continue
+        entradas.sort()
+        return entradas
+
+    def tamano(self):
+        """Bytes ocupados por todas las entradas"""
+        return sum(tamano for _, tamano, _ in self.entradas())
+
+    def desalojar(self):
+        """
+        Borra las entradas menos usadas hasta quedar bajo ``tamano_maximo``.
+
+        Returns:
+            int: Entradas borradas
+        """
+        entradas = self.entradas()
+        total = sum(tamano for _, tamano, _ in entradas)
+        borradas = 0
+        for _, tamano, clave in entradas:
+            if total <= self.tamano_maximo:
+                break
+            shutil.rmtree(self._ruta(clave), ignore_errors=True)
+            total -= tamano
+            borradas += 1
+        return borradas
+
+    def limpiar(self):
+        """Borra todas las entradas"""
+        for _, _, clave in self.entradas():
+            shutil.rmtree(self._ruta(clave), ignore_errors=True)
+
+
+@lru_cache(maxsize=None)
+def obtener_cache(directorio=None):
+    """Caché de resultados por defecto, compartida dentro del proceso"""
+    return CacheResultados(directorio)
@@ -0,0 +1,155 @@
+"""
+Simulaciones paralelas de varios radiofármacos
+Todas las curvas comparten el reloj y los instantes de muestreo, así que en
+cada refresco se evalúan con una sola operación vectorizada y su historial
+se guarda como una matriz (curva × muestra)
+"""
+
+import numpy as np
+
+
+class SimulacionesParalelas:
+    """
+    N curvas A_i(t) = A0_i · e^(-λ_i·t) que avanzan juntas.
+
+    Añadir una curva solo añade una fila a los arreglos: el coste por
+    refresco sigue siendo una exponencial vectorizada y una escritura de
+    columna. Con ``capacidad_maxima`` el historial es un anillo que conserva
+    las últimas muestras, como ``SerieTemporal``.
+    """
+
+    def __init__(self, radiofarmacos, actividades_iniciales, capacidad_inicial=1024,
+                 capacidad_maxima=None):
+        """
+        Args:
+            radiofarmacos (list): Objetos ``Radiofarmaco`` a simular
+            actividades_iniciales (float | array): A₀ en MBq, común o una por curva
+            capacidad_inicial (int): Muestras reservadas antes de crecer
+            capacidad_maxima (int): Si se indica, activa el modo anillo
+        """
+        self.radiofarmacos = list(radiofarmacos)
+        if not self.radiofarmacos:
+            raise ValueError("Se necesita al menos un radiofármaco")
+
+        n = len(self.radiofarmacos)
+        self.constantes = np.array([rf.constante_decaimiento for rf in self.radiofarmacos])
+        self.actividades_iniciales = np.broadcast_to(
+            np.asarray(actividades_iniciales, dtype=float), (n,)
+        ).copy()
+        if np.any(self.actividades_iniciales <= 0):
+            raise ValueError("La actividad inicial debe ser mayor que cero")
+
+        self.capacidad_maxima = capacidad_maxima
+        if capacidad_maxima is None:
+            self._capacidad = max(1, int(capacidad_inicial))
+            reservadas = self._capacidad
+        else:
+            # Anillo escrito por duplicado para que la ventana sea contigua
+            self._capacidad = int(capacidad_maxima)
+            reservadas = 2 * self._capacidad
+        self._tiempos = np.empty(reservadas)
+        self._actividades = np.empty((n, reservadas))
+        self._total = 0
+
+    @classmethod
+    def desde_arreglos(cls, radiofarmacos, actividades_iniciales, tiempos, actividades):
+        """
+        Curvas sobre arreglos ya existentes (p. ej. ``np.memmap``), sin copiarlos.
+
+        Args:
+            tiempos (ndarray): Instantes muestreados (m,)
+            actividades (ndarray): Historial (n_curvas, m)
+        """
+        paralelas = cls(radiofarmacos, actividades_iniciales, capacidad_inicial=1)
+        paralelas._tiempos = tiempos
+        paralelas._actividades = actividades
+        paralelas._capacidad = paralelas._total = len(tiempos)
+        return paralelas
+
+    def __len__(self):
+        if self.capacidad_maxima is not None:
+            return min(self._total, self._capacidad)
+        return self._total
+
+    def _ventana(self):
+        """Límites [inicio, fin) de las muestras válidas en el buffer"""
+        if self.capacidad_maxima is not None and self._total > self._capacidad:
+            inicio = self._total % self._capacidad
+            return inicio, inicio + self._capacidad
+        return 0, self._total
+
+    @property
+    def nombres(self):
+        return [rf.nombre for rf in self.radiofarmacos]
+
+    @property
+    def tiempos(self):
+        """Vista sin copia de los instantes muestreados"""
+        inicio, fin = self._ventana()
+        return self._tiempos[inicio:fin]
+
+    def actividades(self, indice):
+        """Vista sin copia (contigua) del historial de la curva ``indice``"""
+        inicio, fin = self._ventana()
+        return self._actividades[indice, inicio:fin]
+
+    def evaluar(self, tiempo):
+        """
+        Actividad de todas las curvas en el instante dado.
+
+        Args:
+            tiempo (float | array): Horas; con un arreglo de m tiempos
+                devuelve una matriz (n_curvas, m)
+
+        Returns:
+            ndarray: Actividades en MBq
+        """
+        tiempo = np.asarray(tiempo, dtype=float)
+        constantes = self.constantes.reshape((-1,) + (1,) * tiempo.ndim)
+        iniciales = self.actividades_iniciales.reshape(constantes.shape)
+        return iniciales * np.exp(-constantes * tiempo)
+
+    def agregar(self, tiempo):
+        """
+        Evalúa todas las curvas en ``tiempo`` y guarda la columna.
+
+        Returns:
+            ndarray: Actividades de cada curva en ese instante
+        """
+        actividades = self.evaluar(tiempo)
+        if self.capacidad_maxima is not None:
+            i = self._total % self._capacidad
+            self._tiempos[i] = self._tiempos[i + self._capacidad] = tiempo
+            self._actividades[:, i] = self._actividades[:, i + self._capacidad] = actividades
+        else:
+            if self._total == self._capacidad:
+                self._crecer()
+            self._tiempos[self._total] = tiempo
+            self._actividades[:, self._total] = actividades
+        self._total += 1
+        return actividades
+
+    def pendiente_maxima(self):
+        """
+        Mayor |dA/dt| = λ·A entre las curvas en la última muestra (MBq/h).
+
+        Sirve para elegir el ritmo de refresco según la curva más rápida.
+        """
+        if self._total == 0:
+            return 0.0
+        _, fin = self._ventana()
+        return float(np.max(self.constantes * self._actividades[:, fin - 1]))
+
+    def _crecer(self):
+        """Duplica la capacidad conservando las muestras"""
+        capacidad = 2 * self._capacidad
+        tiempos = np.empty(capacidad)
+        tiempos[:self._total] = self._tiempos[:self._total]
+        actividades = np.empty((len(self.radiofarmacos), capacidad))
+        actividades[:, :self._total] = self._actividades[:, :self._total]
+        self._tiempos, self._actividades = tiempos, actividades
+        self._capacidad = capacidad
+
+    def limpiar(self):
+        """Descarta las muestras conservando la capacidad reservada"""
+        self._total = 0
@@ -0,0 +1,182 @@
+"""
+Simulación estocástica (Monte Carlo) del decaimiento
+Cada paso muestrea de una binomial cuántos núcleos decaen; varias corridas
+independientes avanzan a la vez como un solo arreglo
+"""
+
+import math
+import numpy as np
+
+from modelos.serie_temporal import SerieTemporal
+
+# Decaimientos por hora en 1 MBq
+DECAIMIENTOS_HORA_POR_MBQ = 1e6 * 3600
+
+
+class SimuladorEstocastico:
+    """
+    Modelo de N núcleos con decaimiento aleatorio.
+
+    En un paso dt cada núcleo decae con probabilidad p = 1 - e^(-λ·dt), así
+    que el número de decaimientos es Binomial(N, p). El muestreo se hace para
+    todas las corridas en una llamada y admite N de hasta ~10⁸ sin coste
+    adicional.
+
+    Para la animación se sigue un subconjunto de ``n_particulas`` partículas
+    representativas cuya fracción viva se mantiene igual a N/N₀.
+
+    Las actividades se dan en MBq. Con ``actividad_inicial`` cada núcleo
+    simulado representa la fracción de A₀ que le corresponde, de modo que el
+    valor esperado coincide con la curva determinista y solo la fluctuación
+    (∝ 1/√N) depende de N; sin ella los núcleos son reales y los
+    decaimientos por hora se convierten directamente a MBq.
+    """
+
+    SIMBOLOS = np.array(['☢', '⚛'])
+
+    def __init__(self, n_nucleos, vida_media, n_corridas=1, n_particulas=200,
+                 ancho=300, alto=150, semilla=None, actividad_inicial=None,
+                 capacidad_maxima=None):
+        """
+        Args:
+            n_nucleos (int): Núcleos iniciales por corrida
+            vida_media (float): Vida media en horas
+            n_corridas (int): Corridas independientes simuladas en paralelo
+            n_particulas (int): Partículas representativas para la animación
+            ancho (int): Ancho del área de animación en píxeles
+            alto (int): Alto del área de animación en píxeles
+            semilla (int): Semilla del generador (None = aleatoria)
+            actividad_inicial (float): A₀ en MBq que representan los
+                ``n_nucleos`` (None = núcleos reales)
+            capacidad_maxima (int): Si se indica, el historial conserva solo
+                las últimas muestras en un anillo de tamaño fijo
+        """
+        if n_nucleos <= 0:
+            raise ValueError("El número de núcleos debe ser mayor que cero")
+        if vida_media <= 0:
+            raise ValueError("La vida media debe ser mayor que cero")
+
+        self.rng = np.random.default_rng(semilla)
+        self.n_inicial = int(n_nucleos)
+        self.constante_decaimiento = math.log(2) / vida_media
+        # MBq por cada decaimiento/h: 1 MBq = 3.6·10⁹ decaimientos/h
+        if actividad_inicial is None:
+            self.mbq_por_decaimiento_hora = 1.0 / DECAIMIENTOS_HORA_POR_MBQ
+        else:
+            self.mbq_por_decaimiento_hora = actividad_inicial / (self.n_inicial * self.constante_decaimiento)
+        self.ancho = ancho
+        self.alto = alto
+        self.tiempo = 0.0
+
+        self.restantes = np.full(n_corridas, self.n_inicial, dtype=np.int64)
+        self.ultimos_decaimientos = np.zeros(n_corridas, dtype=np.int64)
+
+        # Historial de la primera corrida: (tiempo, actividad estimada en MBq, N/N₀)
+        self.serie = SerieTemporal(capacidad_maxima=capacidad_maxima)
+        self.serie.agregar(0.0, self.actividad_esperada(0.0), 1.0)
+
+        n_particulas = min(int(n_particulas), self.n_inicial)
+        self.posiciones = np.column_stack((
+            self.rng.uniform(10, ancho - 10, n_particulas),
+            self.rng.uniform(10, alto - 10, n_particulas)
+        ))
+        self.simbolos = self.SIMBOLOS[self.rng.integers(0, len(self.SIMBOLOS), n_particulas)]
+        self.vivas = np.ones(n_particulas, dtype=bool)
+        # Partículas eliminadas en el último paso (para borrarlas de la vista)
+        self.eliminadas = np.empty(0, dtype=np.intp)
+
+    def actividad_esperada(self, tiempo):
+        """Actividad determinista N₀·λ·e^(-λt) en MBq"""
+        return (self.n_inicial * self.constante_decaimiento * self.mbq_por_decaimiento_hora
+                * math.exp(-self.constante_decaimiento * tiempo))
+
+    def paso(self, dt, agitacion=2.0):
+        """
+        Avanza la simulación dt horas.
+
+        Args:
+            dt (float): Paso de tiempo en horas
+            agitacion (float): Desplazamiento aleatorio de las partículas en píxeles
+
+        Returns:
+            dict: ``decaimientos`` y ``restantes`` por corrida, ``actividad``
+            (decaimientos / dt en MBq) y ``fluctuacion`` (desviación respecto
+            al valor esperado en unidades de σ)
+        """
+        p = -math.expm1(-self.constante_decaimiento * dt)
+        previos = self.restantes
+        decaimientos = self.rng.binomial(previos, p)
+        self.restantes = previos - decaimientos
+        self.ultimos_decaimientos = decaimientos
+        self.tiempo += dt
+
+        esperado = previos * p
+        sigma = np.sqrt(esperado * (1 - p))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            fluctuacion = np.where(sigma > 0, (decaimientos - esperado) / sigma, 0.0)
+        actividad = decaimientos * (self.mbq_por_decaimiento_hora / dt)
+
+        self.serie.agregar(self.tiempo, float(actividad[0]), self.restantes[0] / self.n_inicial)
+        self._actualizar_particulas(agitacion)
+
+        return {
+            "decaimientos": decaimientos,
+            "restantes": self.restantes,
+            "actividad": actividad,
+            "fluctuacion": fluctuacion
+        }
+
+    def ejecutar(self, dt, n_pasos):
+        """
+        Ejecuta varios pasos seguidos.
+
+        Returns:
+            tuple: (tiempos, restantes) con forma (n_pasos + 1,) y
+            (n_pasos + 1, n_corridas)
+        """
+        tiempos = self.tiempo + dt * np.arange(n_pasos + 1)
+        restantes = np.empty((n_pasos + 1, len(self.restantes)), dtype=np.int64)
+        restantes[0] = self.restantes
+        for i in range(1, n_pasos + 1):
+            restantes[i] = self.paso(dt, agitacion=0.0)["restantes"]
+        return tiempos, restantes
+
+    def _actualizar_particulas(self, agitacion):
+        """Elimina partículas hasta igualar la fracción viva de la corrida 0 y las agita"""
+        objetivo = int(round(len(self.vivas) * self.restantes[0] / self.n_inicial))
+        indices_vivas = np.flatnonzero(self.vivas)
+        sobrantes = len(indices_vivas) - objetivo
+        if sobrantes > 0:
+            self.eliminadas = self.rng.choice(indices_vivas, sobrantes, replace=False)
+            self.vivas[self.eliminadas] = False
+        else:
+            self.eliminadas = np.empty(0, dtype=np.intp)
+
+        if agitacion > 0:
+            self.posiciones += self.rng.normal(0.0, agitacion, self.posiciones.shape)
+            np.clip(self.posiciones[:, 0], 10, self.ancho - 10, out=self.posiciones[:, 0])
+            np.clip(self.posiciones[:, 1], 10, self.alto - 10, out=self.posiciones[:, 1])
+
+    def particulas_visibles(self):
+        """
+        Returns:
+            tuple: (posiciones (k, 2), símbolos (k,)) de las partículas vivas
+        """
+        return self.posiciones[self.vivas], self.simbolos[self.vivas]
+
+    def estadisticas(self):
+        """
+        Resumen entre corridas frente al valor determinista.
+
+        Returns:
+            dict: Media y desviación de N, valor esperado N₀·e^(-λt) y la
+            desviación binomial teórica
+        """
+        fraccion = math.exp(-self.constante_decaimiento * self.tiempo)
+        return {
+            "tiempo": self.tiempo,
+            "restantes_media": float(self.restantes.mean()),
+            "restantes_desviacion": float(self.restantes.std()),
+            "restantes_esperados": self.n_inicial * fraccion,
+            "desviacion_teorica": math.sqrt(self.n_inicial * fraccion * (1 - fraccion))
+        }
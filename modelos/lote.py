@@ -0,0 +1,175 @@
+"""
+Simulación por lotes sin interfaz gráfica
+Evalúa miles de escenarios con las funciones vectorizadas de utilidades.calculos
+"""
+
+import csv
+import numpy as np
+
+from modelos.radiofarmaco import obtener_catalogo
+from utilidades.calculos import (
+    calcular_actividad_restante,
+    calcular_tiempo_para_actividad,
+    calcular_porcentaje_restante,
+    calcular_gamma,
+    calcular_numero_vidas_medias
+)
+
+# Columnas esperadas en el CSV de escenarios
+CAMPOS_ESCENARIO = ("radiofarmaco", "actividad_inicial", "actividad_final", "duracion")
+
+# Columnas escalares del resultado, en el orden en que se exportan
+CAMPOS_RESULTADO = (
+    "tiempo_para_objetivo",
+    "actividad_al_final",
+    "porcentaje_restante",
+    "gamma_final",
+    "vidas_medias",
+    "alcanza_objetivo"
+)
+
+
+def leer_escenarios(ruta, catalogo=None):
+    """
+    Lee un CSV de escenarios con columnas radiofarmaco, actividad_inicial,
+    actividad_final y duracion (horas).
+
+    Se valida igual que en la interfaz: A₀ y la duración deben ser mayores
+    que cero y la actividad final, si se indica (vacía o 0 = sin objetivo),
+    menor que A₀.
+
+    Args:
+        ruta (str): Ruta del archivo CSV
+        catalogo (CatalogoRadiofarmacos): Catálogo a usar (por defecto, RADIOFARMACOS)
+
+    Returns:
+        dict: Arreglos por columna más ``vida_media`` y ``constante_decaimiento``
+        indexadas desde el catálogo
+    """
+    catalogo = catalogo or obtener_catalogo()
+    nombres = []
+    valores = []
+    with open(ruta, newline="", encoding="utf-8") as archivo:
+        lector = csv.DictReader(archivo)
+        faltantes = [c for c in CAMPOS_ESCENARIO if c not in (lector.fieldnames or [])]
+        if faltantes:
+            raise ValueError(f"Faltan columnas en {ruta}: {', '.join(faltantes)}")
+
+        for fila_num, fila in enumerate(lector, start=2):
+            nombre = fila["radiofarmaco"].strip()
+            if nombre not in catalogo:
+                raise ValueError(f"Línea {fila_num}: radiofármaco desconocido '{nombre}'")
+            try:
+                a0 = float(fila["actividad_inicial"])
+                af = float(fila["actividad_final"] or 0)
+                duracion = float(fila["duracion"])
+            except ValueError:
+                raise ValueError(f"Línea {fila_num}: valores numéricos inválidos")
+            if not a0 > 0:
+                raise ValueError(f"Línea {fila_num}: la actividad inicial debe ser mayor que cero")
+            if not duracion > 0:
+                raise ValueError(f"Línea {fila_num}: la duración debe ser mayor que cero")
+            if not 0 <= af < a0:
+                raise ValueError(f"Línea {fila_num}: la actividad final debe ser menor que la actividad inicial")
+            valores.append((a0, af, duracion))
+            nombres.append(nombre)
+
+    datos = np.array(valores, dtype=float).reshape(-1, 3)
+    ids = catalogo.ids(nombres)
+    return {
+        "radiofarmaco": np.array(nombres),
+        "actividad_inicial": datos[:, 0],
+        "actividad_final": datos[:, 1],
+        "duracion": datos[:, 2],
+        "vida_media": catalogo.vidas_medias[ids],
+        "constante_decaimiento": catalogo.constantes_decaimiento[ids]
+    }
+
+
+def ejecutar_lote(escenarios, puntos=0, cache=None):
+    """
+    Evalúa todos los escenarios en una sola pasada vectorizada.
+
+    Los escenarios inválidos que no pasaron por ``leer_escenarios`` (A₀ o
+    duración <= 0) dan ``nan`` en todos los resultados, y una actividad
+    final >= A₀ se trata como objetivo inválido; en ambos casos
+    ``alcanza_objetivo`` es False.
+
+    Args:
+        escenarios (dict): Salida de ``leer_escenarios``
+        puntos (int): Si es mayor que cero, muestrea además cada curva A(t)
+            en ese número de puntos equiespaciados entre 0 y la duración
+        cache (CacheResultados): Si se indica, el lote se busca ahí antes de
+            calcularlo (la clave son los parámetros numéricos, no los nombres)
+
+    Returns:
+        dict: Arreglos de resultados (ver ``CAMPOS_RESULTADO``) y, si se
+        pidieron, ``tiempos`` y ``actividades`` de forma (n_escenarios, puntos)
+    """
+    if cache is not None:
+        parametros = {campo: escenarios[campo] for campo in (
+            "actividad_inicial", "actividad_final", "duracion", "vida_media", "constante_decaimiento"
+        )}
+        resultados, _ = cache.obtener_o_calcular(
+            "lote", dict(parametros, puntos=puntos), lambda: ejecutar_lote(escenarios, puntos)
+        )
+        return resultados
+
+    a0 = escenarios["actividad_inicial"]
+    af = escenarios["actividad_final"]
+    duracion = escenarios["duracion"]
+    vida_media = escenarios["vida_media"]
+    constante = escenarios["constante_decaimiento"]
+
+    validos = (a0 > 0) & (duracion > 0)
+    a0 = np.where(validos, a0, np.nan)
+    duracion = np.where(validos, duracion, np.nan)
+
+    actividad_al_final = calcular_actividad_restante(a0, duracion, vida_media, constante_decaimiento=constante)
+    tiempo_objetivo = calcular_tiempo_para_actividad(
+        a0, np.where((af > 0) & (af < a0), af, np.nan), vida_media, constante_decaimiento=constante
+    )
+
+    resultados = {
+        "tiempo_para_objetivo": tiempo_objetivo,
+        "actividad_al_final": actividad_al_final,
+        "porcentaje_restante": calcular_porcentaje_restante(actividad_al_final, a0),
+        "gamma_final": calcular_gamma(actividad_al_final, a0),
+        "vidas_medias": calcular_numero_vidas_medias(duracion, vida_media),
+        "alcanza_objetivo": tiempo_objetivo <= duracion
+    }
+
+    if puntos > 0:
+        fracciones = np.linspace(0.0, 1.0, puntos)
+        tiempos = duracion[:, None] * fracciones[None, :]
+        resultados["tiempos"] = tiempos
+        resultados["actividades"] = calcular_actividad_restante(
+            a0[:, None], tiempos, vida_media[:, None], constante_decaimiento=constante[:, None]
+        )
+
+    return resultados
+
+
+def guardar_csv(ruta, escenarios, resultados):
+    """Escribe una fila por escenario con sus parámetros y resultados"""
+    columnas = CAMPOS_ESCENARIO + ("vida_media",) + CAMPOS_RESULTADO
+    datos = [escenarios[c] for c in columnas[:len(CAMPOS_ESCENARIO) + 1]]
+    datos += [resultados[c] for c in CAMPOS_RESULTADO]
+
+    with open(ruta, "w", newline="", encoding="utf-8") as archivo:
+        escritor = csv.writer(archivo)
+        escritor.writerow(columnas)
+        escritor.writerows(zip(*(d.tolist() for d in datos)))
+
+
+def guardar_npz(ruta, escenarios, resultados):
+    """Guarda parámetros y resultados (incluidas las curvas) en un .npz"""
+    np.savez(ruta, **escenarios, **resultados)
+
+
+def guardar_resultados(ruta, escenarios, resultados):
+    """Elige el formato de salida según la extensión (.csv o .npz)"""
+    if str(ruta).lower().endswith(".npz"):
+        guardar_npz(ruta, escenarios, resultados)
+    else:
+        guardar_csv(ruta, escenarios, resultados)
@@ -0,0 +1,285 @@
+"""
+Biblioteca de núclidos cargada desde archivo
+El CSV/JSON se interpreta una sola vez y se guarda en columnas de numpy; una
+caché binaria (.npz) junto al archivo evita volver a interpretarlo mientras
+el origen no cambie. Las búsquedas por prefijo usan un índice ordenado de
+claves normalizadas (búsqueda binaria); si no bastan, se buscan subcadenas y
+por último coincidencias aproximadas
+"""
+
+import csv
+import difflib
+import json
+import os
+import unicodedata
+import zlib
+from functools import lru_cache
+
+import numpy as np
+
+from config.constantes import BIBLIOTECA_NUCLIDOS
+from modelos.radiofarmaco import Radiofarmaco
+from utilidades.calculos import LN2
+
+# Columnas del archivo de origen; ``unidad`` y ``constante_gamma`` son opcionales
+CAMPOS_NUCLIDO = ("nombre", "simbolo", "vida_media", "modo")
+
+# Horas por unidad de la vida media (año juliano de 365.25 días)
+UNIDADES_TIEMPO = {"s": 1 / 3600, "min": 1 / 60, "h": 1.0, "d": 24.0, "a": 8766.0}
+
+# Se incrementa si cambia el contenido de la caché binaria
+VERSION_CACHE = 1
+
+
+def normalizar(texto):
+    """
+    Clave de búsqueda: minúsculas, sin acentos ni separadores.
+
+    "Tecnecio-99m" y "tecnecio 99m" dan "tecnecio99m"; "Flúor" da "fluor".
+    """
+    descompuesto = unicodedata.normalize("NFKD", texto.lower())
+    return "".join(c for c in descompuesto if c.isalnum())
+
+
+def leer_nuclidos(ruta):
+    """
+    Lee un archivo de núclidos en CSV o JSON.
+
+    El CSV lleva las columnas nombre, simbolo, vida_media, modo y,
+    opcionalmente, unidad (s, min, h, d, a; por defecto h) y constante_gamma
+    (R·cm²/(mCi·h); vacía si no se conoce). El JSON es una lista de objetos
+    con esos campos o un diccionario nombre → campos.
+
+    Args:
+        ruta (str): Ruta del archivo
+
+    Returns:
+        dict: Columnas ``nombre``, ``simbolo``, ``vida_media`` (horas),
+        ``modo`` y ``constante_gamma`` como arreglos
+    """
+    if ruta.lower().endswith(".json"):
+        with open(ruta, encoding="utf-8") as archivo:
+            datos = json.load(archivo)
+        if isinstance(datos, dict):
+            datos = [{"nombre": nombre, **campos} for nombre, campos in datos.items()]
+        filas = list(enumerate(datos, start=1))
+    else:
+        with open(ruta, newline="", encoding="utf-8-sig") as archivo:
+            lector = csv.DictReader(archivo)
+            faltantes = [c for c in CAMPOS_NUCLIDO if c not in (lector.fieldnames or [])]
+            if faltantes:
+                raise ValueError(f"Faltan columnas en {ruta}: {', '.join(faltantes)}")
+            filas = list(enumerate(lector, start=2))
+
+    nombres, simbolos, modos, valores = [], [], [], []
+    for fila_num, fila in filas:
+        nombre = str(fila.get("nombre") or "").strip()
+        if not nombre:
+            raise ValueError(f"Entrada {fila_num}: falta el nombre")
+        unidad = str(fila.get("unidad") or "h").strip()
+        if unidad not in UNIDADES_TIEMPO:
+            raise ValueError(f"Entrada {fila_num}: unidad de tiempo desconocida '{unidad}'")
+        try:
+            vida_media = float(fila["vida_media"]) * UNIDADES_TIEMPO[unidad]
+            gamma = fila.get("constante_gamma")
+            gamma = float(gamma) if gamma not in (None, "") else np.nan
+        except (KeyError, TypeError, ValueError):
+            raise ValueError(f"Entrada {fila_num}: valores numéricos inválidos")
+        if vida_media <= 0:
+            raise ValueError(f"Entrada {fila_num}: la vida media debe ser mayor que cero")
+
+        nombres.append(nombre)
+        simbolos.append(str(fila.get("simbolo") or "").strip())
+        modos.append(str(fila.get("modo") or "").strip())
+        valores.append((vida_media, gamma))
+
+    valores = np.array(valores, dtype=float).reshape(-1, 2)
+    return {
+        "nombre": np.array(nombres, dtype=str),
+        "simbolo": np.array(simbolos, dtype=str),
+        "vida_media": valores[:, 0],
+        "modo": np.array(modos, dtype=str),
+        "constante_gamma": valores[:, 1]
+    }
+
+
+class BibliotecaNuclidos:
+    """
+    Catálogo columnar de núclidos con índice de búsqueda.
+
+    Cada propiedad es un arreglo alineado por posición (``nombres``,
+    ``simbolos``, ``vidas_medias`` en horas, ``constantes_decaimiento``,
+    ``modos`` y ``constantes_gamma``). El índice guarda las claves
+    normalizadas de nombres y símbolos ordenadas junto a la posición del
+    núclido, de modo que un prefijo se resuelve con dos búsquedas binarias.
+    """
+
+    def __init__(self, columnas, claves=None, posiciones=None):
+        """
+        Args:
+            columnas (dict): Salida de ``leer_nuclidos``
+            claves (ndarray): Índice ya construido (desde la caché)
+            posiciones (ndarray): Posición del núclido de cada clave
+        """
+        self.nombres = columnas["nombre"]
+        self.simbolos = columnas["simbolo"]
+        self.vidas_medias = columnas["vida_media"]
+        self.modos = columnas["modo"]
+        self.constantes_gamma = columnas["constante_gamma"]
+        self.constantes_decaimiento = LN2 / self.vidas_medias
+
+        if claves is None:
+            claves, posiciones = self._construir_indice()
+        self._claves = claves
+        self._posiciones = posiciones
+        self._lista_claves = None
+        self._por_nombre = {nombre: i for i, nombre in enumerate(self.nombres.tolist())}
+        for i, simbolo in enumerate(self.simbolos.tolist()):
+            if simbolo:
+                self._por_nombre.setdefault(simbolo, i)
+
+    def _construir_indice(self):
+        """Claves normalizadas de nombres y símbolos, ordenadas"""
+        n = len(self.nombres)
+        claves = np.array(
+            [normalizar(t) for t in self.nombres.tolist() + self.simbolos.tolist()], dtype=str
+        )
+        posiciones = np.concatenate((np.arange(n), np.arange(n)))
+        orden = np.argsort(claves, kind="stable")
+        return claves[orden], posiciones[orden]
+
+    @classmethod
+    def cargar(cls, ruta, usar_cache=True):
+        """
+        Carga la biblioteca, usando la caché ``<ruta>.npz`` si sigue vigente.
+
+        La caché guarda la fecha de modificación y el tamaño del origen; si
+        no coinciden se vuelve a leer el archivo y se reescribe la caché. Si
+        no se puede escribir (directorio de solo lectura) se sigue sin ella.
+
+        Args:
+            ruta (str): Archivo CSV o JSON
+            usar_cache (bool): Leer y escribir la caché binaria
+        """
+        estado = os.stat(ruta)
+        firma = np.array([estado.st_mtime_ns, estado.st_size, VERSION_CACHE], dtype=np.int64)
+        ruta_cache = ruta + ".npz"
+
+        if usar_cache:
+            try:
+                with np.load(ruta_cache, allow_pickle=False) as datos:
+                    if np.array_equal(datos["firma"], firma):
+                        columnas = {campo: datos[campo] for campo in
+                                    ("nombre", "simbolo", "vida_media", "modo", "constante_gamma")}
+                        return cls(columnas, datos["claves"], datos["posiciones"])
+            except (OSError, KeyError, ValueError):
+                pass
+
+        biblioteca = cls(leer_nuclidos(ruta))
+        if usar_cache:
+            try:
+                biblioteca.guardar_cache(ruta_cache, firma)
+            except OSError:
+                pass
+        return biblioteca
+
+    def guardar_cache(self, ruta_cache, firma):
+        """Escribe la caché binaria de forma atómica (archivo temporal + rename)"""
+        temporal = f"{ruta_cache}.{os.getpid()}.tmp"
+        with open(temporal, "wb") as archivo:
+            np.savez(
+                archivo,
+                firma=firma,
+                nombre=self.nombres,
+                simbolo=self.simbolos,
+                vida_media=self.vidas_medias,
+                modo=self.modos,
+                constante_gamma=self.constantes_gamma,
+                claves=self._claves,
+                posiciones=self._posiciones
+            )
+        os.replace(temporal, ruta_cache)
+
+    def __len__(self):
+        return len(self.nombres)
+
+    def __contains__(self, nombre):
+        return nombre in self._por_nombre
+
+    def indice(self, nombre):
+        """Posición del núclido por nombre o símbolo exactos"""
+        return self._por_nombre[nombre]
+
+    def buscar(self, texto, limite=20):
+        """
+        Nombres de los núclidos que coinciden con ``texto``.
+
+        Primero los que empiezan por el texto (nombre o símbolo), después
+        los que lo contienen y, si no hay ninguno, los más parecidos.
+
+        Args:
+            texto (str): Texto escrito por el usuario
+            limite (int): Número máximo de resultados
+
+        Returns:
+            list: Nombres sin repetir, en orden de relevancia
+        """
+        clave = normalizar(texto)
+        if not clave:
+            return self.nombres[:limite].tolist()
+
+        inicio = int(np.searchsorted(self._claves, clave, side="left"))
+        fin = int(np.searchsorted(self._claves, clave + "\uffff", side="left"))
+        encontrados = dict.fromkeys(self._posiciones[inicio:fin].tolist())
+
+        if len(encontrados) < limite:
+            contienen = np.flatnonzero(np.char.find(self._claves, clave) > 0)
+            encontrados.update(dict.fromkeys(self._posiciones[contienen].tolist()))
+
+        if not encontrados:
+            # Las erratas rara vez están en la primera letra: primero se comparan
+            # solo las claves que empiezan igual y, si ninguna se parece, todas
+            if self._lista_claves is None:
+                self._lista_claves = self._claves.tolist()
+            desde = int(np.searchsorted(self._claves, clave[0], side="left"))
+            hasta = int(np.searchsorted(self._claves, clave[0] + "\uffff", side="left"))
+            parecidas = difflib.get_close_matches(clave, self._lista_claves[desde:hasta], n=limite, cutoff=0.6)
+            if not parecidas:
+                parecidas = difflib.get_close_matches(clave, self._lista_claves, n=limite, cutoff=0.6)
+            for parecida in parecidas:
+                i = int(np.searchsorted(self._claves, parecida))
+                encontrados.setdefault(int(self._posiciones[i]))
+
+        return [str(self.nombres[i]) for i in list(encontrados)[:limite]]
+
+    def radiofarmaco(self, nombre):
+        """
+        ``Radiofarmaco`` para simular un núclido de la biblioteca.
+
+        Args:
+            nombre (str): Nombre o símbolo exactos
+
+        Returns:
+            Radiofarmaco: Con color fijo por nombre y el modo de decaimiento
+            como aplicación
+        """
+        i = self.indice(nombre)
+        nombre = str(self.nombres[i])
+        colores = BIBLIOTECA_NUCLIDOS["colores"]
+        gamma = self.constantes_gamma[i]
+        descripcion = f"{self.simbolos[i]}, modo {self.modos[i]}"
+        if not np.isnan(gamma):
+            descripcion += f", Γ = {gamma:g} R·cm²/(mCi·h)"
+        return Radiofarmaco(
+            nombre=nombre,
+            vida_media=float(self.vidas_medias[i]),
+            color=colores[zlib.crc32(nombre.encode("utf-8")) % len(colores)],
+            aplicacion=f"Biblioteca de núclidos ({self.modos[i]})",
+            descripcion=descripcion
+        )
+
+
+@lru_cache(maxsize=None)
+def obtener_biblioteca(ruta=None):
+    """Biblioteca de núclidos por defecto, cargada una sola vez por proceso"""
+    return BibliotecaNuclidos.cargar(ruta or BIBLIOTECA_NUCLIDOS["ruta"])
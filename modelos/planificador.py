@@ -0,0 +1,170 @@
+"""
+Planificación de eventos de la simulación
+Los instantes de finalización, actividad objetivo y umbrales se conocen en
+forma cerrada, así que se programan como temporizadores en lugar de
+comprobarlos en cada refresco; el refresco visual elige su propio ritmo
+según la velocidad de la curva en pantalla
+"""
+
+from dataclasses import dataclass
+from typing import Callable
+
+
+@dataclass
+class Evento:
+    """Evento asociado a un instante del tiempo simulado"""
+    nombre: str
+    tiempo_simulado: float
+    callback: Callable[["Evento"], None]
+    disparado: bool = False
+
+
+class PlanificadorEventos:
+    """
+    Convierte tiempos simulados en plazos de reloj y dispara cada evento una vez.
+
+    No depende de Tk: recibe las funciones para programar y cancelar
+    temporizadores (``root.after`` / ``root.after_cancel`` en la interfaz).
+    """
+
+    def __init__(self, programar, cancelar):
+        """
+        Args:
+            programar (callable): programar(ms, funcion) -> identificador
+            cancelar (callable): cancelar(identificador)
+        """
+        self._programar = programar
+        self._cancelar = cancelar
+        self._eventos = {}
+        self._pendientes = {}
+
+    def agregar(self, nombre, tiempo_simulado, callback):
+        """
+        Registra un evento. Si ya existe uno con el mismo nombre lo reemplaza.
+
+        Args:
+            nombre (str): Identificador del evento
+            tiempo_simulado (float): Instante en horas simuladas
+            callback (callable): Recibe el ``Evento`` al dispararse
+        """
+        self._cancelar_pendiente(nombre)
+        self._eventos[nombre] = Evento(nombre, tiempo_simulado, callback)
+
+    def iniciar(self, tiempo_actual, horas_por_segundo):
+        """
+        Programa todos los eventos no disparados a partir del instante actual.
+
+        Args:
+            tiempo_actual (float): Tiempo simulado actual en horas
+            horas_por_segundo (float): Horas simuladas por segundo real
+        """
+        self.detener()
+        for evento in self._eventos.values():
+            if evento.disparado:
+                continue
+            restante = max(0.0, evento.tiempo_simulado - tiempo_actual)
+            ms = int(round(restante / horas_por_segundo * 1000)) if horas_por_segundo > 0 else 0
+            self._pendientes[evento.nombre] = self._programar(
+                ms, lambda nombre=evento.nombre: self._disparar(nombre)
+            )
+
+    def detener(self):
+        """Cancela los temporizadores pendientes conservando los eventos"""
+        for nombre in list(self._pendientes):
+            self._cancelar_pendiente(nombre)
+
+    def limpiar(self):
+        """Cancela y elimina todos los eventos"""
+        self.detener()
+        self._eventos.clear()
+
+    def pendientes(self):
+        """Eventos que aún no se han disparado, ordenados por tiempo"""
+        return sorted(
+            (e for e in self._eventos.values() if not e.disparado),
+            key=lambda e: e.tiempo_simulado
+        )
+
+    def _cancelar_pendiente(self, nombre):
+        identificador = self._pendientes.pop(nombre, None)
+        if identificador is not None:
+            self._cancelar(identificador)
+
+    def _disparar(self, nombre):
+        """Ejecuta el callback del evento una sola vez"""
+        self._pendientes.pop(nombre, None)
+        evento = self._eventos.get(nombre)
+        if evento is None or evento.disparado:
+            return
+        evento.disparado = True
+        evento.callback(evento)
+
+
+class RefrescoAdaptativo:
+    """
+    Elige el intervalo del siguiente fotograma según cuánto se moverá la curva.
+
+    Si la curva avanza menos de ``pixeles_por_fotograma`` por segundo no tiene
+    sentido redibujar más a menudo; si avanza rápido se limita a ``fps_max``.
+    """
+
+    def __init__(self, fps_min=1.0, fps_max=30.0, pixeles_por_fotograma=1.0):
+        if fps_min <= 0 or fps_max < fps_min:
+            raise ValueError("Se requiere 0 < fps_min <= fps_max")
+        self.fps_min = fps_min
+        self.fps_max = fps_max
+        self.pixeles_por_fotograma = pixeles_por_fotograma
+
+    def intervalo_ms(self, velocidad_pixeles):
+        """
+        Args:
+            velocidad_pixeles (float): Desplazamiento esperado de la curva en
+                píxeles por segundo real
+
+        Returns:
+            int: Milisegundos hasta el siguiente fotograma
+        """
+        if velocidad_pixeles > 0:
+            segundos = self.pixeles_por_fotograma / velocidad_pixeles
+        else:
+            segundos = 1 / self.fps_min
+        segundos = min(max(segundos, 1 / self.fps_max), 1 / self.fps_min)
+        return int(round(segundos * 1000))
+
+
+class Antirrebote:
+    """
+    Agrupa una ráfaga de llamadas en una sola ejecución diferida.
+
+    Cada llamada reinicia la espera; la función se ejecuta ``retardo_ms``
+    después de la última. Como ``PlanificadorEventos``, no depende de Tk.
+    """
+
+    def __init__(self, programar, cancelar, retardo_ms, funcion):
+        """
+        Args:
+            programar (callable): programar(ms, funcion) -> identificador
+            cancelar (callable): cancelar(identificador)
+            retardo_ms (int): Espera tras la última llamada
+            funcion (callable): Función a ejecutar, sin argumentos
+        """
+        self._programar = programar
+        self._cancelar = cancelar
+        self.retardo_ms = retardo_ms
+        self.funcion = funcion
+        self._pendiente = None
+
+    def __call__(self, *args):
+        """Programa (o reprograma) la ejecución; ignora los argumentos del evento"""
+        self.cancelar()
+        self._pendiente = self._programar(self.retardo_ms, self._ejecutar)
+
+    def cancelar(self):
+        """Descarta la ejecución pendiente, si la hay"""
+        if self._pendiente is not None:
+            self._cancelar(self._pendiente)
+            self._pendiente = None
+
+    def _ejecutar(self):
+        self._pendiente = None
+        self.funcion()
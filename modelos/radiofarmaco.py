@@ -1,26 +1,126 @@
 """Modelo de datos para radiofármacos"""
 
-from dataclasses import dataclass
+import math
+from dataclasses import dataclass, field
+from functools import lru_cache
 
-@dataclass
+import numpy as np
+
+from config.constantes import RADIOFARMACOS
+from utilidades.calculos import LN2, calcular_actividad_restante, calcular_tiempo_para_actividad
+
+@dataclass(frozen=True, slots=True)
 class Radiofarmaco:
-    """Clase que representa un radiofármaco"""
+    """
+    Clase que representa un radiofármaco.
+
+    Es inmutable y precalcula las constantes derivadas de la vida media,
+    de modo que los cálculos repetidos no vuelven a evaluar ln(2) / t½.
+    """
     nombre: str
     vida_media: float
     color: str
     aplicacion: str
     descripcion: str
-    
+    id: int = 0
+    constante_decaimiento: float = field(init=False, repr=False, compare=False)
+    vida_media_promedio: float = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        if self.vida_media <= 0:
+            raise ValueError("La vida media debe ser mayor que cero")
+        constante = LN2 / self.vida_media
+        # λ en h⁻¹ y vida media promedio τ = 1/λ en horas
+        object.__setattr__(self, "constante_decaimiento", constante)
+        object.__setattr__(self, "vida_media_promedio", 1 / constante)
+
     def __str__(self):
         return f"{self.nombre} (t½ = {self.vida_media}h)"
-    
+
+    def actividad(self, actividad_inicial, tiempo):
+        """Actividad restante A(t) en MBq usando la λ precalculada"""
+        if isinstance(actividad_inicial, (int, float)) and isinstance(tiempo, (int, float)):
+            return actividad_inicial * math.exp(-self.constante_decaimiento * tiempo)
+        return calcular_actividad_restante(
+            actividad_inicial, tiempo, self.vida_media,
+            constante_decaimiento=self.constante_decaimiento
+        )
+
+    def tiempo_para_actividad(self, actividad_inicial, actividad_final):
+        """Tiempo en horas para pasar de A₀ a Af"""
+        return calcular_tiempo_para_actividad(
+            actividad_inicial, actividad_final, self.vida_media,
+            constante_decaimiento=self.constante_decaimiento
+        )
+
     @classmethod
-    def desde_dict(cls, nombre: str, datos: dict):
+    def desde_dict(cls, nombre: str, datos: dict, id: int = 0):
         """Crea un Radiofármaco desde un diccionario"""
         return cls(
             nombre=nombre,
             vida_media=datos["vida_media"],
             color=datos["color"],
             aplicacion=datos["aplicacion"],
-            descripcion=datos["descripcion"]
+            descripcion=datos["descripcion"],
+            id=id
+        )
+
+
+class CatalogoRadiofarmacos:
+    """
+    Registro indexado de radiofármacos.
+
+    Permite buscar por nombre o por id entero y expone las vidas medias y
+    constantes de decaimiento como arreglos alineados con los ids, para que
+    los cálculos por lotes indexen en lugar de buscar en diccionarios.
+    """
+
+    __slots__ = ("_por_id", "_por_nombre", "vidas_medias", "constantes_decaimiento")
+
+    def __init__(self, radiofarmacos):
+        self._por_id = tuple(radiofarmacos)
+        self._por_nombre = {rf.nombre: rf for rf in self._por_id}
+        for i, rf in enumerate(self._por_id):
+            if rf.id != i:
+                raise ValueError(f"Id {rf.id} de '{rf.nombre}' no coincide con su posición {i}")
+        self.vidas_medias = np.array([rf.vida_media for rf in self._por_id], dtype=float)
+        self.constantes_decaimiento = np.array(
+            [rf.constante_decaimiento for rf in self._por_id], dtype=float
         )
+
+    @classmethod
+    def desde_dict(cls, datos: dict):
+        """Construye el catálogo a partir de un diccionario como RADIOFARMACOS"""
+        return cls(
+            Radiofarmaco.desde_dict(nombre, valores, id=i)
+            for i, (nombre, valores) in enumerate(datos.items())
+        )
+
+    def __getitem__(self, clave):
+        """Obtiene un radiofármaco por nombre (str) o por id (int)"""
+        if isinstance(clave, str):
+            return self._por_nombre[clave]
+        return self._por_id[clave]
+
+    def __contains__(self, nombre):
+        return nombre in self._por_nombre
+
+    def __iter__(self):
+        return iter(self._por_id)
+
+    def __len__(self):
+        return len(self._por_id)
+
+    def nombres(self):
+        """Lista de nombres en orden de id"""
+        return [rf.nombre for rf in self._por_id]
+
+    def ids(self, nombres):
+        """Convierte una secuencia de nombres en un arreglo de ids"""
+        return np.array([self._por_nombre[n].id for n in nombres], dtype=np.intp)
+
+
+@lru_cache(maxsize=None)
+def obtener_catalogo():
+    """Catálogo de RADIOFARMACOS, construido una sola vez por proceso"""
+    return CatalogoRadiofarmacos.desde_dict(RADIOFARMACOS)
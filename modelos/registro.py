@@ -0,0 +1,254 @@
+"""
+Registro en disco de simulaciones largas
+Cada muestra se añade al final del archivo como un registro float64 de ancho
+fijo. Los registros se acumulan en un lote en memoria y se escriben cuando
+se llena o cuando pasa ``intervalo_volcado_s`` desde la última escritura.
+Como el archivo solo crece, tras un cierre inesperado basta con descartar el
+último registro incompleto para recuperar la simulación, y el historial
+completo se lee proyectando el archivo con ``np.memmap``
+"""
+
+import os
+import time
+
+import numpy as np
+
+from config.constantes import REGISTRO
+from modelos.sesion import (
+    bloques_historial, describir_simulacion, escribir_cabecera,
+    leer_cabecera, adoptar_historiales
+)
+
+EXTENSION_REGISTRO = ".rlog"
+
+MAGIA_REGISTRO = b"RREGIST\0"
+VERSION_REGISTRO = 1
+_TIPO = np.dtype("<f8")
+
+
+class RegistroMuestras:
+    """
+    Escritor de solo añadido del historial de un ``SimuladorDecaimiento``.
+
+    Cada registro reúne en columnas consecutivas los mismos bloques que una
+    sesión guardada: "serie" (tiempo, actividad, gamma), "paralelas" (una
+    columna por curva, si hay comparadas) y "cadena_i" (tiempo, actividad y
+    gamma de cada hija). Así, al recuperar, cada bloque es una vista
+    (filas × n) del archivo proyectado, sin copias.
+
+    Se usa como suscriptor del motor (``agregar``); ``historial`` devuelve la
+    simulación completa diezmada para dibujarla aunque la memoria solo
+    conserve la ventana reciente.
+    """
+
+    def __init__(self, ruta, simulador, registros_por_lote=None,
+                 intervalo_volcado_s=None, sincronizar=None, metadatos=None):
+        """
+        Args:
+            ruta (str): Archivo del registro (se sobrescribe)
+            simulador (SimuladorDecaimiento): Simulación ya configurada
+            registros_por_lote (int): Muestras acumuladas antes de escribir
+            intervalo_volcado_s (float): Segundos reales máximos entre escrituras
+            sincronizar (bool): Forzar ``os.fsync`` en cada volcado
+            metadatos (dict): Datos adicionales para la cabecera
+        """
+        if registros_por_lote is None:
+            registros_por_lote = REGISTRO["registros_por_lote"]
+        if intervalo_volcado_s is None:
+            intervalo_volcado_s = REGISTRO["intervalo_volcado_s"]
+        if sincronizar is None:
+            sincronizar = REGISTRO["sincronizar"]
+        if simulador.paralelas is None:
+            raise ValueError("Configure la simulación antes de abrir el registro")
+
+        self.ruta = ruta
+        self.intervalo_volcado_s = intervalo_volcado_s
+        self.sincronizar = sincronizar
+
+        bloques = bloques_historial(simulador)
+        cabecera = {
+            "version": VERSION_REGISTRO,
+            **describir_simulacion(simulador),
+            "ancho": sum(datos.shape[0] for _, datos, _ in bloques),
+            "bloques": [],
+            "metadatos": metadatos or {}
+        }
+        self.bloques = {}
+        columna = 0
+        for nombre, datos, _ in bloques:
+            cabecera["bloques"].append({"nombre": nombre, "filas": datos.shape[0], "columna": columna})
+            self.bloques[nombre] = (columna, datos.shape[0])
+            columna += datos.shape[0]
+        self.ancho = columna
+
+        # Posiciones que ``agregar`` rellena en cada registro
+        self._columna_paralelas = self.bloques["paralelas"][0] if "paralelas" in self.bloques else None
+        self._columna_cadena = self.bloques["cadena_0"][0] if "cadena_0" in self.bloques else None
+        self._actividad_inicial = simulador.actividad_inicial
+
+        directorio = os.path.dirname(ruta)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+        self._archivo = open(ruta, "wb")
+        self._inicio_datos = escribir_cabecera(self._archivo, cabecera, MAGIA_REGISTRO, VERSION_REGISTRO)
+        self._lote = np.empty((max(1, int(registros_por_lote)), self.ancho))
+        self._pendientes = 0
+        self.escritos = 0
+        self._proyeccion = None
+        self._vista = None
+
+        # Lo que ya hay en el historial (tras ``configurar``, la muestra en t = 0)
+        self._archivo.write(np.ascontiguousarray(np.vstack([d for _, d, _ in bloques]).T, dtype=_TIPO))
+        self.escritos = len(simulador.serie)
+        self.volcar()
+
+    @property
+    def total(self):
+        """Muestras registradas, incluidas las que aún no se han escrito"""
+        return self.escritos + self._pendientes
+
+    def agregar(self, muestra):
+        """Añade una ``Muestra`` al lote y lo escribe si toca (suscriptor del motor)"""
+        fila = self._lote[self._pendientes]
+        fila[0] = muestra.tiempo
+        fila[1] = muestra.actividad
+        fila[2] = muestra.gamma
+        if self._columna_paralelas is not None:
+            fila[self._columna_paralelas:self._columna_paralelas + len(muestra.actividades)] = muestra.actividades
+        if self._columna_cadena is not None:
+            hijas = fila[self._columna_cadena:].reshape(-1, 3)
+            hijas[:, 0] = muestra.tiempo
+            hijas[:, 1] = muestra.actividades_cadena[1:]
+            hijas[:, 2] = hijas[:, 1] / self._actividad_inicial
+        self._pendientes += 1
+
+        if (self._pendientes == len(self._lote)
+                or time.monotonic() - self._ultimo_volcado >= self.intervalo_volcado_s):
+            self.volcar()
+
+    def volcar(self):
+        """Escribe el lote pendiente y vacía los búferes del sistema"""
+        if self._archivo is None:
+            return
+        if self._pendientes:
+            self._archivo.write(self._lote[:self._pendientes])
+            self.escritos += self._pendientes
+            self._pendientes = 0
+        self._archivo.flush()
+        if self.sincronizar:
+            os.fsync(self._archivo.fileno())
+        self._ultimo_volcado = time.monotonic()
+
+    def cerrar(self):
+        """Escribe lo pendiente y cierra el archivo (el registro sigue legible)"""
+        if self._archivo is None:
+            return
+        self.volcar()
+        self._archivo.close()
+        self._archivo = None
+
+    def registros(self):
+        """
+        Proyección de solo lectura de los registros ya escritos.
+
+        Returns:
+            ndarray: Matriz (n, ancho); se vuelve a proyectar solo si ha crecido
+        """
+        if self._proyeccion is None or len(self._proyeccion) != self.escritos:
+            self._proyeccion = np.memmap(self.ruta, dtype=_TIPO, mode="r",
+                                         shape=(self.escritos, self.ancho), offset=self._inicio_datos)
+        return self._proyeccion
+
+    def columnas(self, nombre):
+        """Índices de las columnas de un bloque ("serie", "paralelas", "cadena_i")"""
+        columna, filas = self.bloques[nombre]
+        return slice(columna, columna + filas)
+
+    def historial(self, puntos, desde=None, hasta=None):
+        """
+        A lo sumo ``puntos`` registros equiespaciados de la simulación completa.
+
+        Vuelca el lote antes de leer; sobre la proyección solo se tocan las
+        páginas de los registros elegidos. El resultado se reutiliza mientras
+        no haya muestras nuevas, porque un redibujado lo pide por cada curva.
+
+        Args:
+            puntos (int): Máximo de registros
+            desde (float): Tiempo inicial del intervalo (por defecto, el primero)
+            hasta (float): Tiempo final del intervalo (por defecto, el último)
+
+        Returns:
+            ndarray: Copia (k, ancho) de los registros elegidos
+        """
+        clave = (self.total, puntos, desde, hasta)
+        if self._vista is not None and self._vista[0] == clave:
+            return self._vista[1]
+
+        self.volcar()
+        registros = self.registros()
+        tiempos = registros[:, 0]
+        inicio = 0 if desde is None else int(np.searchsorted(tiempos, desde, side="left"))
+        fin = len(tiempos) if hasta is None else int(np.searchsorted(tiempos, hasta, side="right"))
+        if fin - inicio <= puntos:
+            indices = np.arange(inicio, fin)
+        else:
+            indices = np.unique(np.linspace(inicio, fin - 1, puntos).astype(np.intp))
+        vista = np.array(registros[indices])
+        self._vista = (clave, vista)
+        return vista
+
+    def invalidar_historial(self):
+        """Descarta el historial diezmado guardado; ``historial`` lo vuelve a leer"""
+        self._vista = None
+
+    def registro_mas_cercano(self, tiempo):
+        """
+        Registro escrito cuyo tiempo está más cerca del indicado (búsqueda binaria).
+
+        Returns:
+            ndarray: Fila de ``ancho`` valores o None si no hay registros
+        """
+        self.volcar()
+        registros = self.registros()
+        n = len(registros)
+        if n == 0:
+            return None
+        tiempos = registros[:, 0]
+        i = int(np.searchsorted(tiempos, tiempo))
+        if i == n or (i > 0 and tiempos[i] - tiempo >= tiempo - tiempos[i - 1]):
+            i -= 1
+        return np.array(registros[i])
+
+
+def recuperar_registro(ruta, simulador):
+    """
+    Reconstruye en ``simulador`` la simulación escrita en un registro.
+
+    Sirve también tras un cierre inesperado: se ignora el último registro si
+    quedó a medio escribir. Los historiales quedan proyectados desde el
+    archivo y el reloj en pausa en la última muestra; las estadísticas se
+    recalculan recorriendo el archivo por bloques.
+
+    Args:
+        ruta (str): Archivo del registro
+        simulador (SimuladorDecaimiento): Simulador que adopta la simulación
+
+    Returns:
+        dict: Cabecera del registro, con ``muestras`` y el tiempo del reloj
+        actualizados a lo recuperado
+    """
+    cabecera, inicio_datos = leer_cabecera(ruta, MAGIA_REGISTRO, VERSION_REGISTRO)
+    ancho = cabecera["ancho"]
+    n = (os.path.getsize(ruta) - inicio_datos) // (ancho * _TIPO.itemsize)
+    if n <= 0:
+        raise ValueError(f"{ruta} no contiene muestras")
+
+    registros = np.memmap(ruta, dtype=_TIPO, mode="r", shape=(n, ancho), offset=inicio_datos)
+    bloques = {
+        bloque["nombre"]: (registros[:, bloque["columna"]:bloque["columna"] + bloque["filas"]].T, None)
+        for bloque in cabecera["bloques"]
+    }
+    cabecera["muestras"] = n
+    cabecera["reloj"]["tiempo"] = float(registros[-1, 0])
+    adoptar_historiales(simulador, cabecera, bloques)
+    return cabecera
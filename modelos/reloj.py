@@ -0,0 +1,129 @@
+"""
+Relojes de simulación
+Convierten tiempo real en horas simuladas a partir de un reloj monótono,
+descontando las pausas y admitiendo cambios de velocidad sin saltos
+"""
+
+import time
+
+
+class RelojSimulacion:
+    """
+    Reloj de horas simuladas con pausa y velocidad variable.
+
+    El tiempo simulado es ``acumulado + (fuente() - ancla) · velocidad``.
+    Al pausar o cambiar de velocidad se consolida el tramo en curso en
+    ``acumulado`` y se mueve el ancla, así que la curva nunca salta.
+
+    La fuente por defecto es ``time.monotonic``: no retrocede ni salta con
+    ajustes de NTP o cambios de horario, a diferencia de ``time.time``.
+    """
+
+    def __init__(self, horas_por_segundo=1.0, fuente=time.monotonic):
+        """
+        Args:
+            horas_por_segundo (float): Horas simuladas por segundo de la fuente
+            fuente (callable): Devuelve segundos de un reloj monótono
+        """
+        if horas_por_segundo <= 0:
+            raise ValueError("La velocidad del reloj debe ser mayor que cero")
+        self._fuente = fuente
+        self._velocidad = horas_por_segundo
+        self._acumulado = 0.0
+        self._ancla = None
+        self.iniciado = False
+
+    @property
+    def velocidad(self):
+        """Horas simuladas por segundo real"""
+        return self._velocidad
+
+    @velocidad.setter
+    def velocidad(self, horas_por_segundo):
+        if horas_por_segundo <= 0:
+            raise ValueError("La velocidad del reloj debe ser mayor que cero")
+        self._consolidar()
+        self._velocidad = horas_por_segundo
+
+    @property
+    def pausado(self):
+        return self.iniciado and self._ancla is None
+
+    def iniciar(self, horas_por_segundo=None, tiempo_inicial=0.0):
+        """
+        Pone el reloj en marcha desde ``tiempo_inicial`` horas.
+
+        Args:
+            horas_por_segundo (float): Nueva velocidad (opcional)
+            tiempo_inicial (float): Horas simuladas al arrancar
+        """
+        if horas_por_segundo is not None:
+            if horas_por_segundo <= 0:
+                raise ValueError("La velocidad del reloj debe ser mayor que cero")
+            self._velocidad = horas_por_segundo
+        self._acumulado = tiempo_inicial
+        self._ancla = self._fuente()
+        self.iniciado = True
+
+    def pausar(self):
+        """Congela el tiempo simulado; el tiempo en pausa no se cuenta"""
+        self._consolidar()
+        self._ancla = None
+
+    def reanudar(self):
+        """Continúa desde el instante en que se pausó"""
+        if self.iniciado and self._ancla is None:
+            self._ancla = self._fuente()
+
+    def detener(self):
+        """Vuelve al estado inicial (sin iniciar, tiempo 0)"""
+        self._acumulado = 0.0
+        self._ancla = None
+        self.iniciado = False
+
+    def tiempo(self):
+        """Horas simuladas transcurridas"""
+        if self._ancla is None:
+            return self._acumulado
+        return self._acumulado + (self._fuente() - self._ancla) * self._velocidad
+
+    def segundos_hasta(self, tiempo_simulado):
+        """Segundos reales que faltan para alcanzar ``tiempo_simulado`` a la velocidad actual"""
+        return max(0.0, tiempo_simulado - self.tiempo()) / self._velocidad
+
+    def _consolidar(self):
+        """Pasa el tramo en curso a ``acumulado`` y reinicia el ancla"""
+        if self._ancla is not None:
+            ahora = self._fuente()
+            self._acumulado += (ahora - self._ancla) * self._velocidad
+            self._ancla = ahora
+
+
+class RelojMonotonico(RelojSimulacion):
+    """Reloj de tiempo real basado en ``time.monotonic``"""
+
+    def __init__(self, horas_por_segundo=1.0):
+        super().__init__(horas_por_segundo, time.monotonic)
+
+
+class RelojVirtual(RelojSimulacion):
+    """
+    Reloj que solo avanza cuando se le indica.
+
+    Permite ejecutar el motor sin pantalla más rápido que el tiempo real y
+    obtener resultados deterministas en pruebas y benchmarks.
+    """
+
+    def __init__(self, horas_por_segundo=1.0):
+        self._ahora = 0.0
+        super().__init__(horas_por_segundo, lambda: self._ahora)
+
+    def avanzar(self, segundos):
+        """Avanza el tiempo real virtual ``segundos`` (respeta pausa y velocidad)"""
+        if segundos < 0:
+            raise ValueError("El reloj no puede retroceder")
+        self._ahora += segundos
+
+    def avanzar_horas(self, horas):
+        """Avanza lo necesario para sumar ``horas`` simuladas a la velocidad actual"""
+        self.avanzar(horas / self.velocidad)
@@ -0,0 +1,332 @@
+"""Almacenamiento compacto de series temporales de la simulación"""
+
+import math
+
+import numpy as np
+
+
+class EstadisticasEnLinea:
+    """
+    Resumen incremental de una serie (tiempo, valor).
+
+    Mantiene mínimo, máximo, media y varianza (Welford), la integral en el
+    tiempo por trapecios y la última muestra. Cada muestra cuesta O(1) y
+    consultar el resumen también, sea cual sea la longitud de la serie.
+    """
+
+    __slots__ = ("n", "media", "_m2", "minimo", "maximo", "integral",
+                 "tiempo_inicial", "ultimo_tiempo", "ultimo_valor")
+
+    def __init__(self):
+        self.limpiar()
+
+    def limpiar(self):
+        """Vuelve al estado sin muestras"""
+        self.n = 0
+        self.media = 0.0
+        self._m2 = 0.0
+        self.minimo = math.inf
+        self.maximo = -math.inf
+        self.integral = 0.0
+        self.tiempo_inicial = None
+        self.ultimo_tiempo = None
+        self.ultimo_valor = None
+
+    def agregar(self, tiempo, valor):
+        """Incorpora una muestra"""
+        self.n += 1
+        delta = valor - self.media
+        self.media += delta / self.n
+        self._m2 += delta * (valor - self.media)
+        if valor < self.minimo:
+            self.minimo = valor
+        if valor > self.maximo:
+            self.maximo = valor
+        if self.ultimo_tiempo is None:
+            self.tiempo_inicial = tiempo
+        else:
+            self.integral += 0.5 * (valor + self.ultimo_valor) * (tiempo - self.ultimo_tiempo)
+        self.ultimo_tiempo = tiempo
+        self.ultimo_valor = valor
+
+    def extender(self, tiempos, valores):
+        """
+        Incorpora un bloque de muestras con operaciones vectorizadas.
+
+        La media y la varianza del bloque se combinan con las acumuladas
+        mediante la fórmula de Chan et al. para varianzas por partes.
+        """
+        n_bloque = len(valores)
+        if n_bloque == 0:
+            return
+        media_bloque = float(valores.mean())
+        m2_bloque = float(np.square(valores - media_bloque).sum())
+
+        total = self.n + n_bloque
+        delta = media_bloque - self.media
+        self._m2 += m2_bloque + delta * delta * self.n * n_bloque / total
+        self.media += delta * n_bloque / total
+        self.n = total
+        self.minimo = min(self.minimo, float(valores.min()))
+        self.maximo = max(self.maximo, float(valores.max()))
+
+        if self.ultimo_tiempo is None:
+            self.tiempo_inicial = float(tiempos[0])
+        else:
+            self.integral += 0.5 * (float(valores[0]) + self.ultimo_valor) * (float(tiempos[0]) - self.ultimo_tiempo)
+        self.integral += float((0.5 * (valores[1:] + valores[:-1]) * np.diff(tiempos)).sum())
+        self.ultimo_tiempo = float(tiempos[-1])
+        self.ultimo_valor = float(valores[-1])
+
+    def instantanea(self):
+        """Estado completo como diccionario serializable en JSON"""
+        return {campo: getattr(self, campo) for campo in self.__slots__}
+
+    def restaurar(self, instantanea):
+        """Recupera el estado guardado con ``instantanea``"""
+        for campo in self.__slots__:
+            setattr(self, campo, instantanea[campo])
+
+    @property
+    def varianza(self):
+        """Varianza muestral (0 con menos de dos muestras)"""
+        return self._m2 / (self.n - 1) if self.n > 1 else 0.0
+
+    @property
+    def desviacion(self):
+        return math.sqrt(self.varianza)
+
+    @property
+    def media_temporal(self):
+        """Media ponderada por el tiempo: integral / duración cubierta"""
+        if self.n < 2 or self.ultimo_tiempo == self.tiempo_inicial:
+            return self.ultimo_valor
+        return self.integral / (self.ultimo_tiempo - self.tiempo_inicial)
+
+
+class SerieTemporal:
+    """
+    Buffer columnar de float64 para tiempos, actividades y gammas.
+
+    En modo crecible la capacidad se duplica al llenarse (coste amortizado
+    O(1) por muestra). Si se indica ``capacidad_maxima`` funciona como anillo
+    de tamaño fijo que conserva solo las últimas muestras; el buffer se
+    escribe por duplicado para que la ventana sea siempre contigua.
+
+    Las propiedades ``tiempos``, ``actividades`` y ``gammas`` devuelven vistas
+    sin copia. Una vista deja de reflejar los datos nuevos cuando el buffer
+    crece, por lo que deben pedirse de nuevo en cada uso.
+
+    ``estadisticas`` resume la actividad de todas las muestras agregadas
+    (también las que el anillo ya descartó) y se actualiza al agregarlas.
+    """
+
+    COLUMNAS = ("tiempo", "actividad", "gamma")
+
+    # Muestras por bloque al calcular estadísticas de datos proyectados
+    BLOQUE_ESTADISTICAS = 1 << 20
+
+    def __init__(self, capacidad_inicial=1024, capacidad_maxima=None):
+        """
+        Args:
+            capacidad_inicial (int): Muestras reservadas inicialmente
+            capacidad_maxima (int): Si se indica, activa el modo anillo
+        """
+        if capacidad_maxima is not None and capacidad_maxima <= 0:
+            raise ValueError("La capacidad máxima debe ser mayor que cero")
+
+        self.capacidad_maxima = capacidad_maxima
+        if capacidad_maxima is None:
+            self._capacidad = max(1, int(capacidad_inicial))
+            self._datos = np.empty((len(self.COLUMNAS), self._capacidad))
+        else:
+            self._capacidad = int(capacidad_maxima)
+            self._datos = np.empty((len(self.COLUMNAS), 2 * self._capacidad))
+        self._total = 0
+        self.estadisticas = EstadisticasEnLinea()
+
+    @classmethod
+    def desde_columnas(cls, datos, estadisticas=None):
+        """
+        Serie sobre un bloque (3, n) ya existente, sin copiarlo.
+
+        Sirve para abrir sesiones guardadas con ``np.memmap``: las muestras
+        se leen del disco según se necesitan. Agregar muestras nuevas hace
+        crecer la serie a un buffer en memoria.
+
+        Args:
+            datos (ndarray): Filas tiempo, actividad y gamma
+            estadisticas (dict): ``EstadisticasEnLinea.instantanea()`` guardada
+        """
+        serie = cls(capacidad_inicial=1)
+        serie._datos = datos
+        serie._capacidad = serie._total = datos.shape[1]
+        if estadisticas is not None:
+            serie.estadisticas.restaurar(estadisticas)
+        else:
+            # Por bloques, para no materializar temporales del tamaño del archivo
+            for inicio in range(0, serie._total, cls.BLOQUE_ESTADISTICAS):
+                fin = inicio + cls.BLOQUE_ESTADISTICAS
+                serie.estadisticas.extender(datos[0, inicio:fin], datos[1, inicio:fin])
+        return serie
+
+    @property
+    def es_anillo(self):
+        """Indica si la serie funciona como anillo de capacidad fija"""
+        return self.capacidad_maxima is not None
+
+    @property
+    def total_agregado(self):
+        """Número total de muestras agregadas (incluidas las descartadas)"""
+        return self._total
+
+    def __len__(self):
+        if self.es_anillo:
+            return min(self._total, self._capacidad)
+        return self._total
+
+    def agregar(self, tiempo, actividad, gamma):
+        """Agrega una muestra al final de la serie"""
+        datos = self._datos
+        if self.es_anillo:
+            i = self._total % self._capacidad
+            j = i + self._capacidad
+            datos[0, i] = datos[0, j] = tiempo
+            datos[1, i] = datos[1, j] = actividad
+            datos[2, i] = datos[2, j] = gamma
+        else:
+            i = self._total
+            if i == self._capacidad:
+                self._crecer(2 * self._capacidad)
+                datos = self._datos
+            datos[0, i] = tiempo
+            datos[1, i] = actividad
+            datos[2, i] = gamma
+        self._total += 1
+        self.estadisticas.agregar(tiempo, actividad)
+
+    def extender(self, tiempos, actividades, gammas):
+        """Agrega varias muestras de una vez"""
+        tiempos = np.asarray(tiempos, dtype=float)
+        n = len(tiempos)
+        if n == 0:
+            return
+        bloque = np.vstack((tiempos, np.asarray(actividades, dtype=float),
+                            np.asarray(gammas, dtype=float)))
+        self.estadisticas.extender(bloque[0], bloque[1])
+
+        if self.es_anillo:
+            cap = self._capacidad
+            if n > cap:
+                bloque = bloque[:, -cap:]
+                self._total += n - cap
+                n = cap
+            posiciones = (self._total + np.arange(n)) % cap
+            self._datos[:, posiciones] = bloque
+            self._datos[:, posiciones + cap] = bloque
+        else:
+            requerido = self._total + n
+            if requerido > self._capacidad:
+                nueva = self._capacidad
+                while nueva < requerido:
+                    nueva *= 2
+                self._crecer(nueva)
+            self._datos[:, self._total:requerido] = bloque
+        self._total += n
+
+    def _crecer(self, nueva_capacidad):
+        """Reubica el buffer con mayor capacidad"""
+        nuevos = np.empty((len(self.COLUMNAS), nueva_capacidad))
+        nuevos[:, :self._total] = self._datos[:, :self._total]
+        self._datos = nuevos
+        self._capacidad = nueva_capacidad
+
+    def _ventana(self):
+        """Límites [inicio, fin) de las muestras válidas en el buffer"""
+        if self.es_anillo and self._total > self._capacidad:
+            inicio = self._total % self._capacidad
+            return inicio, inicio + self._capacidad
+        return 0, self._total
+
+    def columna(self, nombre):
+        """Vista sin copia de una columna por nombre"""
+        inicio, fin = self._ventana()
+        return self._datos[self.COLUMNAS.index(nombre), inicio:fin]
+
+    @property
+    def tiempos(self):
+        inicio, fin = self._ventana()
+        return self._datos[0, inicio:fin]
+
+    @property
+    def actividades(self):
+        inicio, fin = self._ventana()
+        return self._datos[1, inicio:fin]
+
+    @property
+    def gammas(self):
+        inicio, fin = self._ventana()
+        return self._datos[2, inicio:fin]
+
+    def ultimo(self):
+        """
+        Devuelve la última muestra.
+
+        Returns:
+            tuple: (tiempo, actividad, gamma) o None si la serie está vacía
+        """
+        if self._total == 0:
+            return None
+        i = (self._total - 1) % self._capacidad if self.es_anillo else self._total - 1
+        return (float(self._datos[0, i]), float(self._datos[1, i]), float(self._datos[2, i]))
+
+    def indice_mas_cercano(self, tiempo):
+        """
+        Índice de la muestra cuyo tiempo está más cerca del indicado.
+
+        Los tiempos son monótonos, así que basta una búsqueda binaria.
+
+        Args:
+            tiempo (float): Tiempo de referencia en horas
+
+        Returns:
+            int: Índice dentro de la ventana actual o None si está vacía
+        """
+        tiempos = self.tiempos
+        n = len(tiempos)
+        if n == 0:
+            return None
+
+        i = int(np.searchsorted(tiempos, tiempo))
+        if i == 0:
+            return 0
+        if i == n:
+            return n - 1
+        return i if tiempos[i] - tiempo < tiempo - tiempos[i - 1] else i - 1
+
+    def indices_diezmados(self, puntos, desde=None, hasta=None):
+        """
+        Índices de a lo sumo ``puntos`` muestras equiespaciadas en la ventana.
+
+        Para dibujar historiales de millones de muestras basta con unas pocas
+        por píxel; sobre un ``np.memmap`` solo se leen las páginas tocadas.
+
+        Args:
+            puntos (int): Máximo de muestras a devolver
+            desde (float): Tiempo inicial del intervalo (por defecto, el primero)
+            hasta (float): Tiempo final del intervalo (por defecto, el último)
+
+        Returns:
+            ndarray: Índices crecientes que incluyen los extremos del intervalo
+        """
+        tiempos = self.tiempos
+        inicio = 0 if desde is None else int(np.searchsorted(tiempos, desde, side="left"))
+        fin = len(tiempos) if hasta is None else int(np.searchsorted(tiempos, hasta, side="right"))
+        if fin - inicio <= puntos:
+            return np.arange(inicio, fin)
+        return np.unique(np.linspace(inicio, fin - 1, puntos).astype(np.intp))
+
+    def limpiar(self):
+        """Descarta todas las muestras conservando el buffer reservado"""
+        self._total = 0
+        self.estadisticas.limpiar()
@@ -0,0 +1,247 @@
+"""
+Sesiones de simulación guardadas en disco
+Un archivo de sesión tiene una cabecera JSON (parámetros, radiofármacos,
+estado del reloj y estadísticas) seguida de los historiales como bloques
+float64 contiguos. Al abrirlo los bloques se proyectan con ``np.memmap``:
+solo se leen del disco las páginas que se consultan o dibujan, de modo que
+una sesión de millones de muestras se abre en milisegundos
+"""
+
+import json
+import os
+import struct
+from datetime import datetime
+
+import numpy as np
+
+from modelos.comparacion import SimulacionesParalelas
+from modelos.radiofarmaco import Radiofarmaco
+from modelos.serie_temporal import SerieTemporal
+from utilidades.cadenas import CadenaDecaimiento
+
+EXTENSION_SESION = ".rses"
+
+# Firma, versión del formato y longitud de la cabecera JSON
+MAGIA = b"RSESION\0"
+VERSION_SESION = 1
+_PREAMBULO = struct.Struct("<8sII")
+
+# Los bloques empiezan en múltiplos de este tamaño (alineación de páginas de caché)
+_ALINEACION = 64
+_TIPO = np.dtype("<f8")
+
+
+def _radiofarmaco_a_dict(rf):
+    return {
+        "nombre": rf.nombre,
+        "vida_media": rf.vida_media,
+        "color": rf.color,
+        "aplicacion": rf.aplicacion,
+        "descripcion": rf.descripcion
+    }
+
+
+def _alinear(posicion):
+    return -(-posicion // _ALINEACION) * _ALINEACION
+
+
+def bloques_historial(simulador):
+    """
+    Historiales del simulador como bloques (nombre, matriz filas × n, estadísticas).
+
+    "serie" lleva tiempo, actividad y gamma; "paralelas" (solo si hay curvas
+    comparadas) una fila por curva, recortada a la ventana de la serie; y
+    "cadena_i" las hijas de la cadena con las mismas filas que "serie".
+    """
+    serie = simulador.serie
+    n = len(serie)
+    bloques = [("serie", np.vstack((serie.tiempos, serie.actividades, serie.gammas)),
+                serie.estadisticas.instantanea())]
+    paralelas = simulador.paralelas
+    if len(paralelas.radiofarmacos) > 1:
+        filas = [paralelas.actividades(i)[-n:] for i in range(len(paralelas.radiofarmacos))]
+        bloques.append(("paralelas", np.vstack(filas), None))
+    for i, hija in enumerate(simulador.series_cadena):
+        bloques.append((f"cadena_{i}", np.vstack((hija.tiempos, hija.actividades, hija.gammas)),
+                        hija.estadisticas.instantanea()))
+    return bloques
+
+
+def describir_simulacion(simulador):
+    """
+    Parámetros, radiofármacos, cadena y reloj del simulador como dict
+    serializable en JSON (la parte común de sesiones y registros).
+    """
+    cadena = simulador.cadena
+    return {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "parametros": {
+            "actividad_inicial": simulador.actividad_inicial,
+            "actividad_deseada": simulador.actividad_deseada,
+            "escala_tiempo": simulador.escala_tiempo,
+            "duracion": simulador.duracion,
+            "color": simulador.color
+        },
+        "radiofarmacos": [_radiofarmaco_a_dict(rf) for rf in simulador.paralelas.radiofarmacos],
+        "cadena": None if cadena is None else {
+            "nombres": cadena.nombres,
+            "vidas_medias": cadena.vidas_medias.tolist(),
+            "ramificaciones": [list(r) for r in cadena.ramificaciones]
+        },
+        "reloj": {
+            "horas_por_segundo": simulador.reloj.velocidad,
+            "tiempo": simulador.reloj.tiempo()
+        }
+    }
+
+
+def guardar_sesion(ruta, simulador, **metadatos):
+    """
+    Guarda el estado completo de un ``SimuladorDecaimiento``.
+
+    Se escribe en un archivo temporal que reemplaza al destino al terminar,
+    así que un fallo a mitad no deja una sesión corrupta.
+
+    Args:
+        ruta (str): Archivo de destino
+        simulador (SimuladorDecaimiento): Simulación a guardar
+        **metadatos: Datos adicionales para la cabecera (nombre, notas, ...)
+
+    Returns:
+        int: Bytes escritos
+    """
+    serie = simulador.serie
+    n = len(serie)
+    if n == 0 or simulador.paralelas is None:
+        raise ValueError("No hay datos de simulación para guardar")
+
+    bloques = bloques_historial(simulador)
+    cabecera = {
+        "version": VERSION_SESION,
+        "muestras": n,
+        "total_agregado": serie.total_agregado,
+        **describir_simulacion(simulador),
+        "bloques": [],
+        "metadatos": metadatos
+    }
+
+    posicion = 0
+    for nombre, datos, estadisticas in bloques:
+        cabecera["bloques"].append({
+            "nombre": nombre, "filas": datos.shape[0], "desplazamiento": posicion,
+            "estadisticas": estadisticas
+        })
+        posicion = _alinear(posicion + datos.nbytes)
+
+    temporal = f"{ruta}.{os.getpid()}.tmp"
+    with open(temporal, "wb") as archivo:
+        inicio_datos = escribir_cabecera(archivo, cabecera)
+        for (_, datos, _), bloque in zip(bloques, cabecera["bloques"]):
+            archivo.seek(inicio_datos + bloque["desplazamiento"])
+            archivo.write(np.ascontiguousarray(datos, dtype=_TIPO).data)
+        tamano = archivo.tell()
+    os.replace(temporal, ruta)
+    return tamano
+
+
+def escribir_cabecera(archivo, cabecera, magia=MAGIA, version=VERSION_SESION):
+    """
+    Escribe preámbulo y cabecera JSON rellenada hasta un múltiplo de la alineación.
+
+    Returns:
+        int: Posición donde empiezan los datos
+    """
+    texto = json.dumps(cabecera, ensure_ascii=False).encode("utf-8")
+    inicio_datos = _alinear(_PREAMBULO.size + len(texto))
+    texto = texto.ljust(inicio_datos - _PREAMBULO.size)
+    archivo.write(_PREAMBULO.pack(magia, version, len(texto)))
+    archivo.write(texto)
+    return inicio_datos
+
+
+def leer_cabecera(ruta, magia=MAGIA, version_maxima=VERSION_SESION):
+    """
+    Lee solo la cabecera de una sesión (o de un archivo con otra ``magia``).
+
+    Returns:
+        tuple: (cabecera como dict, posición del primer bloque)
+    """
+    with open(ruta, "rb") as archivo:
+        preambulo = archivo.read(_PREAMBULO.size)
+        if len(preambulo) < _PREAMBULO.size or _PREAMBULO.unpack(preambulo)[0] != magia:
+            raise ValueError(f"{ruta} no tiene el formato esperado")
+        _, version, longitud = _PREAMBULO.unpack(preambulo)
+        if version > version_maxima:
+            raise ValueError(f"Versión de archivo {version} no compatible (máxima {version_maxima})")
+        cabecera = json.loads(archivo.read(longitud).decode("utf-8"))
+    return cabecera, _PREAMBULO.size + longitud
+
+
+def adoptar_historiales(simulador, cabecera, bloques):
+    """
+    Configura ``simulador`` según la cabecera y le da los historiales de ``bloques``.
+
+    Args:
+        simulador (SimuladorDecaimiento): Simulador que los adopta
+        cabecera (dict): Con las claves de ``describir_simulacion``
+        bloques (dict): nombre → (matriz filas × n, estadísticas o None);
+            las matrices pueden ser vistas de un ``np.memmap``
+    """
+    parametros = cabecera["parametros"]
+    radiofarmacos = [Radiofarmaco(**datos) for datos in cabecera["radiofarmacos"]]
+    datos_cadena = cabecera["cadena"]
+    cadena = None if datos_cadena is None else CadenaDecaimiento(
+        datos_cadena["nombres"], datos_cadena["vidas_medias"], datos_cadena["ramificaciones"]
+    )
+
+    # Se configura como una simulación nueva y luego se sustituyen los
+    # buffers por los bloques recibidos
+    simulador.configurar(
+        parametros["actividad_inicial"], radiofarmacos[0], parametros["actividad_deseada"],
+        parametros["escala_tiempo"], parametros["color"], duracion=parametros["duracion"],
+        comparados=radiofarmacos[1:], cadena=cadena
+    )
+    serie_datos, estadisticas = bloques["serie"]
+    simulador.serie = SerieTemporal.desde_columnas(serie_datos, estadisticas)
+    if "paralelas" in bloques:
+        filas = bloques["paralelas"][0]
+    else:
+        filas = serie_datos[1:2]
+    simulador.paralelas = SimulacionesParalelas.desde_arreglos(
+        radiofarmacos, parametros["actividad_inicial"], serie_datos[0], filas
+    )
+    simulador.series_cadena = [
+        SerieTemporal.desde_columnas(*bloques[f"cadena_{i}"])
+        for i in range(len(cadena) - 1 if cadena is not None else 0)
+    ]
+
+    reloj = cabecera["reloj"]
+    simulador.reloj.iniciar(reloj["horas_por_segundo"], tiempo_inicial=reloj["tiempo"])
+    simulador.pausar()
+
+
+def cargar_sesion(ruta, simulador):
+    """
+    Abre una sesión sobre ``simulador`` proyectando los historiales en memoria.
+
+    El simulador queda con el reloj en pausa en el instante guardado; sus
+    series leen del archivo bajo demanda y las estadísticas se recuperan de
+    la cabecera, así que ``obtener_estadisticas`` no recorre los datos.
+
+    Args:
+        ruta (str): Archivo de sesión
+        simulador (SimuladorDecaimiento): Simulador que adopta la sesión
+
+    Returns:
+        dict: Cabecera de la sesión
+    """
+    cabecera, inicio_datos = leer_cabecera(ruta)
+    n = cabecera["muestras"]
+    bloques = {}
+    for bloque in cabecera["bloques"]:
+        datos = np.memmap(ruta, dtype=_TIPO, mode="r", shape=(bloque["filas"], n),
+                          offset=inicio_datos + bloque["desplazamiento"])
+        bloques[bloque["nombre"]] = (datos, bloque["estadisticas"])
+
+    adoptar_historiales(simulador, cabecera, bloques)
+    return cabecera
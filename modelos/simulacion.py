@@ -1,108 +1,415 @@
-"""Lógica de simulación de decaimiento radiactivo"""
+"""
+Lógica de simulación de decaimiento radiactivo
+Motor único de la simulación: lo usan tanto la interfaz gráfica como el
+código sin pantalla (lotes, benchmarks, pruebas). El motor muestrea, guarda
+el historial y calcula las estadísticas; las vistas se suscriben para
+recibir cada muestra nueva
+"""
+
+from contextlib import nullcontext
+from dataclasses import dataclass
+
+import numpy as np
+from utilidades.calculos import calcular_constante_decaimiento
+from modelos.serie_temporal import SerieTemporal
+from modelos.reloj import RelojMonotonico
+from modelos.radiofarmaco import Radiofarmaco
+from modelos.comparacion import SimulacionesParalelas
+from modelos.registro import RegistroMuestras
+from modelos.estocastico import SimuladorEstocastico
+
+
+@dataclass
+class Muestra:
+    """Muestra publicada a los suscriptores"""
+    tiempo: float
+    actividad: float
+    gamma: float
+    porcentaje_restante: float
+    actividades: np.ndarray  # Todas las curvas comparadas; la fila 0 es la principal
+    actividades_cadena: np.ndarray = None  # Miembros de la cadena (el 0 es el padre)
+    actividad_estocastica: float = None  # MBq medidos por el modelo Monte Carlo, si está activo
 
-import time
-import random
-from utilidades.calculos import calcular_actividad_restante
 
 class SimuladorDecaimiento:
-    """Maneja la lógica de simulación de decaimiento radiactivo"""
+    """
+    Maneja la lógica de simulación de decaimiento radiactivo.
+
+    Además del radiofármaco principal puede llevar curvas comparadas (que
+    comparten A₀ e instantes de muestreo) y las hijas de una cadena de
+    decaimiento. Quien controla el ritmo (la interfaz con ``root.after`` o un
+    bucle con ``RelojVirtual``) llama a ``muestrear``; el motor publica cada
+    muestra a las funciones registradas con ``suscribir``.
+    """
     
-    def __init__(self):
+    def __init__(self, capacidad_maxima=None, semilla=None, reloj=None):
+        """
+        Args:
+            capacidad_maxima (int): Si se indica, conserva solo las últimas
+                muestras en un anillo de tamaño fijo
+            semilla (int): Semilla del modelo Monte Carlo (ver ``configurar``)
+            reloj (RelojSimulacion): Reloj del tiempo simulado; por defecto
+                uno monótono en tiempo real. Con un ``RelojVirtual`` la
+                simulación avanza solo con ``avanzar``
+        """
+        self.semilla = semilla
         self.actividad_inicial = 0
         self.vida_media = 0
+        self.constante_decaimiento = 0
         self.actividad_deseada = 0
-        self.start_time = 0
+        self.duracion = None
+        self.reloj = reloj or RelojMonotonico()
         self.escala_tiempo = 0
         self.color = "#FFFFFF"
-        self.tiempos = []
-        self.actividades = []
+        self.capacidad_maxima = capacidad_maxima
+        self.serie = SerieTemporal(capacidad_maxima=capacidad_maxima)
+        self.paralelas = None
+        self.cadena = None
+        self.series_cadena = []
+        self._actividades_iniciales_cadena = None
+        # Opcional: SimuladorEstocastico del radiofármaco principal
+        self.estocastico = None
         self.en_ejecucion = False
+        # Opcional: RegistroMuestras que escribe cada muestra en disco
+        self.registro = None
+        # Opcional: InstrumentacionRefresco para medir la fase de cálculo
+        self.instrumentacion = None
+        self._suscriptores = []
+        self._nulo = nullcontext()
+    
+    @property
+    def tiempos(self):
+        """Vista sin copia de los tiempos registrados"""
+        return self.serie.tiempos
+    
+    @property
+    def actividades(self):
+        """Vista sin copia de las actividades registradas"""
+        return self.serie.actividades
         
-    def iniciar_simulacion(self, actividad_inicial, vida_media, 
-                          actividad_deseada, escala_tiempo, color):
+    def suscribir(self, funcion):
+        """
+        Registra una función que recibe cada ``Muestra`` nueva.
+        
+        Args:
+            funcion (callable): funcion(muestra)
+            
+        Returns:
+            callable: La misma función (para usarla como decorador)
+        """
+        self._suscriptores.append(funcion)
+        return funcion
+    
+    def desuscribir(self, funcion):
+        """Deja de publicar muestras a ``funcion``"""
+        if funcion in self._suscriptores:
+            self._suscriptores.remove(funcion)
+    
+    def configurar(self, actividad_inicial, vida_media, actividad_deseada,
+                   escala_tiempo, color, duracion=None, comparados=(), cadena=None,
+                   nucleos=None, particulas=None):
         """
-        Inicia una nueva simulación.
+        Fija los parámetros y deja el historial con la muestra en t = 0,
+        sin poner el reloj en marcha (ver ``arrancar``).
         
         Args:
             actividad_inicial (float): Actividad inicial en MBq
-            vida_media (float): Vida media en horas
+            vida_media (float | Radiofarmaco): Vida media en horas o el
+                radiofármaco, cuya λ precalculada se reutiliza
             actividad_deseada (float): Actividad objetivo en MBq
-            escala_tiempo (int): Horas simuladas por minuto real
+            escala_tiempo (float): Horas simuladas por minuto real
             color (str): Color para visualización
+            duracion (float): Horas simuladas; las muestras no pasan de aquí
+            comparados (list): Radiofármacos que avanzan junto al principal
+            cadena (CadenaDecaimiento): Cadena cuyo padre es el principal
+            nucleos (int): Si se indica, el principal se simula además con
+                ese número de núcleos por muestreo binomial (``estocastico``)
+                y cada muestra lleva la actividad medida en MBq
+            particulas (int): Partículas representativas para la animación
         """
+        if actividad_inicial <= 0:
+            raise ValueError("La actividad inicial debe ser mayor que cero")
         self.actividad_inicial = actividad_inicial
-        self.vida_media = vida_media
+        if hasattr(vida_media, "constante_decaimiento"):
+            principal = vida_media
+            self.vida_media = vida_media.vida_media
+            self.constante_decaimiento = vida_media.constante_decaimiento
+        else:
+            principal = Radiofarmaco("", vida_media, color, "", "")
+            self.vida_media = vida_media
+            self.constante_decaimiento = calcular_constante_decaimiento(vida_media)
         self.actividad_deseada = actividad_deseada
         self.escala_tiempo = escala_tiempo
         self.color = color
-        self.start_time = time.time()
-        self.tiempos = [0]
-        self.actividades = [actividad_inicial]
+        self.duracion = duracion
+        self.reloj.detener()
+        self.detener_registro()
+        
+        # Buffers nuevos: los anteriores pueden ser proyecciones de solo lectura
+        # de una sesión o tener otra capacidad
+        self.serie = SerieTemporal(capacidad_maxima=self.capacidad_maxima)
+        self.serie.agregar(0.0, actividad_inicial, 1.0)
+        
+        # Curvas comparadas: comparten reloj, A₀ e instantes de muestreo
+        self.paralelas = SimulacionesParalelas(
+            [principal] + list(comparados), actividad_inicial, capacidad_maxima=self.capacidad_maxima
+        )
+        self.paralelas.agregar(0.0)
+        
+        self.cadena = cadena
+        self.series_cadena = []
+        if cadena is not None:
+            self._actividades_iniciales_cadena = [actividad_inicial] + [0.0] * (len(cadena) - 1)
+            for _ in cadena.nombres[1:]:
+                serie = SerieTemporal(capacidad_maxima=self.capacidad_maxima)
+                serie.agregar(0.0, 0.0, 0.0)
+                self.series_cadena.append(serie)
+        
+        self.estocastico = None
+        if nucleos:
+            opciones = {} if particulas is None else {"n_particulas": particulas}
+            self.estocastico = SimuladorEstocastico(
+                nucleos, self.vida_media, semilla=self.semilla,
+                actividad_inicial=actividad_inicial,
+                capacidad_maxima=self.capacidad_maxima, **opciones
+            )
+        self.en_ejecucion = False
+    
+    def arrancar(self, horas_por_segundo=None):
+        """
+        Pone el reloj en marcha desde t = 0.
+        
+        Args:
+            horas_por_segundo (float): Velocidad; por defecto la de
+                ``escala_tiempo`` (horas simuladas por minuto real)
+        """
+        if horas_por_segundo is None:
+            horas_por_segundo = self.escala_tiempo / 60
+        self.reloj.iniciar(horas_por_segundo=horas_por_segundo)
         self.en_ejecucion = True
+    
+    def iniciar_simulacion(self, actividad_inicial, vida_media, 
+                          actividad_deseada, escala_tiempo, color, **opciones):
+        """
+        Inicia una nueva simulación: ``configurar`` y ``arrancar``.
         
-    def actualizar_calculos(self):
+        Args:
+            actividad_inicial (float): Actividad inicial en MBq
+            vida_media (float | Radiofarmaco): Vida media en horas o el
+                radiofármaco, cuya λ precalculada se reutiliza
+            actividad_deseada (float): Actividad objetivo en MBq
+            escala_tiempo (int): Horas simuladas por minuto real
+            color (str): Color para visualización
+            **opciones: ``duracion``, ``comparados``, ``cadena``, ``nucleos`` y
+                ``particulas`` (ver ``configurar``)
         """
-        Actualiza los cálculos basados en el tiempo transcurrido.
+        self.configurar(actividad_inicial, vida_media, actividad_deseada,
+                        escala_tiempo, color, **opciones)
+        self.arrancar()
+    
+    def vista_previa(self, puntos=256, cache=None):
+        """
+        Curvas esperadas hasta ``duracion``, sin tocar el historial.
         
+        Args:
+            puntos (int): Instantes equiespaciados entre 0 y la duración
+            cache (CacheResultados): Si se indica, la vista se busca ahí
+                antes de calcularla
+            
         Returns:
-            tuple: (actividad_actual, tiempo_escalado)
+            dict: ``tiempos`` (puntos,) y ``actividades`` (curvas, puntos):
+            primero las curvas comparadas (la 0 es la principal) y después,
+            si hay cadena, todos sus miembros
         """
-        tiempo_real_minutos = (time.time() - self.start_time) / 60
-        tiempo_escalado = tiempo_real_minutos * self.escala_tiempo
+        if cache is not None:
+            cadena = self.cadena
+            parametros = dict(
+                actividad_inicial=self.actividad_inicial,
+                constantes=self.paralelas.constantes,
+                duracion=self.duracion or 0.0,
+                puntos=puntos,
+                cadena=None if cadena is None else [cadena.vidas_medias, list(cadena.ramificaciones)]
+            )
+            previa, _ = cache.obtener_o_calcular("vista_previa", parametros, lambda: self.vista_previa(puntos))
+            return previa
         
-        actividad_actual = calcular_actividad_restante(
-            self.actividad_inicial,
-            tiempo_escalado,
-            self.vida_media
-        )
+        tiempos = np.linspace(0.0, self.duracion or 0.0, puntos)
+        actividades = [self.paralelas.evaluar(tiempos)]
+        if self.cadena is not None:
+            actividades.append(self.cadena.actividades(self._actividades_iniciales_cadena, tiempos))
+        return {"tiempos": tiempos, "actividades": np.vstack(actividades)}
+    
+    def limites_actividad(self, puntos=256, cache=None):
+        """
+        Actividades mínima y máxima de todas las curvas hasta ``duracion``,
+        para fijar los ejes de antemano.
         
-        self.tiempos.append(tiempo_escalado)
-        self.actividades.append(actividad_actual)
+        Args:
+            puntos (int): Resolución de ``vista_previa``
+            cache (CacheResultados): Caché donde buscar la vista previa
         
-        return actividad_actual, tiempo_escalado
+        Returns:
+            tuple: (mínima, máxima); la máxima es None si no hay cadena
+                (entonces es la actividad inicial)
+        """
+        actividades = self.vista_previa(puntos, cache)["actividades"]
+        n_curvas = len(self.paralelas.radiofarmacos)
+        minima = float(actividades[:n_curvas, -1].min())
+        maxima = None
+        if self.cadena is not None:
+            maxima = float(actividades[n_curvas:].max())
+        return minima, maxima
     
-    def reiniciar(self):
-        """Reinicia todos los datos de la simulación"""
-        self.tiempos = []
-        self.actividades = []
-        self.start_time = 0
-        self.en_ejecucion = False
+    def _medir(self, fase):
+        if self.instrumentacion is None:
+            return self._nulo
+        return self.instrumentacion.medir(fase)
+    
+    def muestrear(self, tiempo=None):
+        """
+        Calcula todas las curvas en un instante, las agrega al historial y
+        publica la muestra a los suscriptores.
+        
+        Args:
+            tiempo (float): Horas simuladas; por defecto las del reloj,
+                limitadas a ``duracion``
+            
+        Returns:
+            Muestra: La muestra registrada
+        """
+        with self._medir("calculo"):
+            if tiempo is None:
+                tiempo = self.reloj.tiempo()
+                if self.duracion is not None:
+                    tiempo = min(tiempo, self.duracion)
+            
+            # Todas las curvas comparadas en una sola evaluación
+            actividades = self.paralelas.agregar(tiempo)
+            actividad = float(actividades[0])
+            gamma = actividad / self.actividad_inicial
+            self.serie.agregar(tiempo, actividad, gamma)
+            
+            # Hijas de la cadena: todos los miembros en una sola evaluación
+            actividades_cadena = None
+            if self.cadena is not None:
+                actividades_cadena = self.cadena.actividades(self._actividades_iniciales_cadena, tiempo)
+                for serie, actividad_hija in zip(self.series_cadena, actividades_cadena[1:].tolist()):
+                    serie.agregar(tiempo, actividad_hija, actividad_hija / self.actividad_inicial)
+            
+            # Modelo Monte Carlo: decaimientos binomiales desde la muestra anterior
+            actividad_estocastica = None
+            if self.estocastico is not None and tiempo > self.estocastico.tiempo:
+                paso = self.estocastico.paso(tiempo - self.estocastico.tiempo, agitacion=0.0)
+                actividad_estocastica = float(paso["actividad"][0])
+            
+            muestra = Muestra(tiempo, actividad, gamma, gamma * 100, actividades,
+                              actividades_cadena, actividad_estocastica)
         
-    def generar_particulas_random(self, n_particles):
+        for funcion in self._suscriptores:
+            funcion(muestra)
+        return muestra
+    
+    def iniciar_registro(self, ruta, **opciones):
         """
-        Genera posiciones aleatorias para animación de partículas.
+        Escribe en ``ruta`` el historial actual y cada muestra posterior.
+        
+        Llamar tras ``configurar``: el registro guarda en su cabecera los
+        parámetros de la simulación para poder recuperarla. Con
+        ``capacidad_maxima`` la memoria solo conserva la ventana reciente y el
+        historial completo queda en el registro.
         
         Args:
-            n_particles (int): Número de partículas a generar
+            ruta (str): Archivo del registro (se sobrescribe)
+            **opciones: ``registros_por_lote``, ``intervalo_volcado_s`` y
+                ``sincronizar`` (ver ``RegistroMuestras``)
             
         Returns:
-            list: Lista de tuplas (x, y, símbolo)
+            RegistroMuestras: El registro abierto
         """
-        simbolos = ['☢', '⚛', '☢', '⚛']
-        particulas = []
+        self.detener_registro()
+        self.registro = RegistroMuestras(ruta, self, **opciones)
+        self.suscribir(self.registro.agregar)
+        return self.registro
+    
+    def detener_registro(self):
+        """Vuelca y cierra el registro en curso, si lo hay"""
+        if self.registro is not None:
+            self.desuscribir(self.registro.agregar)
+            self.registro.cerrar()
+            self.registro = None
+    
+    def actualizar_calculos(self):
+        """
+        Actualiza los cálculos basados en el tiempo transcurrido.
+        
+        Returns:
+            tuple: (actividad_actual, tiempo_escalado)
+        """
+        muestra = self.muestrear()
+        return muestra.actividad, muestra.tiempo
+    
+    def avanzar(self, segundos):
+        """
+        Avanza un reloj virtual y registra la muestra correspondiente.
         
-        for _ in range(max(1, n_particles // 2)):
-            x = random.randint(10, 290)
-            y = random.randint(10, 140)
-            simbolo = random.choice(simbolos)
-            particulas.append((x, y, simbolo))
+        Args:
+            segundos (float): Segundos reales simulados
             
-        return particulas
+        Returns:
+            tuple: (actividad_actual, tiempo_escalado)
+        """
+        self.reloj.avanzar(segundos)
+        return self.actualizar_calculos()
+    
+    def pausar(self):
+        """Congela el tiempo simulado hasta ``reanudar``"""
+        self.reloj.pausar()
+        self.en_ejecucion = False
+        if self.registro is not None:
+            self.registro.volcar()
+    
+    def reanudar(self):
+        """Continúa la simulación sin contar el tiempo en pausa"""
+        self.reloj.reanudar()
+        self.en_ejecucion = True
+    
+    def reiniciar(self):
+        """Reinicia todos los datos de la simulación"""
+        self.detener_registro()
+        self.serie = SerieTemporal(capacidad_maxima=self.capacidad_maxima)
+        self.paralelas = None
+        self.cadena = None
+        self.series_cadena = []
+        self.estocastico = None
+        self.reloj.detener()
+        self.en_ejecucion = False
     
     def obtener_estadisticas(self):
         """
         Obtiene estadísticas de la simulación actual.
         
+        Se leen del resumen incremental de la serie, así que la consulta es
+        O(1) y puede hacerse en cada refresco sin importar la duración.
+        
         Returns:
-            dict: Diccionario con estadísticas
+            dict: Diccionario con estadísticas (actividades en MBq, tiempos
+            en horas y ``actividad_acumulada`` en MBq·h)
         """
-        if not self.actividades:
+        estadisticas = self.serie.estadisticas
+        if estadisticas.n == 0:
             return None
-            
+        
+        actividad_actual = float(estadisticas.ultimo_valor)
         return {
             "actividad_inicial": self.actividad_inicial,
-            "actividad_actual": self.actividades[-1],
-            "actividad_minima": min(self.actividades),
-            "tiempo_transcurrido": self.tiempos[-1] if self.tiempos else 0,
-            "porcentaje_restante": (self.actividades[-1] / self.actividad_inicial) * 100
+            "actividad_actual": actividad_actual,
+            "actividad_minima": float(estadisticas.minimo),
+            "actividad_maxima": float(estadisticas.maximo),
+            "actividad_media": estadisticas.media,
+            "desviacion_actividad": estadisticas.desviacion,
+            "actividad_media_temporal": estadisticas.media_temporal,
+            "actividad_acumulada": estadisticas.integral,
+            "muestras": estadisticas.n,
+            "tiempo_transcurrido": float(estadisticas.ultimo_tiempo),
+            "porcentaje_restante": (actividad_actual / self.actividad_inicial) * 100
         }
@@ -0,0 +1,130 @@
+"""
+Cadenas de decaimiento padre → hija (ecuaciones de Bateman)
+
+El sistema dN/dt = M·N se resuelve con la exponencial de la matriz M a
+partir de su descomposición espectral, que se calcula una sola vez por
+cadena y se reutiliza para evaluar arreglos completos de tiempos
+"""
+
+import math
+from functools import lru_cache
+
+import numpy as np
+
+
+@lru_cache(maxsize=32)
+def _descomposicion(constantes, ramificaciones):
+    """
+    Descomposición espectral de la matriz de la cadena.
+
+    Args:
+        constantes (tuple): λ de cada miembro en h⁻¹ (0 para estables)
+        ramificaciones (tuple): Tuplas (padre, hija, fracción)
+
+    Returns:
+        tuple: (valores propios, V, V⁻¹)
+    """
+    n = len(constantes)
+    lambdas = np.array(constantes, dtype=float)
+
+    # Con λ repetidas M no es diagonalizable; una perturbación relativa
+    # mínima mantiene la solución exacta a efectos prácticos
+    for i in range(n):
+        for j in range(i):
+            if lambdas[i] > 0 and math.isclose(lambdas[i], lambdas[j], rel_tol=1e-12):
+                lambdas[i] *= 1 + 1e-9 * (i + 1)
+
+    matriz = np.diag(-lambdas)
+    for padre, hija, fraccion in ramificaciones:
+        matriz[hija, padre] += fraccion * lambdas[padre]
+
+    valores, vectores = np.linalg.eig(matriz)
+    return valores.real, vectores.real, np.linalg.inv(vectores.real)
+
+
+class CadenaDecaimiento:
+    """
+    Cadena de decaimiento con ramificaciones arbitrarias.
+
+    Los miembros deben estar en orden topológico (cada padre antes que sus
+    hijas). Las actividades se expresan en MBq y los tiempos en horas.
+    """
+
+    def __init__(self, nombres, vidas_medias, ramificaciones):
+        """
+        Args:
+            nombres (list): Nombre de cada miembro
+            vidas_medias (list): Vida media en horas (math.inf para estables)
+            ramificaciones (list): Tuplas (índice padre, índice hija, fracción)
+        """
+        if len(nombres) != len(vidas_medias):
+            raise ValueError("Cada miembro de la cadena necesita una vida media")
+        for padre, hija, fraccion in ramificaciones:
+            if not 0 <= padre < hija < len(nombres):
+                raise ValueError("Los miembros deben estar ordenados de padre a hija")
+            if not 0 < fraccion <= 1:
+                raise ValueError("La fracción de ramificación debe estar en (0, 1]")
+
+        self.nombres = list(nombres)
+        self.vidas_medias = np.array(vidas_medias, dtype=float)
+        self.constantes = np.where(
+            np.isfinite(self.vidas_medias), math.log(2) / self.vidas_medias, 0.0
+        )
+        self.ramificaciones = tuple((int(p), int(h), float(f)) for p, h, f in ramificaciones)
+
+    @classmethod
+    def desde_dict(cls, datos, catalogo):
+        """
+        Crea la cadena desde una entrada de CADENAS_DECAIMIENTO.
+
+        Args:
+            datos (dict): Con ``miembros`` (nombres del catálogo) y ``ramificaciones``
+            catalogo (CatalogoRadiofarmacos): Catálogo del que tomar las vidas medias
+        """
+        miembros = [catalogo[nombre] for nombre in datos["miembros"]]
+        return cls(
+            [rf.nombre for rf in miembros],
+            [rf.vida_media for rf in miembros],
+            datos["ramificaciones"]
+        )
+
+    def __len__(self):
+        return len(self.nombres)
+
+    def nucleos(self, nucleos_iniciales, tiempos):
+        """
+        Número de núcleos de cada miembro.
+
+        Args:
+            nucleos_iniciales (array): N₀ de cada miembro
+            tiempos (float | array): Tiempos en horas
+
+        Returns:
+            ndarray: Forma (n_miembros,) para un tiempo escalar o
+            (n_miembros, n_tiempos) para un arreglo
+        """
+        valores, vectores, inversa = _descomposicion(
+            tuple(self.constantes.tolist()), self.ramificaciones
+        )
+        coeficientes = inversa @ np.asarray(nucleos_iniciales, dtype=float)
+        tiempos = np.asarray(tiempos, dtype=float)
+        exponenciales = np.exp(np.multiply.outer(valores, tiempos))
+        resultado = vectores @ (coeficientes.reshape((-1,) + (1,) * tiempos.ndim) * exponenciales)
+        return np.maximum(resultado, 0.0)
+
+    def actividades(self, actividades_iniciales, tiempos):
+        """
+        Actividad de cada miembro A_i(t) = λ_i·N_i(t).
+
+        Args:
+            actividades_iniciales (array): A₀ de cada miembro en MBq
+            tiempos (float | array): Tiempos en horas
+
+        Returns:
+            ndarray: Actividades en MBq con la misma forma que ``nucleos``
+        """
+        iniciales = np.asarray(actividades_iniciales, dtype=float)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            nucleos_iniciales = np.where(self.constantes > 0, iniciales / self.constantes, 0.0)
+        nucleos = self.nucleos(nucleos_iniciales, tiempos)
+        return self.constantes.reshape((-1,) + (1,) * (nucleos.ndim - 1)) * nucleos
@@ -1,11 +1,37 @@
 """
 Funciones matemáticas para cálculos de decaimiento radiactivo
 Versión mejorada con funciones adicionales
+
+Todas las funciones aceptan escalares o arreglos de NumPy. Con escalares se
+usa ``math`` directamente; con arreglos los argumentos se difunden
+(broadcasting) y los elementos inválidos producen ``nan`` en lugar de
+lanzar una excepción por elemento.
 """
 
 import math
+from functools import lru_cache
+
+import numpy as np
+
+LN2 = math.log(2)
+
+
+def _son_escalares(*valores):
+    """Indica si todos los argumentos son escalares de Python"""
+    for valor in valores:
+        if not isinstance(valor, (int, float)):
+            return False
+    return True
 
-def calcular_actividad_restante(actividad_inicial, tiempo, vida_media):
+
+def _constante_decaimiento_np(vida_media):
+    """λ = ln(2) / t½ con nan donde t½ <= 0"""
+    vida_media = np.asarray(vida_media, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(vida_media > 0, LN2 / vida_media, np.nan)
+
+
+def calcular_actividad_restante(actividad_inicial, tiempo, vida_media, constante_decaimiento=None):
     """
     Calcula la actividad restante usando la ley de decaimiento exponencial.
     
@@ -16,19 +42,27 @@ def calcular_actividad_restante(actividad_inicial, tiempo, vida_media):
         actividad_inicial (float): Actividad inicial en MBq
         tiempo (float): Tiempo transcurrido en horas
         vida_media (float): Vida media del radiofármaco en horas
+        constante_decaimiento (float): λ ya calculada; evita recalcularla
         
     Returns:
-        float: Actividad restante en MBq
+        float | ndarray: Actividad restante en MBq (nan donde t½ <= 0)
     """
-    if vida_media <= 0:
-        raise ValueError("La vida media debe ser mayor que cero")
+    if not _son_escalares(actividad_inicial, tiempo, vida_media):
+        if constante_decaimiento is None:
+            constante_decaimiento = _constante_decaimiento_np(vida_media)
+        return np.asarray(actividad_inicial, dtype=float) * np.exp(-constante_decaimiento * tiempo)
+    
+    if constante_decaimiento is None:
+        if vida_media <= 0:
+            raise ValueError("La vida media debe ser mayor que cero")
+        constante_decaimiento = LN2 / vida_media
     
-    constante_decaimiento = math.log(2) / vida_media
     actividad_restante = actividad_inicial * math.exp(-constante_decaimiento * tiempo)
     
     return actividad_restante
 
-def calcular_tiempo_para_actividad(actividad_inicial, actividad_final, vida_media):
+def calcular_tiempo_para_actividad(actividad_inicial, actividad_final, vida_media,
+                                   constante_decaimiento=None):
     """
     Calcula el tiempo necesario para alcanzar una actividad específica.
     
@@ -39,17 +73,32 @@ def calcular_tiempo_para_actividad(actividad_inicial, actividad_final, vida_medi
         actividad_inicial (float): Actividad inicial en MBq
         actividad_final (float): Actividad deseada en MBq
         vida_media (float): Vida media del radiofármaco en horas
+        constante_decaimiento (float): λ ya calculada; evita recalcularla
         
     Returns:
-        float: Tiempo necesario en horas
+        float | ndarray: Tiempo necesario en horas (0 donde Af >= A₀,
+        nan donde Af <= 0 o t½ <= 0)
     """
+    if not _son_escalares(actividad_inicial, actividad_final, vida_media):
+        a0 = np.asarray(actividad_inicial, dtype=float)
+        af = np.asarray(actividad_final, dtype=float)
+        vida_media = np.asarray(vida_media, dtype=float)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            if constante_decaimiento is None:
+                tiempo = vida_media * np.log2(a0 / af)
+            else:
+                tiempo = np.log(a0 / af) / constante_decaimiento
+        tiempo = np.where((af <= 0) | (vida_media <= 0), np.nan, tiempo)
+        return np.where(af >= a0, 0.0, tiempo)
+    
     if actividad_final >= actividad_inicial:
         return 0
     
     if actividad_final <= 0:
         raise ValueError("La actividad final debe ser mayor que cero")
     
-    constante_decaimiento = math.log(2) / vida_media
+    if constante_decaimiento is None:
+        constante_decaimiento = LN2 / vida_media
     tiempo = -math.log(actividad_final / actividad_inicial) / constante_decaimiento
     
     return tiempo
@@ -63,8 +112,14 @@ def calcular_porcentaje_restante(actividad_actual, actividad_inicial):
         actividad_inicial (float): Actividad inicial en MBq
         
     Returns:
-        float: Porcentaje restante (0-100)
+        float | ndarray: Porcentaje restante (0-100)
     """
+    if not _son_escalares(actividad_actual, actividad_inicial):
+        a0 = np.asarray(actividad_inicial, dtype=float)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            porcentaje = np.asarray(actividad_actual, dtype=float) / a0 * 100
+        return np.where(a0 == 0, 0.0, porcentaje)
+    
     if actividad_inicial == 0:
         return 0
     return (actividad_actual / actividad_inicial) * 100
@@ -79,12 +134,15 @@ def calcular_constante_decaimiento(vida_media):
         vida_media (float): Vida media del radiofármaco en horas
         
     Returns:
-        float: Constante de decaimiento en h⁻¹
+        float | ndarray: Constante de decaimiento en h⁻¹ (nan donde t½ <= 0)
     """
+    if not _son_escalares(vida_media):
+        return _constante_decaimiento_np(vida_media)
+    
     if vida_media <= 0:
         raise ValueError("La vida media debe ser mayor que cero")
     
-    return math.log(2) / vida_media
+    return LN2 / vida_media
 
 def calcular_gamma(actividad_actual, actividad_inicial):
     """
@@ -100,8 +158,14 @@ def calcular_gamma(actividad_actual, actividad_inicial):
         actividad_inicial (float): Actividad inicial en MBq
         
     Returns:
-        float: Factor gamma entre 0 y 1
+        float | ndarray: Factor gamma entre 0 y 1
     """
+    if not _son_escalares(actividad_actual, actividad_inicial):
+        a0 = np.asarray(actividad_inicial, dtype=float)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            gamma = np.asarray(actividad_actual, dtype=float) / a0
+        return np.where(a0 == 0, 0.0, np.clip(gamma, 0.0, 1.0))
+    
     if actividad_inicial == 0:
         return 0
     
@@ -117,8 +181,13 @@ def calcular_numero_vidas_medias(tiempo, vida_media):
         vida_media (float): Vida media del radiofármaco en horas
         
     Returns:
-        float: Número de vidas medias transcurridas
+        float | ndarray: Número de vidas medias transcurridas (nan donde t½ <= 0)
     """
+    if not _son_escalares(tiempo, vida_media):
+        vida_media = np.asarray(vida_media, dtype=float)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(vida_media > 0, np.asarray(tiempo, dtype=float) / vida_media, np.nan)
+    
     if vida_media <= 0:
         raise ValueError("La vida media debe ser mayor que cero")
     
@@ -136,15 +205,61 @@ def calcular_actividad_en_vidas_medias(actividad_inicial, num_vidas_medias):
         num_vidas_medias (float): Número de vidas medias transcurridas
         
     Returns:
-        float: Actividad restante en MBq
+        float | ndarray: Actividad restante en MBq
     """
+    if not _son_escalares(actividad_inicial, num_vidas_medias):
+        return np.asarray(actividad_inicial, dtype=float) * np.exp2(-np.asarray(num_vidas_medias, dtype=float))
+    
     return actividad_inicial * math.pow(0.5, num_vidas_medias)
 
+# Claves del diccionario devuelto por obtener_formula_sustituida
+CLAVES_FORMULA = ("formula", "sustitucion", "resultado", "lambda", "texto_lambda", "valor")
+
+
+@lru_cache(maxsize=512)
+def _evaluar_formula(modo, actividad_inicial, actividad_final, tiempo_simulacion, vida_media):
+    """
+    Evalúa y formatea la fórmula una sola vez por combinación de parámetros.
+
+    Devuelve una tupla (inmutable) alineada con ``CLAVES_FORMULA`` para que
+    ningún llamador pueda alterar el valor guardado en la caché.
+    """
+    lambda_val = calcular_constante_decaimiento(vida_media)
+    texto_lambda = f"λ = ln(2) / {vida_media:g} = {lambda_val:.6f} h⁻¹"
+    
+    if modo == "tiempo":
+        At = calcular_actividad_restante(actividad_inicial, tiempo_simulacion, vida_media,
+                                         constante_decaimiento=lambda_val)
+        return (
+            "A(t) = A₀ · e^(-λt)",
+            f"A({tiempo_simulacion:.2f}) = {actividad_inicial:.2f} · e^(-{lambda_val:.6f} × {tiempo_simulacion:.2f})",
+            f"A({tiempo_simulacion:.2f}) = {At:.4f} MBq",
+            lambda_val,
+            texto_lambda,
+            At
+        )
+    else:  # modo actividad
+        t = calcular_tiempo_para_actividad(actividad_inicial, actividad_final, vida_media,
+                                           constante_decaimiento=lambda_val)
+        return (
+            "t = -ln(Af / A₀) / λ",
+            f"t = -ln({actividad_final:.2f} / {actividad_inicial:.2f}) / {lambda_val:.6f}",
+            f"t = {t:.4f} horas",
+            lambda_val,
+            texto_lambda,
+            t
+        )
+
+
 def obtener_formula_sustituida(modo, actividad_inicial, actividad_final, 
                                tiempo_simulacion, vida_media):
     """
     Genera la fórmula con valores sustituidos según el modo de simulación.
     
+    Los resultados se memorizan por (modo, A₀, Af, t, vida media), así que
+    reevaluar la misma combinación (p. ej. al teclear y borrar un dígito)
+    no repite los cálculos ni el formateo.
+    
     Args:
         modo (str): "tiempo" o "actividad"
         actividad_inicial (float): Actividad inicial en MBq
@@ -153,23 +268,9 @@ def obtener_formula_sustituida(modo, actividad_inicial, actividad_final,
         vida_media (float): Vida media en horas
         
     Returns:
-        dict: Diccionario con fórmula general, sustitución, resultado y lambda
+        dict: Diccionario con fórmula general, sustitución, resultado, lambda,
+        el texto de lambda y el valor numérico calculado (A(t) o t)
     """
-    lambda_val = calcular_constante_decaimiento(vida_media)
-    
-    if modo == "tiempo":
-        At = calcular_actividad_restante(actividad_inicial, tiempo_simulacion, vida_media)
-        return {
-            "formula": "A(t) = A₀ · e^(-λt)",
-            "sustitucion": f"A({tiempo_simulacion:.2f}) = {actividad_inicial:.2f} · e^(-{lambda_val:.6f} × {tiempo_simulacion:.2f})",
-            "resultado": f"A({tiempo_simulacion:.2f}) = {At:.4f} MBq",
-            "lambda": lambda_val
-        }
-    else:  # modo actividad
-        t = calcular_tiempo_para_actividad(actividad_inicial, actividad_final, vida_media)
-        return {
-            "formula": "t = -ln(Af / A₀) / λ",
-            "sustitucion": f"t = -ln({actividad_final:.2f} / {actividad_inicial:.2f}) / {lambda_val:.6f}",
-            "resultado": f"t = {t:.4f} horas",
-            "lambda": lambda_val
-        }
+    return dict(zip(CLAVES_FORMULA, _evaluar_formula(
+        modo, actividad_inicial, actividad_final, tiempo_simulacion, vida_media
+    )))
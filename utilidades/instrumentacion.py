@@ -0,0 +1,211 @@
+"""
+Instrumentación del bucle de refresco en vivo
+Registra cuánto tarda cada fase de un refresco y con cuánto retraso se
+ejecuta cada callback de ``root.after`` respecto al instante previsto. Los
+tiempos se acumulan en histogramas de tamaño fijo, de modo que la memoria
+no crece con la duración de la simulación
+"""
+
+import json
+import time
+from contextlib import contextmanager, nullcontext
+
+import numpy as np
+
+
+class HistogramaLatencias:
+    """
+    Histograma de latencias en milisegundos con cubetas logarítmicas fijas.
+
+    Los percentiles se estiman a partir de las cubetas, con un error relativo
+    acotado por su anchura (~5 % con las opciones por defecto).
+    """
+
+    def __init__(self, minimo_ms=0.01, maximo_ms=10_000.0, cubetas=256):
+        """
+        Args:
+            minimo_ms (float): Límite inferior de la primera cubeta
+            maximo_ms (float): Límite superior de la última cubeta
+            cubetas (int): Número de cubetas entre ambos límites
+        """
+        self.bordes = np.geomspace(minimo_ms, maximo_ms, cubetas + 1)
+        # Una cubeta extra a cada lado para valores fuera de rango
+        self.conteos = np.zeros(cubetas + 2, dtype=np.int64)
+        self.total = 0
+        self.suma = 0.0
+        self.maximo = 0.0
+
+    def registrar(self, ms):
+        """Añade una medición en milisegundos"""
+        self.conteos[int(np.searchsorted(self.bordes, ms, side="right"))] += 1
+        self.total += 1
+        self.suma += ms
+        if ms > self.maximo:
+            self.maximo = ms
+
+    def percentil(self, p):
+        """
+        Estimación del percentil p (0-100) en milisegundos.
+
+        Devuelve el borde superior de la cubeta que contiene el percentil.
+        """
+        if self.total == 0:
+            return 0.0
+        objetivo = self.total * p / 100
+        indice = int(np.searchsorted(np.cumsum(self.conteos), objetivo, side="left"))
+        if indice == 0:
+            return float(self.bordes[0])
+        if indice > len(self.bordes) - 1:
+            return self.maximo
+        return min(float(self.bordes[indice]), self.maximo)
+
+    def resumen(self):
+        """Conteo, media, máximo y percentiles 50/95/99"""
+        return {
+            "n": self.total,
+            "media_ms": self.suma / self.total if self.total else 0.0,
+            "p50_ms": self.percentil(50),
+            "p95_ms": self.percentil(95),
+            "p99_ms": self.percentil(99),
+            "max_ms": self.maximo
+        }
+
+    def limpiar(self):
+        """Descarta todas las mediciones"""
+        self.conteos[:] = 0
+        self.total = 0
+        self.suma = 0.0
+        self.maximo = 0.0
+
+
+class InstrumentacionRefresco:
+    """
+    Mide las fases de cada refresco y la deriva del planificador.
+
+    Desactivada, ``medir`` devuelve un contexto vacío compartido y
+    ``registrar_tick`` retorna de inmediato, así que puede dejarse en el
+    bucle sin coste apreciable.
+    """
+
+    def __init__(self, activa=False):
+        self.activa = activa
+        self.fases = {}
+        self.deriva = HistogramaLatencias()
+        self.intervalos = HistogramaLatencias()
+        self.ticks = 0
+        self.fotogramas_perdidos = 0
+        self._programado = None
+        self._nulo = nullcontext()
+
+    def medir(self, fase):
+        """
+        Contexto que acumula la duración del bloque en la fase indicada.
+
+        Args:
+            fase (str): Nombre de la fase ('calculo', 'dibujo', 'blit', ...)
+        """
+        if not self.activa:
+            return self._nulo
+        return self._medir(fase)
+
+    @contextmanager
+    def _medir(self, fase):
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            histograma = self.fases.get(fase)
+            if histograma is None:
+                histograma = self.fases[fase] = HistogramaLatencias()
+            histograma.registrar((time.perf_counter() - inicio) * 1000)
+
+    def programado(self, intervalo_ms):
+        """Anota el momento en que se programa el siguiente refresco y su intervalo"""
+        if self.activa:
+            self._programado = (time.perf_counter(), intervalo_ms)
+
+    def registrar_tick(self):
+        """
+        Registra la ejecución de un refresco programado.
+
+        La deriva es el retraso respecto al instante previsto; cada intervalo
+        completo de retraso cuenta como un fotograma perdido.
+        """
+        if not self.activa or self._programado is None:
+            return
+        programado_en, intervalo_ms = self._programado
+        self._programado = None
+
+        transcurrido_ms = (time.perf_counter() - programado_en) * 1000
+        deriva_ms = max(0.0, transcurrido_ms - intervalo_ms)
+        self.ticks += 1
+        self.intervalos.registrar(intervalo_ms)
+        self.deriva.registrar(deriva_ms)
+        if intervalo_ms > 0:
+            self.fotogramas_perdidos += int(deriva_ms // intervalo_ms)
+
+    def cancelar_tick(self):
+        """Olvida el refresco programado (pausa o fin) para no medirlo como retraso"""
+        self._programado = None
+
+    def limpiar(self):
+        """Descarta todas las mediciones"""
+        self.fases.clear()
+        self.deriva.limpiar()
+        self.intervalos.limpiar()
+        self.ticks = 0
+        self.fotogramas_perdidos = 0
+        self._programado = None
+
+    def resumen(self):
+        """
+        Returns:
+            dict: Ticks, fotogramas perdidos y resumen de deriva, intervalos
+            y cada fase
+        """
+        return {
+            "ticks": self.ticks,
+            "fotogramas_perdidos": self.fotogramas_perdidos,
+            "deriva": self.deriva.resumen(),
+            "intervalo": self.intervalos.resumen(),
+            "fases": {fase: h.resumen() for fase, h in self.fases.items()}
+        }
+
+    def texto_overlay(self):
+        """Resumen compacto para mostrarlo sobre la gráfica"""
+        resumen = self.resumen()
+        lineas = [
+            f"ticks {resumen['ticks']}  perdidos {resumen['fotogramas_perdidos']}  "
+            f"intervalo p50 {resumen['intervalo']['p50_ms']:.0f} ms",
+            self._linea("deriva", resumen["deriva"])
+        ]
+        lineas.extend(self._linea(fase, datos) for fase, datos in resumen["fases"].items())
+        return "\n".join(lineas)
+
+    @staticmethod
+    def _linea(nombre, datos):
+        return (f"{nombre:<9} p50 {datos['p50_ms']:7.2f}  p95 {datos['p95_ms']:7.2f}  "
+                f"p99 {datos['p99_ms']:7.2f} ms")
+
+    def volcar(self, ruta, **contexto):
+        """
+        Guarda el resumen y los histogramas completos en JSON.
+
+        Args:
+            ruta (str): Archivo de destino
+            **contexto: Datos adicionales (radiofármaco, parámetros, ...)
+        """
+        def histograma(h):
+            return {"resumen": h.resumen(), "bordes_ms": h.bordes.tolist(), "conteos": h.conteos.tolist()}
+
+        documento = {
+            "contexto": contexto,
+            "resumen": self.resumen(),
+            "histogramas": {
+                "deriva": histograma(self.deriva),
+                "intervalo": histograma(self.intervalos),
+                **{fase: histograma(h) for fase, h in self.fases.items()}
+            }
+        }
+        with open(ruta, "w", encoding="utf-8") as archivo:
+            json.dump(documento, archivo, indent=2, ensure_ascii=False)